@@ -0,0 +1,495 @@
+"""
+Concurrent chat sessions against the API server, with no LLM or network.
+
+The benchmark first records fixtures for one workflow (coordinator, planner,
+supervisor, researcher with a search call, reporter) using scripted chat
+models, or uses fixtures recorded from real runs (--fixtures, --query).
+It then starts the fake LLM server and the API server with the fake tool
+backend, runs --clients concurrent /api/chat/stream sessions until
+--requests have finished, and reports percentiles of time to first event,
+time to first token and session duration, events per second and the
+server's resident memory. Sessions beyond WORKFLOW_MAX_RUNNING per worker
+wait in the admission queue, as in production.
+
+Results are saved as JSON under benchmarks/results/; --compare prints the
+change against an earlier result and exits with 1 on a regression.
+
+    python -m benchmarks.bench_api [--clients 16] [--requests 64] [--workers 1]
+        [--ttft 0.3] [--token-delay 0.01] [--compare benchmarks/results/<file>.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import httpx
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+QUERY = "Summarize today's ETH market."
+TEAM = ["researcher", "reporter"]
+
+# Higher is better for these; lower is better for everything else compared
+THROUGHPUT_METRICS = ("events_per_second", "sessions_per_second")
+# Too noisy, or not a measure of performance
+NOT_COMPARED = ("sessions", "errors", "wall_seconds", "events_per_session", "max")
+
+
+async def record_fixtures(path: str, tokens: int) -> None:
+    """Record one workflow run on scripted chat models and canned search results."""
+    # The LLM clients are created at import time and need some API key.
+    for name in ("BASIC_API_KEY", "REASONING_API_KEY", "VL_API_KEY"):
+        os.environ.setdefault(name, "replay")
+
+    from langchain_community.adapters.openai import convert_message_to_dict
+    from langchain_core.language_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+    from src.config import TEAM_MEMBER_CONFIGRATIONS
+    from src.llms import llm as llm_module
+    from src.prompts.template import apply_prompt_template
+    from src.replay import FakeToolBackend, FixtureStore, Recorder
+    from src.replay.fixtures import llm_group
+
+    words = " ".join(f"word{i}" for i in range(tokens))
+    state = {
+        "TEAM_MEMBERS": TEAM,
+        "TEAM_MEMBER_CONFIGRATIONS": TEAM_MEMBER_CONFIGRATIONS,
+        "messages": [],
+    }
+    # Agents are told apart by their system prompt.
+    agents = {
+        llm_group([apply_prompt_template(agent, state)[0]]): agent
+        for agent in ("coordinator", "planner", "supervisor", *TEAM)
+    }
+
+    class ScriptedAgentModel(BaseChatModel):
+        """Answers every agent's prompt with its part of a fixed script."""
+
+        @property
+        def _llm_type(self) -> str:
+            return "scripted-agents"
+
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+        def with_structured_output(self, schema, **kwargs):
+            return self | JsonOutputParser()
+
+        def _reply(self, messages) -> AIMessage:
+            agent = agents.get(
+                llm_group([convert_message_to_dict(m) for m in messages])
+            )
+            if agent == "coordinator":
+                return AIMessage(content="handoff_to_planner()")
+            if agent == "planner":
+                steps = [{"agent_name": m, "title": m, "description": m} for m in TEAM]
+                return AIMessage(content=json.dumps({"thought": words, "steps": steps}))
+            if agent == "supervisor":
+                names = {getattr(m, "name", None) for m in messages}
+                if "reporter" in names:
+                    goto = "FINISH"
+                elif "researcher" in names:
+                    goto = "reporter"
+                else:
+                    goto = "researcher"
+                return AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": ROUTE_TOOL_NAME,
+                            "args": {"next": goto},
+                            "id": "call_route",
+                        }
+                    ],
+                )
+            if agent == "researcher" and not isinstance(messages[-1], ToolMessage):
+                return AIMessage(
+                    content="",
+                    tool_calls=[
+                        {
+                            "name": "tavily_search",
+                            "args": {"query": QUERY},
+                            "id": "call_search",
+                        }
+                    ],
+                )
+            return AIMessage(content=words)
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            return ChatResult(
+                generations=[ChatGeneration(message=self._reply(messages))]
+            )
+
+        def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+            reply = self._reply(messages)
+            if reply.tool_calls:
+                chunk_calls = [
+                    {
+                        "name": c["name"],
+                        "args": json.dumps(c["args"]),
+                        "id": c["id"],
+                        "index": i,
+                    }
+                    for i, c in enumerate(reply.tool_calls)
+                ]
+                yield ChatGenerationChunk(
+                    message=AIMessageChunk(content="", tool_call_chunks=chunk_calls)
+                )
+                return
+            for word in reply.content.split(" "):
+                chunk = ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+
+    # Before the agents are created from the cache, see src.agents
+    for llm_type in ("basic", "reasoning", "vision"):
+        llm_module._llm_cache[llm_type] = ScriptedAgentModel()
+    from src.graph.router import ROUTE_TOOL_NAME
+    from src.service import workflow_service
+
+    search_results = [
+        {"title": "ETH today", "url": "https://example.com", "content": words}
+    ]
+    canned = FixtureStore(
+        [
+            {
+                "kind": "tool",
+                "key": "",
+                "group": "tavily_search",
+                "output": json.dumps(search_results),
+                "artifact": {"results": search_results},
+                "error": False,
+            }
+        ]
+    )
+    with FakeToolBackend(canned):
+        await workflow_service.graph.ainvoke(
+            {
+                "TEAM_MEMBERS": TEAM,
+                "TEAM_MEMBER_CONFIGRATIONS": TEAM_MEMBER_CONFIGRATIONS,
+                "messages": [{"role": "user", "content": QUERY}],
+                "deep_thinking_mode": False,
+                "search_before_planning": False,
+            },
+            {
+                "callbacks": [Recorder(path)],
+                "configurable": {"thread_id": "bench", "workflow_id": "bench"},
+            },
+        )
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start(args: list[str], env: dict, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(
+        [sys.executable, *args], env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+async def wait_ready(url: str, process: subprocess.Popen, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{url} exited with {process.returncode}")
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Resident memory of a process and its children (uvicorn workers)."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            processes = [process, *process.children(recursive=True)]
+            return sum(p.memory_info().rss for p in processes)
+        except psutil.Error:
+            return None
+    # Linux without psutil: direct children only
+    try:
+        pids = [pid]
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(child) for child in f.read().split()]
+        total = 0
+        for p in pids:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        return total
+    except OSError:
+        return None
+
+
+async def sample_rss(pid: int, samples: list[int], interval: float = 0.2) -> None:
+    while True:
+        rss = rss_bytes(pid)
+        if rss is not None:
+            samples.append(rss)
+        await asyncio.sleep(interval)
+
+
+async def run_session(client: httpx.AsyncClient, url: str, body: dict) -> dict:
+    """One chat session; timings are in seconds from sending the request."""
+    started_at = time.perf_counter()
+    result = {"ttfe": None, "ttft": None, "events": 0, "error": None}
+    event = None
+    try:
+        async with client.stream("POST", url, json=body) as response:
+            if response.status_code != 200:
+                result["error"] = f"HTTP {response.status_code}"
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:") and event is not None:
+                    elapsed = time.perf_counter() - started_at
+                    result["events"] += 1
+                    if result["ttfe"] is None:
+                        result["ttfe"] = elapsed
+                    if result["ttft"] is None and event == "message":
+                        delta = json.loads(line[5:]).get("delta", {})
+                        if delta.get("content"):
+                            result["ttft"] = elapsed
+                    event = None
+    except httpx.HTTPError as e:
+        result["error"] = repr(e)
+    result["duration"] = time.perf_counter() - started_at
+    return result
+
+
+def percentiles(values: list[float]) -> dict:
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+
+    def at(p: float) -> float:
+        return round(values[min(len(values) - 1, int(p * len(values)))], 4)
+
+    return {
+        "p50": at(0.5),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": round(values[-1], 4),
+    }
+
+
+async def run_load(
+    base_url: str, pid: int, query: str, clients: int, requests: int
+) -> dict:
+    url = f"{base_url}/api/chat/stream"
+    body = {"messages": [{"role": "user", "content": query}], "team_members": TEAM}
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        await run_session(client, url, body)  # warm up
+        samples: list[int] = []
+        sampler = asyncio.create_task(sample_rss(pid, samples))
+        remaining = iter(range(requests))
+        sessions: list[dict] = []
+
+        async def worker() -> None:
+            for _ in remaining:
+                sessions.append(await run_session(client, url, body))
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        wall = time.perf_counter() - started_at
+        sampler.cancel()
+
+    events = sum(s["events"] for s in sessions)
+    return {
+        "sessions": len(sessions),
+        "errors": sum(1 for s in sessions if s["error"]),
+        "wall_seconds": round(wall, 3),
+        "ttfe": percentiles([s["ttfe"] for s in sessions]),
+        "ttft": percentiles([s["ttft"] for s in sessions]),
+        "duration": percentiles([s["duration"] for s in sessions]),
+        "events_per_session": round(events / max(1, len(sessions)), 1),
+        "events_per_second": round(events / wall, 1),
+        "sessions_per_second": round(len(sessions) / wall, 3),
+        "rss_peak_mb": round(max(samples) / 2**20, 1) if samples else None,
+        "rss_end_mb": round(samples[-1] / 2**20, 1) if samples else None,
+    }
+
+
+def flatten(metrics: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Print the change of every metric; True if any regressed beyond threshold."""
+    regressed = False
+    old, new = flatten(baseline["metrics"]), flatten(current["metrics"])
+    for key in new:
+        if key not in old or not old[key] or key.split(".")[-1] in NOT_COMPARED:
+            continue
+        change = (new[key] - old[key]) / old[key]
+        worse = -change if key.split(".")[-1] in THROUGHPUT_METRICS else change
+        flag = "  REGRESSION" if worse > threshold else ""
+        regressed |= bool(flag)
+        print(f"{key:<28} {old[key]:>10} -> {new[key]:>10} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> int:
+    workdir = tempfile.mkdtemp(prefix="bench_api_")
+    fixtures = args.fixtures
+    if fixtures is None:
+        fixtures = os.path.join(workdir, "fixtures.jsonl")
+        await record_fixtures(fixtures, args.tokens)
+
+    llm_port, api_port = free_port(), free_port()
+    llm_url = f"http://127.0.0.1:{llm_port}/v1"
+    env = {
+        **os.environ,
+        "LANGSMITH_TRACING": "false",
+        "REPLAY_FIXTURES_FILE": fixtures,
+    }
+    for prefix in ("BASIC", "REASONING", "VL"):
+        # Plain model names: OpenAI-compatible clients, not LiteLLM
+        env.update({f"{prefix}_MODEL": "replay", f"{prefix}_BASE_URL": llm_url})
+        env[f"{prefix}_API_KEY"] = "replay"
+    env.update({"EMBEDDING_BASE_URL": llm_url, "EMBEDDING_API_KEY": "replay"})
+    if args.workers > 1 and "STATE_BACKEND_URL" not in os.environ:
+        env["STATE_BACKEND_URL"] = f"sqlite:///{workdir}/state.db"
+
+    fake_llm = start(
+        [
+            "-m",
+            "src.replay.fake_llm_server",
+            fixtures,
+            "--port",
+            str(llm_port),
+            "--ttft",
+            str(args.ttft),
+            "--token-delay",
+            str(args.token_delay),
+        ],
+        env,
+        os.path.join(workdir, "fake_llm.log"),
+    )
+    server = start(
+        [
+            "server.py",
+            "--port",
+            str(api_port),
+            "--workers",
+            str(args.workers),
+            "--no-reload",
+        ],
+        env,
+        os.path.join(workdir, "server.log"),
+    )
+    try:
+        await wait_ready(f"{llm_url}/models", fake_llm)
+        await wait_ready(f"http://127.0.0.1:{api_port}/api/team_members", server)
+        metrics = await run_load(
+            f"http://127.0.0.1:{api_port}",
+            server.pid,
+            args.query or QUERY,
+            args.clients,
+            args.requests,
+        )
+    finally:
+        for process in (server, fake_llm):
+            process.terminate()
+            process.wait(timeout=30)
+
+    result = {
+        "benchmark": "bench_api",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "params": {
+            k: getattr(args, k)
+            for k in ("clients", "requests", "workers", "tokens", "ttft", "token_delay")
+        },
+        "metrics": metrics,
+    }
+    print(json.dumps(result, indent=2))
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench_api-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Saved to {output} (server logs in {workdir})")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("params") != result["params"]:
+            print(f"Warning: baseline ran with {baseline.get('params')}")
+        if compare(baseline, result, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent sessions")
+    parser.add_argument("--requests", type=int, default=64, help="Sessions in total")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Server worker processes"
+    )
+    parser.add_argument(
+        "--tokens", type=int, default=400, help="Words per scripted reply"
+    )
+    parser.add_argument(
+        "--ttft", type=float, default=0.3, help="Fake LLM time to first token"
+    )
+    parser.add_argument(
+        "--token-delay", type=float, default=0.01, help="Fake LLM seconds per chunk"
+    )
+    parser.add_argument(
+        "--fixtures", help="Recorded fixtures to replay instead of the script"
+    )
+    parser.add_argument("--query", help="User query the fixtures were recorded for")
+    parser.add_argument("--output", help="Where to save the result JSON")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change that counts as a regression",
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
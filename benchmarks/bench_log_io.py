@@ -0,0 +1,82 @@
+"""
+Overhead of tool input/output logging on large tool results.
+
+Compares the previous eager ``log_io`` (which formatted every argument and
+the full result on each call) with the current one, for a crawled-page sized
+string and a browser-history sized JSON structure, with DEBUG off and on.
+
+    python -m benchmarks.bench_log_io [--calls 200]
+"""
+
+import argparse
+import functools
+import io
+import logging
+import time
+
+from src.tools.decorators import log_io
+
+logger = logging.getLogger("src.tools.decorators")
+
+
+def eager_log_io(func):
+    """``log_io`` as it was before lazy logging, for comparison."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        params = ", ".join(
+            [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
+        )
+        logger.debug(f"Tool {func.__name__} called with parameters: {params}")
+        result = func(*args, **kwargs)
+        logger.debug(f"Tool {func.__name__} returned: {result}")
+        return result
+
+    return wrapper
+
+
+def make_payloads() -> dict:
+    page = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 36000
+    history = [
+        {"step": i, "url": f"https://example.com/{i}", "elements": list(range(50))}
+        for i in range(5000)
+    ]
+    return {"page (2 MB str)": page, "history (5k dicts)": history}
+
+
+def bench(decorator, payload, calls: int) -> float:
+    @decorator
+    def tool(query: str, document):
+        return document
+
+    started_at = time.perf_counter()
+    for _ in range(calls):
+        tool("query", document=payload)
+    return (time.perf_counter() - started_at) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    handler = logging.StreamHandler(io.StringIO())
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    print(f"{'payload':<20} {'level':<6} {'eager us/call':>14} {'lazy us/call':>13}")
+    for name, payload in make_payloads().items():
+        for level in (logging.INFO, logging.DEBUG):
+            logger.setLevel(level)
+            handler.stream = io.StringIO()
+            eager = bench(eager_log_io, payload, args.calls)
+            handler.stream = io.StringIO()
+            lazy = bench(log_io, payload, args.calls)
+            print(
+                f"{name:<20} {logging.getLevelName(level):<6} "
+                f"{eager:>14.1f} {lazy:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
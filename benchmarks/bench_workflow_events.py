@@ -0,0 +1,209 @@
+"""
+Events per second through run_agent_workflow for a scripted workflow.
+
+The agent graph is replaced by one with the same node names whose nodes
+replay fixed chat model outputs and tool calls through real react agents,
+so the numbers measure event streaming and filtering only, with no LLM or
+network involved.
+
+    python -m benchmarks.bench_workflow_events [--runs 5] [--tokens 400]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+from langgraph.prebuilt import create_react_agent
+from langgraph.types import Command
+
+from src.graph.types import State
+from src.service import workflow_service
+
+TEAM = ["researcher", "reporter"]
+
+
+@tool
+def lookup(query: str) -> str:
+    """Look something up."""
+    return f"result for {query}"
+
+
+class ScriptedChatModel(GenericFakeChatModel):
+    """Streams canned replies word by word, including tool calls."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = next(self.messages)
+        if message.tool_calls:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    id=message.id,
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"],
+                            "args": json.dumps(call["args"]),
+                            "id": call["id"],
+                            "index": i,
+                        }
+                        for i, call in enumerate(message.tool_calls)
+                    ],
+                )
+            )
+            return
+        for word in message.content.split(" "):
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(content=f"{word} ", id=message.id)
+            )
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def _scripted(*replies: AIMessage) -> ScriptedChatModel:
+    # Cycled, so every workflow run replays the same script.
+    return ScriptedChatModel(messages=itertools.cycle(replies))
+
+
+def build_scripted_graph(tokens: int):
+    """A graph shaped like the agent graph, replaying canned outputs."""
+    words = " ".join(f"word{i}" for i in range(tokens))
+    coordinator_model = _scripted(AIMessage(content="handoff_to_planner()"))
+    planner_model = _scripted(
+        AIMessage(content=json.dumps({"thought": words, "steps": []}))
+    )
+    supervisor_model = _scripted(
+        *(AIMessage(content=json.dumps({"next": goto})) for goto in [*TEAM, "FINISH"])
+    )
+    tool_calls = [
+        AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "lookup", "args": {"query": f"q{i}"}, "id": f"call_{i}"}
+            ],
+        )
+        for i in range(3)
+    ]
+    agents = {
+        member: create_react_agent(
+            _scripted(*tool_calls, AIMessage(content=words)), [lookup]
+        )
+        for member in TEAM
+    }
+
+    def coordinator(state: State):
+        coordinator_model.invoke(state["messages"])
+        return Command(goto="planner")
+
+    def planner(state: State):
+        plan = planner_model.invoke(state["messages"])
+        return Command(
+            update={"messages": [HumanMessage(content=plan.content, name="planner")]},
+            goto="supervisor",
+        )
+
+    def supervisor(state: State):
+        goto = json.loads(supervisor_model.invoke(state["messages"]).content)["next"]
+        return Command(goto=END if goto == "FINISH" else goto)
+
+    def agent_node(member: str):
+        def node(state: State):
+            result = agents[member].invoke(state)
+            content = result["messages"][-1].content
+            return Command(
+                update={"messages": [HumanMessage(content=content, name=member)]},
+                goto="supervisor",
+            )
+
+        return node
+
+    builder = StateGraph(State)
+    builder.add_edge(START, "coordinator")
+    builder.add_node("coordinator", coordinator)
+    builder.add_node("planner", planner)
+    builder.add_node("supervisor", supervisor)
+    for member in TEAM:
+        builder.add_node(member, agent_node(member))
+    return builder.compile()
+
+
+async def count_raw_events(graph, inputs: dict, **filters) -> tuple[int, float]:
+    started_at = time.perf_counter()
+    count = 0
+    async for _ in graph.astream_events(
+        inputs,
+        {"run_name": workflow_service.WORKFLOW_RUN_NAME},
+        version="v2",
+        **filters,
+    ):
+        count += 1
+    return count, time.perf_counter() - started_at
+
+
+async def run_workflow() -> tuple[int, float]:
+    started_at = time.perf_counter()
+    count = 0
+    async for _ in workflow_service.run_agent_workflow(
+        [{"role": "user", "content": "benchmark"}], team_members=TEAM
+    ):
+        count += 1
+    return count, time.perf_counter() - started_at
+
+
+async def main(runs: int, tokens: int) -> None:
+    graph = build_scripted_graph(tokens)
+    workflow_service.graph = graph
+    inputs = {
+        "TEAM_MEMBERS": TEAM,
+        "TEAM_MEMBER_CONFIGRATIONS": {},
+        "messages": [{"role": "user", "content": "benchmark"}],
+        "deep_thinking_mode": False,
+        "search_before_planning": False,
+    }
+    filters = dict(
+        include_names=[
+            *TEAM,
+            "planner",
+            "coordinator",
+            workflow_service.WORKFLOW_RUN_NAME,
+            *workflow_service.FORWARDED_CUSTOM_EVENTS,
+        ],
+        include_types=workflow_service.FORWARDED_RUN_TYPES,
+    )
+    await run_workflow()  # warm up
+
+    for label, measure in (
+        ("astream_events, all", lambda: count_raw_events(graph, inputs)),
+        (
+            "astream_events, filtered",
+            lambda: count_raw_events(graph, inputs, **filters),
+        ),
+        ("run_agent_workflow", run_workflow),
+    ):
+        total_events, total_seconds = 0, 0.0
+        for _ in range(runs):
+            events, seconds = await measure()
+            total_events += events
+            total_seconds += seconds
+        print(
+            f"{label:<26} {total_events // runs:>6} events/run "
+            f"{total_seconds / runs * 1000:>8.1f} ms/run "
+            f"{total_events / total_seconds:>10.0f} events/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=400)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.tokens))
@@ -1,11 +1,18 @@
 """
 Server script for running the API.
+
+    python server.py                 development, reloads on code changes
+    python server.py --workers 0     production, one worker per CPU core
 """
 
+import argparse
 import logging
+import os
 import uvicorn
 import sys
 
+from src.config import STATE_BACKEND_URL
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -15,14 +22,34 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
-    logger.info("Starting API server")
-    reload = True
+    parser = argparse.ArgumentParser(description="Run the API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes, 0 for one per CPU core; more than one disables reload",
+    )
+    parser.add_argument("--no-reload", action="store_true")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    reload = workers == 1 and not args.no_reload
     if sys.platform.startswith("win"):
         reload = False
+    if workers > 1 and STATE_BACKEND_URL.startswith("memory://"):
+        logger.warning(
+            "Running several workers with the memory:// state backend: background "
+            "jobs are only visible on the worker that started them. Set "
+            "STATE_BACKEND_URL to a sqlite:/// or redis:// URL to share them."
+        )
+    logger.info(f"Starting API server with {workers} worker(s)")
     uvicorn.run(
         "src.api.app:app",
-        host="0.0.0.0",
-        port=8000,
+        host=args.host,
+        port=args.port,
         reload=reload,
+        workers=workers if not reload else None,
         log_level="info",
     )
@@ -1,3 +1,15 @@
-from .agents import research_agent, coder_agent, browser_agent, twitter_agent
+from .agents import (
+    research_agent,
+    coder_agent,
+    browser_agent,
+    twitter_agent,
+    get_twitter_agent,
+)
 
-__all__ = ["research_agent", "coder_agent", "browser_agent", "twitter_agent"]
+__all__ = [
+    "research_agent",
+    "coder_agent",
+    "browser_agent",
+    "twitter_agent",
+    "get_twitter_agent",
+]
@@ -29,4 +29,19 @@ def create_agent(agent_type: str, tools: list, prompt_template: str):
 research_agent = create_agent("researcher", [graph_retriever, tavily_tool], "researcher")
 coder_agent = create_agent("coder", [python_repl_tool, bash_tool], "coder")
 browser_agent = create_agent("browser", [browser_tool], "browser")
-twitter_agent = create_agent("twitter", get_twitter_tools(), "twitter")
+_twitter_tools = get_twitter_tools()
+twitter_agent = create_agent("twitter", _twitter_tools, "twitter")
+
+
+def get_twitter_agent():
+    """The twitter agent, rebuilt once its MCP server, if down at startup, loads.
+
+    The server is reconnected in the background; until then the agent runs
+    without its tools instead of waiting for it.
+    """
+    global twitter_agent, _twitter_tools
+    if not _twitter_tools:
+        _twitter_tools = get_twitter_tools(wait=False)
+        if _twitter_tools:
+            twitter_agent = create_agent("twitter", _twitter_tools, "twitter")
+    return twitter_agent
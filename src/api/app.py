@@ -2,12 +2,11 @@
 FastAPI application.
 """
 
-import json
 import logging
 import os
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Literal, Optional, Union
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
@@ -16,8 +15,28 @@ import asyncio
 from typing import AsyncGenerator, Dict, List, Any
 
 from src.graph import build_graph
-from src.config import TEAM_MEMBERS, TEAM_MEMBER_CONFIGRATIONS, BROWSER_HISTORY_DIR
+from src.config import (
+    TEAM_MEMBERS,
+    TEAM_MEMBER_CONFIGRATIONS,
+    BROWSER_HISTORY_DIR,
+    SSE_COMPRESSION,
+    SSE_DISCONNECT_CHECK_INTERVAL,
+)
+from src.api.sse import EventStreamGZipMiddleware, coalesce_deltas, dumps
 from src.service.workflow_service import run_agent_workflow
+from src.tools.mcp_registry import mcp_registry
+from src.tools.twitter_scheduler import twitter_scheduler
+from src.tools.browser_recorder import RECORDING_FILE_TYPES
+from src.tools.browser import warm_browser_pool
+from src.tools.python_repl import python_sandbox
+from src.tools.graph_retriever import graph_index, graph_search_stats, semantic_cache
+from src.service.graph_indexer import graph_indexer
+from src.service.jobs import job_manager
+from src.service.scheduler import (
+    WorkflowQueueFull,
+    resource_limits,
+    workflow_scheduler,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -38,10 +57,23 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+if SSE_COMPRESSION:
+    app.add_middleware(EventStreamGZipMiddleware)
+
 # Create the graph
 graph = build_graph()
 
 
+@app.on_event("startup")
+async def warm_up():
+    """Launch warm browsers in the background so the first browser step is fast."""
+    warm_browser_pool()
+    # Spawn the Python sandbox workers so they finish importing pandas early
+    python_sandbox.warm()
+    # Periodic incremental graph indexing, if GRAPHRAG_INDEX_INTERVAL is set
+    graph_indexer.schedule()
+
+
 class ContentItem(BaseModel):
     type: str = Field(..., description="The type of content (text, image, etc.)")
     text: Optional[str] = Field(None, description="The text content if type is 'text'")
@@ -70,6 +102,55 @@ class ChatRequest(BaseModel):
         False, description="Whether to search before planning"
     )
     team_members: Optional[list] = Field(None, description="enabled team members")
+    browser_recording: Optional[Literal["gif", "webp", "frames"]] = Field(
+        None, description="Record browser sessions in this format, disabled if None"
+    )
+
+
+def to_workflow_messages(request: ChatRequest) -> list[dict]:
+    """Convert Pydantic models to dictionaries and normalize content format."""
+    messages = []
+    for msg in request.messages:
+        message_dict = {"role": msg.role}
+
+        # Handle both string content and list of content items
+        if isinstance(msg.content, str):
+            message_dict["content"] = msg.content
+        else:
+            # For content as a list, convert to the format expected by the workflow
+            content_items = []
+            for item in msg.content:
+                if item.type == "text" and item.text:
+                    content_items.append({"type": "text", "text": item.text})
+                elif item.type == "image" and item.image_url:
+                    content_items.append({"type": "image", "image_url": item.image_url})
+
+            message_dict["content"] = content_items
+
+        messages.append(message_dict)
+    return messages
+
+
+def workflow_events(request: ChatRequest):
+    """Start the workflow of a chat request and return its batched events."""
+    return coalesce_deltas(
+        run_agent_workflow(
+            to_workflow_messages(request),
+            request.debug,
+            request.deep_thinking_mode,
+            request.search_before_planning,
+            request.team_members,
+            request.browser_recording,
+        )
+    )
+
+
+def api_key(req: Request) -> str:
+    """The API key a request is scheduled under, or the client address."""
+    authorization = req.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+    return req.headers.get("x-api-key") or (req.client.host if req.client else "")
 
 
 @app.post("/api/chat/stream")
@@ -85,80 +166,181 @@ async def chat_endpoint(request: ChatRequest, req: Request):
         The streamed response
     """
     try:
-        # Convert Pydantic models to dictionaries and normalize content format
-        messages = []
-        for msg in request.messages:
-            message_dict = {"role": msg.role}
-
-            # Handle both string content and list of content items
-            if isinstance(msg.content, str):
-                message_dict["content"] = msg.content
-            else:
-                # For content as a list, convert to the format expected by the workflow
-                content_items = []
-                for item in msg.content:
-                    if item.type == "text" and item.text:
-                        content_items.append({"type": "text", "text": item.text})
-                    elif item.type == "image" and item.image_url:
-                        content_items.append(
-                            {"type": "image", "image_url": item.image_url}
-                        )
-
-                message_dict["content"] = content_items
-
-            messages.append(message_dict)
+        # Raises WorkflowQueueFull before the stream starts, see below
+        ticket = workflow_scheduler.enqueue(api_key(req))
 
         async def event_generator():
             try:
-                async for event in run_agent_workflow(
-                    messages,
-                    request.debug,
-                    request.deep_thinking_mode,
-                    request.search_before_planning,
-                    request.team_members,
-                ):
-                    # Check if client is still connected
-                    if await req.is_disconnected():
-                        logger.info("Client disconnected, stopping workflow")
-                        break
+                # Tell the client where it is in the queue until it may run
+                async for position in workflow_scheduler.wait(ticket):
                     yield {
-                        "event": event["event"],
-                        "data": json.dumps(event["data"], ensure_ascii=False),
+                        "event": "queue_position",
+                        "data": dumps({"position": position}),
                     }
+                events = workflow_events(request)
+                loop = asyncio.get_running_loop()
+                next_check = loop.time() + SSE_DISCONNECT_CHECK_INTERVAL
+                try:
+                    async for event in events:
+                        # Check if client is still connected, at most once per interval
+                        if loop.time() >= next_check:
+                            if await req.is_disconnected():
+                                logger.info("Client disconnected, stopping workflow")
+                                break
+                            next_check = loop.time() + SSE_DISCONNECT_CHECK_INTERVAL
+                        yield {
+                            "event": event["event"],
+                            "data": dumps(event["data"]),
+                        }
+                finally:
+                    await events.aclose()
             except asyncio.CancelledError:
                 logger.info("Stream processing cancelled")
                 raise
             except Exception as e:
                 logger.error(f"Error in workflow: {e}")
                 raise
+            finally:
+                workflow_scheduler.release(ticket)
 
         return EventSourceResponse(
             event_generator(),
             media_type="text/event-stream",
             sep="\n",
         )
+    except WorkflowQueueFull as e:
+        logger.warning(f"Rejected workflow: {e}")
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/workflows")
+async def create_workflow(request: ChatRequest, req: Request):
+    """
+    Start a workflow as a background job.
+
+    The workflow keeps running if the client disconnects; its events are
+    read from /api/workflows/{job_id}/events.
+
+    Args:
+        request: The chat request
+        req: The FastAPI request object, for the API key
+
+    Returns:
+        dict: The job id and status
+    """
+    try:
+        job = await job_manager.create(api_key(req), lambda: workflow_events(request))
+        return job.info()
+    except WorkflowQueueFull as e:
+        logger.warning(f"Rejected workflow: {e}")
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error creating workflow job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/workflows/{job_id}")
+async def get_workflow(job_id: str, req: Request):
+    """
+    Get the status of a workflow job started with the same API key.
+
+    Returns:
+        dict: Job status and the range of offsets that can be replayed
+    """
+    job = await job_manager.get(job_id, api_key(req))
+    info = await job.ainfo() if job is not None else None
+    if info is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return info
+
+
+@app.delete("/api/workflows/{job_id}")
+async def cancel_workflow(job_id: str, req: Request):
+    """
+    Cancel a running workflow job started with the same API key.
+
+    Returns:
+        dict: The job status
+    """
+    job = await job_manager.cancel(job_id, api_key(req))
+    info = await job.ainfo() if job is not None else None
+    if info is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return info
+
+
+@app.get("/api/workflows/{job_id}/events")
+async def workflow_event_stream(
+    job_id: str,
+    req: Request,
+    offset: Optional[int] = Query(None, alias="from"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Stream the events of a workflow job started with the same API key,
+    replaying from an offset.
+
+    Every event carries its offset as the SSE id, so an EventSource resumes
+    after the last event it saw when it reconnects.
+
+    Args:
+        job_id: The workflow job id
+        req: The FastAPI request object, for the API key
+        offset: First event offset to send, 0 by default
+        last_event_id: Set by EventSource on reconnect; resumes after it
+
+    Returns:
+        The streamed events; the stream ends when the job has finished
+    """
+    job = await job_manager.get(job_id, api_key(req))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    if offset is None:
+        offset = int(last_event_id) + 1 if (last_event_id or "").isdigit() else 0
+
+    async def event_generator():
+        async for event_offset, event in job.log.read(offset):
+            yield {
+                "id": event_offset,
+                "event": event["event"],
+                "data": dumps(event["data"]),
+            }
+
+    return EventSourceResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        sep="\n",
+    )
+
+
 @app.get("/api/browser_history/{filename}")
 async def get_browser_history_file(filename: str):
     """
-    Get a specific browser history GIF file.
+    Get a specific browser history recording file.
 
     Args:
-        filename: The filename of the GIF to retrieve
+        filename: The filename of the recording (GIF, WebP or frames zip)
 
     Returns:
-        The GIF file
+        The recording file
     """
     try:
-        file_path = os.path.join(BROWSER_HISTORY_DIR, filename)
-        if not os.path.exists(file_path) or not filename.endswith(".gif"):
+        media_types = dict(RECORDING_FILE_TYPES.values())
+        extension = os.path.splitext(filename)[1]
+        file_path = os.path.join(BROWSER_HISTORY_DIR, os.path.basename(filename))
+        if (
+            filename.startswith(".")
+            or extension not in media_types
+            or not os.path.exists(file_path)
+        ):
             raise HTTPException(status_code=404, detail="File not found")
 
-        return FileResponse(file_path, media_type="image/gif", filename=filename)
+        return FileResponse(
+            file_path, media_type=media_types[extension], filename=filename
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -179,3 +361,62 @@ async def get_team_members():
     except Exception as e:
         logger.error(f"Error getting team members: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/mcp/stats")
+async def get_mcp_stats():
+    """
+    Get per-server call statistics of the configured MCP servers.
+
+    Returns:
+        dict: Latency statistics per MCP server and Twitter scheduler counters
+    """
+    try:
+        return {
+            "servers": mcp_registry.stats(),
+            "twitter_scheduler": twitter_scheduler.stats(),
+        }
+    except Exception as e:
+        logger.error(f"Error getting MCP stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/graph/stats")
+async def get_graph_stats():
+    """
+    Get graph retrieval statistics.
+
+    Returns:
+        dict: Latency and token usage per search mode, semantic cache hit
+            rate, index load counters and incremental indexing status
+    """
+    try:
+        return {
+            "search": graph_search_stats.snapshot(),
+            "semantic_cache": semantic_cache.stats(),
+            "index": graph_index.stats(),
+            "indexer": graph_indexer.stats(),
+        }
+    except Exception as e:
+        logger.error(f"Error getting graph stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/scheduler/stats")
+async def get_scheduler_stats():
+    """
+    Get workflow admission statistics.
+
+    Returns:
+        dict: Running and queued workflows, queue wait times and the usage
+            of each limited resource
+    """
+    try:
+        return {
+            "workflows": workflow_scheduler.stats(),
+            "jobs": job_manager.stats(),
+            "resources": resource_limits.stats(),
+        }
+    except Exception as e:
+        logger.error(f"Error getting scheduler stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
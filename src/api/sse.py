@@ -0,0 +1,168 @@
+"""
+Helpers for streaming workflow events as server-sent events.
+"""
+
+import asyncio
+import json
+import zlib
+from typing import Any, AsyncIterator, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import SSE_BATCH_MAX_DELAY, SSE_BATCH_MAX_CHARS
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up, the stdlib encoder works too
+    orjson = None
+
+
+def dumps(data: Any) -> str:
+    """Serialize event data to JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers over 64 bits, which the stdlib encoder handles
+            pass
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _delta_key(event: dict) -> Optional[tuple[str, str]]:
+    """(message_id, delta field) of a single-field message delta, else None."""
+    if event["event"] != "message":
+        return None
+    delta = event["data"].get("delta")
+    if not isinstance(delta, dict) or len(delta) != 1:
+        return None
+    ((field, value),) = delta.items()
+    if not isinstance(value, str):
+        return None
+    return event["data"].get("message_id"), field
+
+
+async def coalesce_deltas(
+    events: AsyncIterator[dict],
+    max_delay: float = SSE_BATCH_MAX_DELAY,
+    max_chars: int = SSE_BATCH_MAX_CHARS,
+) -> AsyncIterator[dict]:
+    """Merge consecutive token deltas of the same message into one event.
+
+    A batch is sent once it is ``max_delay`` seconds old or holds
+    ``max_chars`` characters, and before any other event, so the event order
+    seen by clients is unchanged. A ``max_delay`` of 0 disables batching.
+    """
+    if max_delay <= 0:
+        async for event in events:
+            yield event
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = aiter(events)
+    pending: Optional[asyncio.Future] = None
+    batch: Optional[dict] = None
+    batch_key = None
+    parts: list[str] = []
+    size = 0
+    deadline = 0.0
+
+    def flush() -> dict:
+        nonlocal batch, parts, size
+        event = batch
+        event["data"]["delta"][batch_key[1]] = "".join(parts)
+        batch, parts, size = None, [], 0
+        return event
+
+    try:
+        while True:
+            if batch is None and pending is None:
+                # Nothing buffered: no timer needed, wait for the next event.
+                try:
+                    event = await anext(iterator)
+                except StopAsyncIteration:
+                    break
+            else:
+                if pending is None:
+                    pending = asyncio.ensure_future(anext(iterator))
+                timeout = None if batch is None else max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+                if not done:
+                    yield flush()
+                    continue
+                future, pending = pending, None
+                try:
+                    event = future.result()
+                except StopAsyncIteration:
+                    break
+
+            key = _delta_key(event)
+            if batch is not None and key != batch_key:
+                yield flush()
+            if key is None:
+                yield event
+                continue
+            text = next(iter(event["data"]["delta"].values()))
+            if batch is None:
+                batch, batch_key = event, key
+                deadline = loop.time() + max_delay
+            parts.append(text)
+            size += len(text)
+            if size >= max_chars:
+                yield flush()
+        if batch is not None:
+            yield flush()
+    finally:
+        if pending is not None:
+            # Cancelling the pending step cancels the workflow behind it.
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class EventStreamGZipMiddleware:
+    """Gzip ``text/event-stream`` responses for clients that accept it.
+
+    Starlette's GZipMiddleware buffers its output and skips event streams.
+    This one compresses each chunk as it is sent and sync-flushes it, so
+    events still reach the client immediately.
+    """
+
+    def __init__(self, app: ASGIApp, level: int = 6):
+        self.app = app
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get(
+            "accept-encoding", ""
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        compressor = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal compressor
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if (
+                    headers.get("content-type", "").startswith("text/event-stream")
+                    and "content-encoding" not in headers
+                ):
+                    compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+                    headers["Content-Encoding"] = "gzip"
+                    headers.add_vary_header("Accept-Encoding")
+                    if "content-length" in headers:
+                        del headers["content-length"]
+            elif message["type"] == "http.response.body" and compressor is not None:
+                body = compressor.compress(message.get("body", b""))
+                if message.get("more_body", False):
+                    body += compressor.flush(zlib.Z_SYNC_FLUSH)
+                else:
+                    body += compressor.flush()
+                message = {**message, "body": body}
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
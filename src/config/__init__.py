@@ -11,14 +11,98 @@ from .env import (
     VL_MODEL,
     VL_BASE_URL,
     VL_API_KEY,
+    # Embedding model
+    EMBEDDING_MODEL,
+    EMBEDDING_BASE_URL,
+    EMBEDDING_API_KEY,
+    # Supervisor routing
+    SUPERVISOR_ROUTING,
     # Other configurations
     CHROME_INSTANCE_PATH,
     CHROME_HEADLESS,
     CHROME_PROXY_SERVER,
     CHROME_PROXY_USERNAME,
     CHROME_PROXY_PASSWORD,
+    # GraphRAG
+    GRAPHRAG_PROJECT_DIR,
+    GRAPHRAG_INGEST,
+    GRAPHRAG_INDEX_INTERVAL,
+    GRAPH_SEMANTIC_CACHE,
+    # Logging
+    LOG_SAMPLE_RATE,
+    LOG_PAYLOAD_FILE,
+    # SSE
+    SSE_COMPRESSION,
+    # Shared state
+    STATE_BACKEND_URL,
+    WORKFLOW_CHECKPOINTS,
+    # Replay
+    REPLAY_RECORD_FILE,
+    REPLAY_FIXTURES_FILE,
+    REPLAY_TOOL_LATENCY_SCALE,
+)
+from .tools import (
+    TAVILY_MAX_RESULTS,
+    BROWSER_HISTORY_DIR,
+    MCP_POOL_SIZE,
+    MCP_CALL_TIMEOUT,
+    MCP_START_TIMEOUT,
+    MCP_HEALTH_CHECK_INTERVAL,
+    MCP_SERVERS_CONFIG,
+    MCP_SCHEMA_CACHE_DIR,
+    MCP_LOAD_RETRY_INTERVAL,
+    TWITTER_RATE_LIMITS,
+    TWITTER_CACHE_TTLS,
+    TWITTER_MAX_QUEUE_WAIT,
+    TWITTER_RATE_LIMIT_BACKOFF,
+    BROWSER_POOL_SIZE,
+    BROWSER_POOL_MAX_USES,
+    BROWSER_POOL_IDLE_TIMEOUT,
+    BROWSER_POOL_MIN_WARM,
+    BROWSER_RECORDING_FORMATS,
+    BROWSER_HISTORY_MAX_AGE,
+    BROWSER_HISTORY_MAX_FILES,
+    BROWSER_SCREENSHOT_MAX_SIZE,
+    BROWSER_SCREENSHOT_HASH_DISTANCE,
+    BROWSER_SCREENSHOT_MAX_SKIPS,
+    GRAPHRAG_MEMORY_MAP,
+    GRAPHRAG_COMMUNITY_LEVEL,
+    GRAPHRAG_INDEX_KEEP_GENERATIONS,
+    GRAPHRAG_INGEST_TWITTER_TOOLS,
+    GRAPH_SEMANTIC_CACHE_THRESHOLD,
+    GRAPH_SEMANTIC_CACHE_TTL,
+    GRAPH_SEMANTIC_CACHE_MAX_ENTRIES,
+    PYTHON_SANDBOX_WORKERS,
+    PYTHON_SANDBOX_MAX_RUNS,
+    PYTHON_SANDBOX_TIMEOUT,
+    PYTHON_SANDBOX_CPU_SECONDS,
+    PYTHON_SANDBOX_MEMORY_MB,
+    PYTHON_SANDBOX_SESSION_TTL,
+    PYTHON_SANDBOX_PRELOAD,
+    BASH_MAX_CONCURRENCY,
+    BASH_OUTPUT_HEAD,
+    BASH_OUTPUT_TAIL,
+    BASH_PROGRESS_INTERVAL,
+    BASH_PROGRESS_MAX_CHARS,
+    LOG_PREVIEW_CHARS,
+    LOG_PAYLOAD_MAX_CHARS,
+    LOG_PAYLOAD_FILE_MAX_BYTES,
+    LOG_PAYLOAD_FILE_BACKUPS,
+    SSE_BATCH_MAX_DELAY,
+    SSE_BATCH_MAX_CHARS,
+    SSE_DISCONNECT_CHECK_INTERVAL,
+    WORKFLOW_MAX_RUNNING,
+    WORKFLOW_MAX_QUEUED,
+    WORKFLOW_KEY_PRIORITIES,
+    WORKFLOW_RESOURCE_LIMITS,
+    WORKFLOW_NODE_RESOURCES,
+    JOB_MAX_EVENTS,
+    JOB_TTL,
+    JOB_MAX_RETAINED,
+    JOB_SYNC_INTERVAL,
+    BATCH_CONCURRENCY,
+    SUPERVISOR_ROUTING_MAX_TOKENS,
 )
-from .tools import TAVILY_MAX_RESULTS, BROWSER_HISTORY_DIR
 
 # Team configuration
 TEAM_MEMBER_CONFIGRATIONS = {
@@ -86,6 +170,13 @@ __all__ = [
     "VL_MODEL",
     "VL_BASE_URL",
     "VL_API_KEY",
+    # Embedding model
+    "EMBEDDING_MODEL",
+    "EMBEDDING_BASE_URL",
+    "EMBEDDING_API_KEY",
+    # Supervisor routing
+    "SUPERVISOR_ROUTING",
+    "SUPERVISOR_ROUTING_MAX_TOKENS",
     # Other configurations
     "TEAM_MEMBERS",
     "TEAM_MEMBER_CONFIGRATIONS",
@@ -95,5 +186,74 @@ __all__ = [
     "CHROME_PROXY_SERVER",
     "CHROME_PROXY_USERNAME",
     "CHROME_PROXY_PASSWORD",
+    "GRAPHRAG_PROJECT_DIR",
+    "GRAPHRAG_INGEST",
+    "GRAPHRAG_INDEX_INTERVAL",
+    "GRAPH_SEMANTIC_CACHE",
+    "LOG_SAMPLE_RATE",
+    "LOG_PAYLOAD_FILE",
+    "SSE_COMPRESSION",
+    "STATE_BACKEND_URL",
+    "WORKFLOW_CHECKPOINTS",
+    "REPLAY_RECORD_FILE",
+    "REPLAY_FIXTURES_FILE",
+    "REPLAY_TOOL_LATENCY_SCALE",
     "BROWSER_HISTORY_DIR",
+    "MCP_POOL_SIZE",
+    "MCP_CALL_TIMEOUT",
+    "MCP_START_TIMEOUT",
+    "MCP_HEALTH_CHECK_INTERVAL",
+    "MCP_SERVERS_CONFIG",
+    "MCP_SCHEMA_CACHE_DIR",
+    "MCP_LOAD_RETRY_INTERVAL",
+    "TWITTER_RATE_LIMITS",
+    "TWITTER_CACHE_TTLS",
+    "TWITTER_MAX_QUEUE_WAIT",
+    "TWITTER_RATE_LIMIT_BACKOFF",
+    "BROWSER_POOL_SIZE",
+    "BROWSER_POOL_MAX_USES",
+    "BROWSER_POOL_IDLE_TIMEOUT",
+    "BROWSER_POOL_MIN_WARM",
+    "BROWSER_RECORDING_FORMATS",
+    "BROWSER_HISTORY_MAX_AGE",
+    "BROWSER_HISTORY_MAX_FILES",
+    "BROWSER_SCREENSHOT_MAX_SIZE",
+    "BROWSER_SCREENSHOT_HASH_DISTANCE",
+    "BROWSER_SCREENSHOT_MAX_SKIPS",
+    "GRAPHRAG_MEMORY_MAP",
+    "GRAPHRAG_COMMUNITY_LEVEL",
+    "GRAPHRAG_INDEX_KEEP_GENERATIONS",
+    "GRAPHRAG_INGEST_TWITTER_TOOLS",
+    "GRAPH_SEMANTIC_CACHE_THRESHOLD",
+    "GRAPH_SEMANTIC_CACHE_TTL",
+    "GRAPH_SEMANTIC_CACHE_MAX_ENTRIES",
+    "PYTHON_SANDBOX_WORKERS",
+    "PYTHON_SANDBOX_MAX_RUNS",
+    "PYTHON_SANDBOX_TIMEOUT",
+    "PYTHON_SANDBOX_CPU_SECONDS",
+    "PYTHON_SANDBOX_MEMORY_MB",
+    "PYTHON_SANDBOX_SESSION_TTL",
+    "PYTHON_SANDBOX_PRELOAD",
+    "BASH_MAX_CONCURRENCY",
+    "BASH_OUTPUT_HEAD",
+    "BASH_OUTPUT_TAIL",
+    "BASH_PROGRESS_INTERVAL",
+    "BASH_PROGRESS_MAX_CHARS",
+    "LOG_PREVIEW_CHARS",
+    "LOG_PAYLOAD_MAX_CHARS",
+    "LOG_PAYLOAD_FILE_MAX_BYTES",
+    "LOG_PAYLOAD_FILE_BACKUPS",
+    "SSE_BATCH_MAX_DELAY",
+    "SSE_BATCH_MAX_CHARS",
+    "SSE_DISCONNECT_CHECK_INTERVAL",
+    "WORKFLOW_MAX_RUNNING",
+    "WORKFLOW_MAX_QUEUED",
+    "WORKFLOW_KEY_PRIORITIES",
+    "WORKFLOW_RESOURCE_LIMITS",
+    "WORKFLOW_NODE_RESOURCES",
+    "JOB_MAX_EVENTS",
+    "JOB_TTL",
+    "JOB_MAX_RETAINED",
+    "JOB_SYNC_INTERVAL",
+    "BATCH_CONCURRENCY",
 ]
@@ -19,9 +19,46 @@ VL_MODEL = os.getenv("VL_MODEL", "gpt-4o")
 VL_BASE_URL = os.getenv("VL_BASE_URL")
 VL_API_KEY = os.getenv("VL_API_KEY")
 
+# Embedding model configuration (for the graph retrieval semantic cache)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_BASE_URL = os.getenv("EMBEDDING_BASE_URL", BASIC_BASE_URL)
+EMBEDDING_API_KEY = os.getenv("EMBEDDING_API_KEY", BASIC_API_KEY)
+
+# How the supervisor routes: "function_calling" (a forced call with an enum
+# argument), "json_mode", or "auto" to call a function where the model can
+SUPERVISOR_ROUTING = os.getenv("SUPERVISOR_ROUTING", "auto")
+
 # Chrome Instance configuration
 CHROME_INSTANCE_PATH = os.getenv("CHROME_INSTANCE_PATH")
 CHROME_HEADLESS = os.getenv("CHROME_HEADLESS", "False") == "True"
 CHROME_PROXY_SERVER = os.getenv("CHROME_PROXY_SERVER")
 CHROME_PROXY_USERNAME = os.getenv("CHROME_PROXY_USERNAME")
 CHROME_PROXY_PASSWORD = os.getenv("CHROME_PROXY_PASSWORD")
+
+# GraphRAG knowledge graph configuration
+GRAPHRAG_PROJECT_DIR = os.getenv(
+    "GRAPHRAG_PROJECT_DIR", "/Users/yanhuibin/myData/graphRAG"
+)
+GRAPHRAG_INGEST = os.getenv("GRAPHRAG_INGEST", "False") == "True"
+GRAPHRAG_INDEX_INTERVAL = int(os.getenv("GRAPHRAG_INDEX_INTERVAL", "0"))
+# Needs an embeddings endpoint (EMBEDDING_*)
+GRAPH_SEMANTIC_CACHE = os.getenv("GRAPH_SEMANTIC_CACHE", "False") == "True"
+
+# Logging: share of tool calls whose debug records are emitted, and an
+# optional JSON lines file of (size-capped) tool call payloads
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_PAYLOAD_FILE = os.getenv("LOG_PAYLOAD_FILE")
+
+# Gzip event streams for clients that accept it
+SSE_COMPRESSION = os.getenv("SSE_COMPRESSION", "False") == "True"
+
+# Shared state across server workers (memory://, sqlite:///path or redis://...)
+# and whether workflow runs are checkpointed under their workflow id
+STATE_BACKEND_URL = os.getenv("STATE_BACKEND_URL", "memory://")
+WORKFLOW_CHECKPOINTS = os.getenv("WORKFLOW_CHECKPOINTS", "False") == "True"
+
+# Record LLM and tool calls of workflow runs to a fixtures file, or replay
+# tool results from one (see src/replay), at a share of recorded latency
+REPLAY_RECORD_FILE = os.getenv("REPLAY_RECORD_FILE")
+REPLAY_FIXTURES_FILE = os.getenv("REPLAY_FIXTURES_FILE")
+REPLAY_TOOL_LATENCY_SCALE = float(os.getenv("REPLAY_TOOL_LATENCY_SCALE", "0"))
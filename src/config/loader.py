@@ -13,18 +13,38 @@ def replace_env_vars(value: str) -> str:
     return value
 
 
+def process_value(value: Any) -> Any:
+    """Replace environment variables in a value and, recursively, its items."""
+    if isinstance(value, dict):
+        return process_dict(value)
+    if isinstance(value, list):
+        return [process_value(item) for item in value]
+    return replace_env_vars(value)
+
+
 def process_dict(config: Dict[str, Any]) -> Dict[str, Any]:
     """Recursively process dictionary to replace environment variables."""
-    result = {}
-    for key, value in config.items():
-        if isinstance(value, dict):
-            result[key] = process_dict(value)
-        elif isinstance(value, str):
-            result[key] = replace_env_vars(value)
-        else:
-            result[key] = value
-    return result
+    return {key: process_value(value) for key, value in config.items()}
 
 
 _config_cache: Dict[str, Dict[str, Any]] = {}
 
+
+def load_yaml_config(file_path: str) -> Dict[str, Any]:
+    """Load and process YAML configuration file."""
+    # 如果文件不存在，返回{}
+    if not os.path.exists(file_path):
+        return {}
+
+    # 检查缓存中是否已存在配置
+    if file_path in _config_cache:
+        return _config_cache[file_path]
+
+    # 如果缓存中不存在，则加载并处理配置
+    with open(file_path, "r") as f:
+        config = yaml.safe_load(f) or {}
+    processed_config = process_dict(config)
+
+    # 将处理后的配置存入缓存
+    _config_cache[file_path] = processed_config
+    return processed_config
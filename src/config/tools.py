@@ -1,4 +1,153 @@
+import os
+
 # Tool configuration
 TAVILY_MAX_RESULTS = 5
 
 BROWSER_HISTORY_DIR = "static/browser_history"
+
+# MCP session pool configuration
+MCP_POOL_SIZE = 2
+MCP_CALL_TIMEOUT = 60
+MCP_START_TIMEOUT = 30
+MCP_HEALTH_CHECK_INTERVAL = 30
+
+# MCP server registry
+MCP_SERVERS_CONFIG = "mcp_servers.yaml"
+MCP_SCHEMA_CACHE_DIR = ".cache/mcp"
+# Seconds before a server that failed to load is tried again
+MCP_LOAD_RETRY_INTERVAL = 30
+
+# Twitter request scheduling: tool name -> (requests, window in seconds).
+# Roughly follows the X API per-user limits of the endpoints behind each tool.
+TWITTER_RATE_LIMITS = {
+    "search_twitter": (60, 900),
+    "get_timeline": (180, 900),
+    "get_latest_timeline": (180, 900),
+    "get_user_mentions": (180, 900),
+    "get_highlights_tweets": (180, 900),
+    "get_tweet_details": (300, 900),
+    "get_trends": (75, 900),
+    "get_user_followers": (15, 900),
+    "get_user_following": (15, 900),
+    "post_tweet": (100, 900),
+    "default": (100, 900),
+}
+# Read-only tools whose results are cached (seconds); others are never cached
+TWITTER_CACHE_TTLS = {
+    "search_twitter": 120,
+    "get_timeline": 60,
+    "get_latest_timeline": 60,
+    "get_user_mentions": 120,
+    "get_highlights_tweets": 300,
+    "get_tweet_details": 600,
+    "get_trends": 300,
+    "get_user_profile": 3600,
+    "get_user_by_screen_name": 3600,
+    "get_user_by_id": 3600,
+    "get_user_followers": 900,
+    "get_user_following": 900,
+}
+TWITTER_MAX_QUEUE_WAIT = 120
+TWITTER_RATE_LIMIT_BACKOFF = 60
+
+# Warm browser pool used by the browser tool
+BROWSER_POOL_SIZE = 3
+BROWSER_POOL_MAX_USES = 20
+BROWSER_POOL_IDLE_TIMEOUT = 600
+BROWSER_POOL_MIN_WARM = 1
+
+# Browser session recordings (opt-in per request)
+BROWSER_RECORDING_FORMATS = ("gif", "webp", "frames")
+BROWSER_HISTORY_MAX_AGE = 7 * 24 * 3600
+BROWSER_HISTORY_MAX_FILES = 500
+
+# Screenshots sent to the vision model by the browser agent
+BROWSER_SCREENSHOT_MAX_SIZE = (1024, 1536)
+BROWSER_SCREENSHOT_HASH_DISTANCE = 4
+BROWSER_SCREENSHOT_MAX_SKIPS = 2
+
+# Load graphrag index tables through memory-mapped Arrow files
+GRAPHRAG_MEMORY_MAP = True
+GRAPHRAG_COMMUNITY_LEVEL = 2
+
+# Incremental graphrag indexing of crawled articles and tweets
+GRAPHRAG_INDEX_KEEP_GENERATIONS = 2
+GRAPHRAG_INGEST_TWITTER_TOOLS = (
+    "search_twitter",
+    "get_timeline",
+    "get_latest_timeline",
+    "get_user_mentions",
+    "get_highlights_tweets",
+    "get_tweet_details",
+)
+
+# Semantic cache of graph retrieval answers. Queries must also name the same
+# entities to share an answer.
+GRAPH_SEMANTIC_CACHE_THRESHOLD = 0.95
+GRAPH_SEMANTIC_CACHE_TTL = 6 * 3600
+GRAPH_SEMANTIC_CACHE_MAX_ENTRIES = 2000
+
+# Process pool that runs python_repl_tool code, one session per workflow
+PYTHON_SANDBOX_WORKERS = min(4, os.cpu_count() or 1)
+PYTHON_SANDBOX_MAX_RUNS = 50
+PYTHON_SANDBOX_TIMEOUT = 120
+PYTHON_SANDBOX_CPU_SECONDS = 110
+PYTHON_SANDBOX_MEMORY_MB = 2048
+PYTHON_SANDBOX_SESSION_TTL = 1800
+PYTHON_SANDBOX_PRELOAD = ("numpy", "pandas")
+
+# bash_tool: commands running at once across workflows, and how many
+# characters of the start and end of each output stream are kept
+BASH_MAX_CONCURRENCY = 4
+BASH_OUTPUT_HEAD = 8000
+BASH_OUTPUT_TAIL = 8000
+# Live output is relayed as at most one progress event per stream and
+# interval, and only up to a total size; the tool result keeps head and tail
+BASH_PROGRESS_INTERVAL = 0.25
+BASH_PROGRESS_MAX_CHARS = 64000
+
+# Logging of tool inputs and outputs
+LOG_PREVIEW_CHARS = 500
+LOG_PAYLOAD_MAX_CHARS = 20000
+LOG_PAYLOAD_FILE_MAX_BYTES = 50 * 1024 * 1024
+LOG_PAYLOAD_FILE_BACKUPS = 3
+
+# SSE streaming: token deltas are batched for up to this many seconds or
+# characters, and client disconnects are polled at this interval
+SSE_BATCH_MAX_DELAY = 0.05
+SSE_BATCH_MAX_CHARS = 2000
+SSE_DISCONNECT_CHECK_INTERVAL = 1.0
+
+# Workflow admission: running workflows, waiting workflows before requests
+# are rejected, and priority per API key (higher first, default 0)
+WORKFLOW_MAX_RUNNING = 8
+WORKFLOW_MAX_QUEUED = 100
+WORKFLOW_KEY_PRIORITIES: dict[str, int] = {}
+# Graph nodes across all workflows using a resource at once. Every agent node
+# uses its LLM type (see AGENT_LLM_MAP), some nodes also use other resources.
+WORKFLOW_RESOURCE_LIMITS = {
+    "llm:basic": 8,
+    "llm:reasoning": 2,
+    "llm:vision": 2,
+    "browser": BROWSER_POOL_SIZE,
+    "coder": PYTHON_SANDBOX_WORKERS,
+}
+WORKFLOW_NODE_RESOURCES = {
+    "browser": ("browser",),
+    "coder": ("coder",),
+}
+
+# Background workflow jobs: events kept per job for replay, and how long and
+# how many finished jobs stay readable
+JOB_MAX_EVENTS = 10000
+JOB_TTL = 3600
+JOB_MAX_RETAINED = 200
+# Seconds between checks for events and cancellation of jobs that run on
+# another worker, with a shared state backend
+JOB_SYNC_INTERVAL = 0.2
+
+# Workflows the batch runner runs at once
+BATCH_CONCURRENCY = 4
+
+# Output tokens of a supervisor routing completion, enough for {"next": <name>}
+SUPERVISOR_ROUTING_MAX_TOKENS = 16
@@ -1,7 +1,10 @@
+from typing import Optional
+
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 
+from src.service.scheduler import resource_limits
 from .types import State
 from .nodes import (
     supervisor_node,
@@ -15,17 +18,26 @@ from .nodes import (
 )
 
 
-def build_graph():
-    """Build and return the agent workflow graph."""
+def build_graph(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """Build and return the agent workflow graph.
+
+    Args:
+        checkpointer: Saves the state of every run under its thread id
+    """
     builder = StateGraph(State)
     builder.add_edge(START, "coordinator")
-    builder.add_node("coordinator", coordinator_node)
-    builder.add_node("planner", planner_node)
-    builder.add_node("supervisor", supervisor_node)
-    builder.add_node("researcher", research_node)
-    builder.add_node("coder", code_node)
-    builder.add_node("browser", browser_node)
-    builder.add_node("twitter", twitter_node)
-    builder.add_node("reporter", reporter_node)
-    
-    return builder.compile() #checkpointer=MemorySaver()
+    nodes = {
+        "coordinator": coordinator_node,
+        "planner": planner_node,
+        "supervisor": supervisor_node,
+        "researcher": research_node,
+        "coder": code_node,
+        "browser": browser_node,
+        "twitter": twitter_node,
+        "reporter": reporter_node,
+    }
+    for name, node in nodes.items():
+        # Nodes wait for a slot of each resource they use, e.g. their LLM type
+        builder.add_node(name, resource_limits.wrap_node(name, node))
+
+    return builder.compile(checkpointer=checkpointer)
@@ -8,7 +8,7 @@ from langchain_core.messages import HumanMessage, BaseMessage
 from src.agents.agents import create_agent
 from src.tools.file_management import write_file_tool
 from src.tools.human_feedback import human_feedback_tool
-from src.agents import research_agent, coder_agent, browser_agent, twitter_agent
+from src.agents import research_agent, coder_agent, browser_agent, get_twitter_agent
 
 
 import json_repair
@@ -21,7 +21,9 @@ from src.config.agents import AGENT_LLM_MAP
 from src.prompts.template import apply_prompt_template
 from src.tools.search import tavily_tool
 from src.utils.json_utils import repair_json_output
-from .types import State, Router
+from src.utils.log_utils import log_preview
+from .router import get_router, parse_route
+from .types import State
 
 
 logger = logging.getLogger(__name__)
@@ -36,7 +38,7 @@ def research_node(state: State) -> Command[Literal["supervisor"]]:
     response_content = result["messages"][-1].content
     # 尝试修复可能的JSON输出
     response_content = repair_json_output(response_content)
-    logger.debug(f"Research agent response: {response_content}")
+    log_preview(logger, "Research agent response", response_content)
     return Command(
         update={
             "messages": [
@@ -58,7 +60,7 @@ def code_node(state: State) -> Command[Literal["supervisor"]]:
     response_content = result["messages"][-1].content
     # 尝试修复可能的JSON输出
     response_content = repair_json_output(response_content)
-    logger.debug(f"Code agent response: {response_content}")
+    log_preview(logger, "Code agent response", response_content)
     return Command(
         update={
             "messages": [
@@ -79,7 +81,7 @@ def browser_node(state: State) -> Command[Literal["supervisor"]]:
     response_content = result["messages"][-1].content
     # 尝试修复可能的JSON输出
     response_content = repair_json_output(response_content)
-    logger.debug(f"Browser agent response: {response_content}")
+    log_preview(logger, "Browser agent response", response_content)
     return Command(
         update={
             "messages": [
@@ -95,12 +97,12 @@ def browser_node(state: State) -> Command[Literal["supervisor"]]:
 def twitter_node(state: State) -> Command[Literal["supervisor"]]:
     """Node for the twitter agent that performs web browsing tasks."""
     logger.info("Twitter agent starting task")
-    result = twitter_agent.invoke(state)
+    result = get_twitter_agent().invoke(state)
     logger.info("Twitter agent completed task")
     response_content = result["messages"][-1].content
     # 尝试修复可能的JSON输出
     response_content = repair_json_output(response_content)
-    logger.debug(f"Twitter agent response: {response_content}")
+    log_preview(logger, "Twitter agent response", response_content)
     return Command(
         update={
             "messages": [
@@ -123,14 +125,10 @@ def supervisor_node(state: State) -> Command[Literal[*TEAM_MEMBERS, "__end__"]]:
     for message in messages:
         if isinstance(message, BaseMessage) and message.name in TEAM_MEMBERS:
             message.content = RESPONSE_FORMAT.format(message.name, message.content)
-    response = (
-        get_llm_by_type(AGENT_LLM_MAP["supervisor"])
-        .with_structured_output(schema=Router, method="json_mode")
-        .invoke(messages)
-    )
-    goto = response["next"]
-    logger.debug(f"Current state messages: {state['messages']}")
-    logger.debug(f"Supervisor response: {response}")
+    response = get_router(AGENT_LLM_MAP["supervisor"]).invoke(messages)
+    goto = parse_route(response)
+    log_preview(logger, "Current state messages", state["messages"])
+    log_preview(logger, "Supervisor response", response)
 
     if goto == "FINISH":
         goto = "__end__"
@@ -166,8 +164,8 @@ def planner_node(state: State) -> Command[Literal["supervisor", "__end__"]]:
     full_response = ""
     for chunk in stream:
         full_response += chunk.content
-    logger.debug(f"Current state messages: {state['messages']}")
-    logger.debug(f"Planner response: {full_response}")
+    log_preview(logger, "Current state messages", state["messages"])
+    log_preview(logger, "Planner response", full_response)
 
     if full_response.startswith("```json"):
         full_response = full_response.removeprefix("```json")
@@ -197,11 +195,11 @@ def coordinator_node(state: State) -> Command[Literal["planner", "__end__"]]:
     logger.info("Coordinator talking.")
     messages = apply_prompt_template("coordinator", state)
     response = get_llm_by_type(AGENT_LLM_MAP["coordinator"]).bind_tools([human_feedback_tool]).invoke(messages)
-    logger.debug(f"Current state messages: {state['messages']}")
+    log_preview(logger, "Current state messages", state["messages"])
     response_content = response.content
     # 尝试修复可能的JSON输出
     response_content = repair_json_output(response_content)
-    logger.debug(f"Coordinator response: {response_content}")
+    log_preview(logger, "Coordinator response", response_content)
 
     goto = "__end__"
     if "handoff_to_planner" in response_content:
@@ -220,11 +218,11 @@ def reporter_node(state: State) -> Command[Literal["supervisor"]]:
     logger.info("Reporter write final report")
     messages = apply_prompt_template("reporter", state)
     response = get_llm_by_type(AGENT_LLM_MAP["reporter"]).invoke(messages)
-    logger.debug(f"Current state messages: {state['messages']}")
+    log_preview(logger, "Current state messages", state["messages"])
     response_content = response.content
     # 尝试修复可能的JSON输出
     response_content = repair_json_output(response_content)
-    logger.debug(f"reporter response: {response_content}")
+    log_preview(logger, "reporter response", response_content)
 
     return Command(
         update={
@@ -245,7 +243,7 @@ def save_file_node(state: State) -> Command[Literal["supervisor"]]:
     file_manager_agent = create_agent("file_manager", [write_file_tool], "file_manager")
     result = file_manager_agent.invoke(state)
     response_content = result["messages"][-1].content
-    logger.debug(f"save_file response: {response_content}")
+    log_preview(logger, "save_file response", response_content)
     return Command(
         update={},
         goto="supervisor",
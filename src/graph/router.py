@@ -0,0 +1,141 @@
+"""
+Supervisor routing with a minimal completion.
+
+Where the model supports tool calling, routing is a forced call of a
+``route`` function whose only argument is an enum of the options (strict,
+i.e. decoded against the schema, on the OpenAI API), so the whole
+completion is the chosen name. Other models answer in JSON mode. Either way
+the completion is capped at a few tokens and its ``next`` field is read
+locally, repairing broken JSON, instead of costing a retry.
+"""
+
+import logging
+from typing import Any, Optional
+
+import json_repair
+import litellm
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable
+from langchain_deepseek import ChatDeepSeek
+from langchain_openai import ChatOpenAI
+
+from src.config import SUPERVISOR_ROUTING, SUPERVISOR_ROUTING_MAX_TOKENS
+from src.config.agents import LLMType
+from src.llms.litellm_v2 import ChatLiteLLMV2
+from src.llms.llm import get_llm_by_type
+from .types import OPTIONS, Router
+
+logger = logging.getLogger(__name__)
+
+ROUTE_TOOL_NAME = "route"
+
+ROUTE_TOOL = {
+    "type": "function",
+    "function": {
+        "name": ROUTE_TOOL_NAME,
+        "description": Router.__doc__,
+        "parameters": {
+            "type": "object",
+            "properties": {"next": {"type": "string", "enum": OPTIONS}},
+            "required": ["next"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+_OPTIONS_BY_NAME = {option.lower(): option for option in OPTIONS}
+
+# Bound routing models per LLM type
+_router_cache: dict[LLMType, Runnable] = {}
+
+
+def supports_tool_calling(llm: BaseChatModel) -> bool:
+    """Whether routing can be a forced function call on this model."""
+    if isinstance(llm, ChatLiteLLMV2):
+        try:
+            return litellm.supports_function_calling(model=llm.model)
+        except Exception:
+            return False
+    if isinstance(llm, ChatDeepSeek):
+        return "reasoner" not in llm.model_name
+    return isinstance(llm, ChatOpenAI)
+
+
+def _bind_route_tool(llm: BaseChatModel) -> Runnable:
+    tool_choice = {"type": "function", "function": {"name": ROUTE_TOOL_NAME}}
+    if isinstance(llm, ChatLiteLLMV2):
+        return llm.bind_tools(
+            [ROUTE_TOOL],
+            **llm._filter_disabled_params(
+                tool_choice=tool_choice, parallel_tool_calls=False
+            ),
+        )
+    if isinstance(llm, ChatOpenAI) and not llm.openai_api_base:
+        # Only the OpenAI API itself is known to decode against strict schemas
+        return llm.bind_tools(
+            [ROUTE_TOOL],
+            tool_choice=tool_choice,
+            strict=True,
+            parallel_tool_calls=False,
+        )
+    return llm.bind_tools([ROUTE_TOOL], tool_choice=tool_choice)
+
+
+def get_router(llm_type: LLMType) -> Runnable:
+    """The LLM of ``llm_type`` bound for routing. Cached per type."""
+    if llm_type in _router_cache:
+        return _router_cache[llm_type]
+
+    llm = get_llm_by_type(llm_type)
+    method = SUPERVISOR_ROUTING
+    if method == "auto":
+        method = "function_calling" if supports_tool_calling(llm) else "json_mode"
+    if method == "function_calling":
+        router = _bind_route_tool(llm)
+    else:
+        router = llm.bind(response_format={"type": "json_object"})
+    # Reasoning models spend their output tokens thinking first
+    if llm_type != "reasoning":
+        router = router.bind(max_tokens=SUPERVISOR_ROUTING_MAX_TOKENS)
+    logger.info(f"Supervisor routing on {llm_type} LLM with {method}")
+    _router_cache[llm_type] = router
+    return router
+
+
+def _option(args: Any) -> Optional[str]:
+    """The option in the ``next`` field of args, matched case-insensitively."""
+    value = args.get("next") if isinstance(args, dict) else None
+    if not isinstance(value, str):
+        return None
+    return _OPTIONS_BY_NAME.get(value.strip().lower())
+
+
+def parse_route(message: AIMessage) -> str:
+    """The option a routing completion chose.
+
+    Reads ``next`` from the route call's arguments, or else from the content
+    parsed as (possibly broken) JSON.
+
+    Raises:
+        ValueError: The completion names no valid option in ``next``.
+    """
+    candidates: list[Any] = [call["args"] for call in message.tool_calls]
+    candidates += [
+        json_repair.loads(call.get("args") or "{}")
+        for call in getattr(message, "invalid_tool_calls", None) or []
+    ]
+    content = (
+        message.content if isinstance(message.content, str) else str(message.content)
+    )
+    if content.strip():
+        candidates.append(json_repair.loads(content))
+    for candidate in candidates:
+        option = _option(candidate)
+        if option is not None:
+            return option
+    logger.error(
+        f"Supervisor route has no valid next option: {message.tool_calls!r} "
+        f"{content[:200]!r}"
+    )
+    raise ValueError(f"Supervisor route has no valid next option: {content[:200]!r}")
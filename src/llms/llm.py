@@ -1,4 +1,4 @@
-from langchain_openai import ChatOpenAI
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_deepseek import ChatDeepSeek
 from src.llms.litellm_v2 import ChatLiteLLMV2 as ChatLiteLLM
 from typing import Optional
@@ -14,6 +14,9 @@ from src.config import (
     VL_MODEL,
     VL_BASE_URL,
     VL_API_KEY,
+    EMBEDDING_MODEL,
+    EMBEDDING_BASE_URL,
+    EMBEDDING_API_KEY,
 )
 from src.config.agents import LLMType
 
@@ -84,6 +87,27 @@ def create_litellm_model(
     return ChatLiteLLM(**llm_kwargs)
 
 
+def create_openai_embeddings(
+    model: str,
+    base_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+    **kwargs,
+) -> OpenAIEmbeddings:
+    """
+    Create an OpenAIEmbeddings instance with the specified configuration
+    """
+    # OpenAI-compatible servers do not share OpenAI's tokenizer, send raw text
+    embedding_kwargs = {"model": model, "check_embedding_ctx_length": False, **kwargs}
+
+    if base_url:  # This will handle None or empty string
+        embedding_kwargs["base_url"] = base_url
+
+    if api_key:  # This will handle None or empty string
+        embedding_kwargs["api_key"] = api_key
+
+    return OpenAIEmbeddings(**embedding_kwargs)
+
+
 # Cache for LLM instances
 _llm_cache: dict[LLMType, ChatOpenAI | ChatDeepSeek | ChatLiteLLM] = (
     {}
@@ -168,6 +192,23 @@ def get_llm_by_type(
     return llm
 
 
+_embeddings: Optional[OpenAIEmbeddings] = None
+
+
+def get_embeddings() -> OpenAIEmbeddings:
+    """
+    Get the embedding model. Created on first use, then cached.
+    """
+    global _embeddings
+    if _embeddings is None:
+        _embeddings = create_openai_embeddings(
+            model=EMBEDDING_MODEL,
+            base_url=EMBEDDING_BASE_URL,
+            api_key=EMBEDDING_API_KEY,
+        )
+    return _embeddings
+
+
 # Initialize LLMs for different purposes - now these will be cached
 reasoning_llm = get_llm_by_type("reasoning")
 basic_llm = get_llm_by_type("basic")
@@ -0,0 +1,31 @@
+"""
+Record and replay of LLM and tool interactions, to run workflows offline.
+
+Record real runs with ``REPLAY_RECORD_FILE``, then replay them with the
+fake LLM server (``python -m src.replay.fake_llm_server``) and the fake
+tool backend (``REPLAY_FIXTURES_FILE``).
+"""
+
+from typing import Optional
+
+from src.config import REPLAY_FIXTURES_FILE, REPLAY_TOOL_LATENCY_SCALE
+from .fake_tools import FakeToolBackend
+from .fixtures import FixtureStore
+from .recorder import Recorder, recording_callbacks
+
+
+def install_fake_tools_from_env() -> Optional[FakeToolBackend]:
+    """Replay tool results from REPLAY_FIXTURES_FILE, if it is set."""
+    if not REPLAY_FIXTURES_FILE:
+        return None
+    store = FixtureStore.load(REPLAY_FIXTURES_FILE)
+    return FakeToolBackend(store, scale=REPLAY_TOOL_LATENCY_SCALE).install()
+
+
+__all__ = [
+    "FakeToolBackend",
+    "FixtureStore",
+    "Recorder",
+    "recording_callbacks",
+    "install_fake_tools_from_env",
+]
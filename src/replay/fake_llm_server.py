@@ -0,0 +1,254 @@
+"""
+A fake OpenAI-compatible LLM server that replays recorded responses.
+
+Serves ``/v1/chat/completions`` (streaming or not, with tool calls and
+DeepSeek-style ``reasoning_content``), ``/v1/embeddings`` (deterministic
+vectors derived from the input text) and ``/v1/models``. Point
+``BASIC_BASE_URL``, ``REASONING_BASE_URL``, ``VL_BASE_URL`` and
+``EMBEDDING_BASE_URL`` at it to run workflows without a real provider.
+
+    python -m src.replay.fake_llm_server fixtures.jsonl --port 8100 --ttft 0.3 --token-delay 0.02
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import struct
+import time
+import uuid
+from typing import AsyncIterator, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.api.sse import dumps
+from .fixtures import FixtureStore
+
+# OpenAI's text-embedding-3-small
+DEFAULT_EMBEDDING_DIMENSIONS = 1536
+
+
+class Latency:
+    """How long a replayed completion takes.
+
+    Args:
+        ttft: Seconds before the first chunk.
+        token_delay: Seconds between chunks.
+        chunk_chars: Characters of content per chunk, about a token each.
+        scale: If above 0, replay the recorded time to first token and
+            duration times ``scale`` instead of ``ttft`` and ``token_delay``.
+    """
+
+    def __init__(
+        self,
+        ttft: float = 0.0,
+        token_delay: float = 0.0,
+        chunk_chars: int = 4,
+        scale: float = 0.0,
+    ):
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.chunk_chars = chunk_chars
+        self.scale = scale
+
+    def of(self, record: dict, chunks: int) -> tuple[float, float]:
+        """(time to first chunk, delay between chunks) for a fixture."""
+        if self.scale > 0 and record.get("duration") is not None:
+            ttft = (record.get("ttft") or 0.0) * self.scale
+            rest = max(0.0, record["duration"] * self.scale - ttft)
+            return ttft, rest / max(1, chunks)
+        return self.ttft, self.token_delay
+
+
+def _pieces(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _tool_calls(response: dict) -> list[dict]:
+    return [
+        {
+            "id": call.get("id") or f"call_{uuid.uuid4().hex[:24]}",
+            "type": "function",
+            "function": {
+                "name": call["name"],
+                "arguments": json.dumps(call["args"], ensure_ascii=False),
+            },
+        }
+        for call in response.get("tool_calls") or []
+    ]
+
+
+def _usage(messages: list[dict], response: dict) -> dict:
+    # Roughly four characters a token; only relative sizes matter here.
+    prompt = sum(len(str(m.get("content") or "")) for m in messages) // 4
+    completion = len(str(response.get("content") or "")) // 4
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+    }
+
+
+def _embedding(text: str, dimensions: int) -> list[float]:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = sum(x * x for x in vector) ** 0.5
+    return [x / norm for x in vector]
+
+
+def create_app(store: FixtureStore, latency: Optional[Latency] = None) -> FastAPI:
+    """The fake server's ASGI app, e.g. to run in-process in benchmarks."""
+    latency = latency or Latency()
+    app = FastAPI(title="Fake LLM server")
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "replay", "object": "model"}]}
+
+    @app.get("/v1/replay/stats")
+    async def stats():
+        return store.stats()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        record = store.llm_response(messages)
+        if record is None:
+            return JSONResponse(
+                {"error": {"message": "No recorded response", "type": "replay_miss"}},
+                status_code=404,
+            )
+        response = record["response"]
+        content = response.get("content") or ""
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False)
+        reasoning = response.get("reasoning_content") or ""
+        tool_calls = _tool_calls(response)
+        model = body.get("model", "replay")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        finish_reason = "tool_calls" if tool_calls else "stop"
+        pieces = [
+            *(
+                {"reasoning_content": p}
+                for p in _pieces(reasoning, latency.chunk_chars)
+            ),
+            *({"content": p} for p in _pieces(content, latency.chunk_chars)),
+        ]
+        ttft, token_delay = latency.of(record, len(pieces))
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft + token_delay * len(pieces))
+            message = {"role": "assistant", "content": content}
+            if reasoning:
+                message["reasoning_content"] = reasoning
+            if tool_calls:
+                message["tool_calls"] = tool_calls
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {"index": 0, "message": message, "finish_reason": finish_reason}
+                ],
+                "usage": _usage(messages, response),
+            }
+
+        def chunk(delta: dict, finish: Optional[str] = None, **extra) -> str:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **extra,
+            }
+            return f"data: {dumps(data)}\n\n"
+
+        async def stream() -> AsyncIterator[str]:
+            await asyncio.sleep(ttft)
+            yield chunk({"role": "assistant", "content": ""})
+            for i, delta in enumerate(pieces):
+                if i and token_delay:
+                    await asyncio.sleep(token_delay)
+                yield chunk(delta)
+            if tool_calls:
+                yield chunk(
+                    {
+                        "tool_calls": [
+                            {"index": i, **call} for i, call in enumerate(tool_calls)
+                        ]
+                    }
+                )
+            yield chunk({}, finish_reason)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                data = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": _usage(messages, response),
+                }
+                yield f"data: {dumps(data)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input", [])
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dimensions = body.get("dimensions") or DEFAULT_EMBEDDING_DIMENSIONS
+        data = []
+        for i, text in enumerate(inputs):
+            vector = _embedding(str(text), dimensions)
+            if body.get("encoding_format") == "base64":
+                vector = base64.b64encode(
+                    struct.pack(f"<{dimensions}f", *vector)
+                ).decode()
+            data.append({"object": "embedding", "index": i, "embedding": vector})
+        tokens = sum(len(str(text)) // 4 for text in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "replay"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server")
+    parser.add_argument("fixtures", help="JSON lines file written by the recorder")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--ttft", type=float, default=0.0, help="Seconds to the first chunk"
+    )
+    parser.add_argument(
+        "--token-delay", type=float, default=0.0, help="Seconds between chunks"
+    )
+    parser.add_argument("--chunk-chars", type=int, default=4)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=0.0,
+        help="Replay recorded latencies times this factor instead",
+    )
+    args = parser.parse_args()
+    latency = Latency(args.ttft, args.token_delay, args.chunk_chars, args.scale)
+    app = create_app(FixtureStore.load(args.fixtures), latency)
+    print(f"Set *_BASE_URL=http://{args.host}:{args.port}/v1 to use the fake server")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
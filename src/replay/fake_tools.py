@@ -0,0 +1,130 @@
+"""
+Tool backends that replay recorded results instead of calling out.
+
+Installing the fake backend patches ``_run``/``_arun`` of every tool class,
+so the tools keep their names, schemas and callbacks (and the agents keep
+binding them as before) but search, crawl, MCP and the other tools return
+recorded results after a configurable delay.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Iterable, Optional
+
+from langchain_core.tools import BaseTool, ToolException
+
+from .fixtures import INJECTED_TOOL_ARGS, FixtureStore
+
+logger = logging.getLogger(__name__)
+
+
+def _tool_classes(cls: type = BaseTool) -> list[type]:
+    classes = []
+    for subclass in cls.__subclasses__():
+        classes.append(subclass)
+        classes.extend(_tool_classes(subclass))
+    return classes
+
+
+class FakeToolBackend:
+    """Answers tool calls from fixtures.
+
+    Args:
+        store: The recorded tool results.
+        delay: Seconds every call takes, on top of the scaled recording.
+        scale: Share of the recorded duration every call takes, e.g. 1.0 to
+            replay at recorded speed, 0 to return at once.
+        passthrough: Names of tools that still run for real, e.g. local ones
+            like ``python_repl_tool``.
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        delay: float = 0.0,
+        scale: float = 0.0,
+        passthrough: Iterable[str] = (),
+    ):
+        self.store = store
+        self.delay = delay
+        self.scale = scale
+        self.passthrough = set(passthrough)
+        self._originals: dict[tuple[type, str], Any] = {}
+
+    def _lookup(
+        self, tool: BaseTool, args: tuple, kwargs: dict
+    ) -> tuple[Optional[dict], float]:
+        if len(args) == 1 and not any(k not in INJECTED_TOOL_ARGS for k in kwargs):
+            tool_input = args[0]
+        else:
+            tool_input = kwargs
+        record = self.store.tool_result(tool.name, tool_input)
+        if record is None:
+            logger.warning(f"No recorded result for tool {tool.name}")
+            return None, self.delay
+        return record, self.delay + self.scale * record.get("duration", 0.0)
+
+    @staticmethod
+    def _output(tool: BaseTool, record: Optional[dict]) -> Any:
+        if record is None:
+            content, artifact = f"No recorded result for {tool.name}", None
+        elif record.get("error"):
+            raise ToolException(record["output"])
+        else:
+            content, artifact = record["output"], record.get("artifact")
+        if tool.response_format == "content_and_artifact":
+            return content, artifact
+        return content
+
+    def _fake_run(self, original):
+        backend = self
+
+        # wraps() keeps the signature BaseTool.run inspects to decide whether
+        # to pass run_manager and config.
+        @functools.wraps(original)
+        def _run(tool, *args, **kwargs):
+            if tool.name in backend.passthrough:
+                return original(tool, *args, **kwargs)
+            record, delay = backend._lookup(tool, args, kwargs)
+            if delay:
+                time.sleep(delay)
+            return backend._output(tool, record)
+
+        return _run
+
+    def _fake_arun(self, original):
+        backend = self
+
+        @functools.wraps(original)
+        async def _arun(tool, *args, **kwargs):
+            if tool.name in backend.passthrough:
+                return await original(tool, *args, **kwargs)
+            record, delay = backend._lookup(tool, args, kwargs)
+            if delay:
+                await asyncio.sleep(delay)
+            return backend._output(tool, record)
+
+        return _arun
+
+    def install(self) -> "FakeToolBackend":
+        """Patch all tool classes defined so far; later subclasses inherit it."""
+        for cls in _tool_classes():
+            for name, fake in (("_run", self._fake_run), ("_arun", self._fake_arun)):
+                if name in cls.__dict__ and (cls, name) not in self._originals:
+                    self._originals[(cls, name)] = cls.__dict__[name]
+                    setattr(cls, name, fake(cls.__dict__[name]))
+        logger.info(f"Fake tool backend installed on {len(self._originals)} methods")
+        return self
+
+    def uninstall(self) -> None:
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals.clear()
+
+    def __enter__(self) -> "FakeToolBackend":
+        return self.install()
+
+    def __exit__(self, *exc_info) -> None:
+        self.uninstall()
@@ -0,0 +1,126 @@
+"""
+Recorded LLM and tool interactions, and how requests are matched to them.
+
+Fixtures are JSON lines, one interaction each:
+
+    {"kind": "llm", "key": ..., "group": ..., "messages": [...],
+     "response": {"content": ..., "tool_calls": [...]}, "ttft": ..., "duration": ...}
+    {"kind": "tool", "key": ..., "group": <tool name>, "input": ...,
+     "output": ..., "artifact": ..., "error": false, "duration": ...}
+
+A request is answered by the fixtures recorded for the same key, in turn.
+Without an exact match (e.g. a prompt changed since the recording), it gets
+the next fixture of the same group (the agent's system prompt, or the tool),
+then of the same kind, so a replay always completes deterministically.
+"""
+
+import hashlib
+import itertools
+import json
+import re
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+# Prompts embed the time they were rendered at
+_CURRENT_TIME = re.compile(r"^CURRENT_TIME: .*$", re.MULTILINE)
+
+# Arguments tools get from the framework rather than from the model
+INJECTED_TOOL_ARGS = ("run_manager", "config", "callbacks", "tool_call_id")
+
+
+def _text(content: Any) -> str:
+    if content is None:
+        return ""
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else str(part.get("text", ""))
+            for part in content
+        )
+    return str(content)
+
+
+def _normalize(message: dict) -> tuple[str, str]:
+    return message.get("role", ""), _CURRENT_TIME.sub(
+        "CURRENT_TIME:", _text(message.get("content"))
+    )
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def llm_key(messages: list[dict]) -> str:
+    """Key of a chat request, from its OpenAI-style messages."""
+    return _digest([_normalize(message) for message in messages])
+
+
+def llm_group(messages: list[dict]) -> str:
+    """The agent a chat request comes from, told apart by its system prompt."""
+    system = [_normalize(m) for m in messages if m.get("role") == "system"]
+    return _digest(system[:1])
+
+
+def tool_key(name: str, tool_input: Any) -> str:
+    if isinstance(tool_input, dict):
+        tool_input = {
+            k: v for k, v in tool_input.items() if k not in INJECTED_TOOL_ARGS
+        }
+    return _digest([name, tool_input])
+
+
+class FixtureStore:
+    """Recorded interactions, indexed for replay."""
+
+    def __init__(self, records: Iterable[dict] = ()):
+        self._by_key: dict[tuple, list[dict]] = defaultdict(list)
+        self._by_group: dict[tuple, list[dict]] = defaultdict(list)
+        self._by_kind: dict[str, list[dict]] = defaultdict(list)
+        self._turns: dict[tuple, itertools.count] = defaultdict(itertools.count)
+        self.hits = 0
+        self.fallbacks = 0
+        self.misses = 0
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureStore":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def add(self, record: dict) -> None:
+        kind = record["kind"]
+        self._by_key[(kind, record["key"])].append(record)
+        self._by_group[(kind, record["group"])].append(record)
+        self._by_kind[kind].append(record)
+
+    def _next(self, index: tuple, records: list[dict]) -> dict:
+        return records[next(self._turns[index]) % len(records)]
+
+    def find(self, kind: str, key: str, group: str) -> Optional[dict]:
+        """The fixture to answer a request with, None if there is none at all."""
+        if self._by_key.get((kind, key)):
+            self.hits += 1
+            return self._next(("key", kind, key), self._by_key[(kind, key)])
+        if self._by_group.get((kind, group)):
+            self.fallbacks += 1
+            return self._next(("group", kind, group), self._by_group[(kind, group)])
+        if self._by_kind.get(kind):
+            self.fallbacks += 1
+            return self._next(("kind", kind), self._by_kind[kind])
+        self.misses += 1
+        return None
+
+    def llm_response(self, messages: list[dict]) -> Optional[dict]:
+        return self.find("llm", llm_key(messages), llm_group(messages))
+
+    def tool_result(self, name: str, tool_input: Any) -> Optional[dict]:
+        return self.find("tool", tool_key(name, tool_input), name)
+
+    def stats(self) -> dict:
+        return {
+            "fixtures": {kind: len(records) for kind, records in self._by_kind.items()},
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "misses": self.misses,
+        }
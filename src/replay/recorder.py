@@ -0,0 +1,134 @@
+"""
+Records the LLM and tool calls of real workflow runs as replay fixtures.
+
+The recorder is a callback handler, so it sees every chat model and tool
+run of a workflow, whatever the provider or tool backend (search, crawl,
+MCP servers). Set ``REPLAY_RECORD_FILE`` to record the workflows the API
+and batch runner run.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_community.adapters.openai import convert_message_to_dict
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import ToolMessage
+
+from src.config import REPLAY_RECORD_FILE
+from .fixtures import llm_group, llm_key, tool_key
+
+logger = logging.getLogger(__name__)
+
+
+class Recorder(BaseCallbackHandler):
+    """Appends every finished chat model and tool run to a fixtures file."""
+
+    # Nothing slow happens here; avoid a thread hop per callback.
+    run_inline = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._runs: dict[UUID, dict] = {}
+        self.recorded = 0
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.recorded += 1
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._runs[run_id] = {
+            "messages": [convert_message_to_dict(m) for m in messages[0]],
+            "started_at": time.perf_counter(),
+            "ttft": None,
+        }
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs):
+        run = self._runs.get(run_id)
+        if run is not None and run["ttft"] is None:
+            run["ttft"] = round(time.perf_counter() - run["started_at"], 4)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        message = response.generations[0][0].message
+        messages = run["messages"]
+        self._write(
+            {
+                "kind": "llm",
+                "key": llm_key(messages),
+                "group": llm_group(messages),
+                "messages": messages,
+                "response": {
+                    "content": message.content,
+                    "tool_calls": [
+                        {"name": call["name"], "args": call["args"], "id": call["id"]}
+                        for call in getattr(message, "tool_calls", None) or []
+                    ],
+                    "reasoning_content": message.additional_kwargs.get(
+                        "reasoning_content"
+                    ),
+                },
+                "ttft": run["ttft"],
+                "duration": round(time.perf_counter() - run["started_at"], 4),
+            }
+        )
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._runs.pop(run_id, None)
+
+    def on_tool_start(
+        self,
+        serialized: dict,
+        input_str: str,
+        *,
+        run_id: UUID,
+        inputs: Optional[dict] = None,
+        **kwargs,
+    ):
+        self._runs[run_id] = {
+            "name": serialized.get("name"),
+            "input": inputs if inputs is not None else input_str,
+            "started_at": time.perf_counter(),
+        }
+
+    def _tool_record(self, run: dict, output: Any, error: bool) -> dict:
+        artifact = None
+        if isinstance(output, ToolMessage):
+            output, artifact = output.content, output.artifact
+        return {
+            "kind": "tool",
+            "key": tool_key(run["name"], run["input"]),
+            "group": run["name"],
+            "input": run["input"],
+            "output": output,
+            "artifact": artifact,
+            "error": error,
+            "duration": round(time.perf_counter() - run["started_at"], 4),
+        }
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            self._write(self._tool_record(run, output, error=False))
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is not None:
+            self._write(self._tool_record(run, str(error), error=True))
+
+
+recorder = Recorder(REPLAY_RECORD_FILE) if REPLAY_RECORD_FILE else None
+
+
+def recording_callbacks() -> list[BaseCallbackHandler]:
+    """Callbacks to run workflows with: the recorder, if recording is on."""
+    return [recorder] if recorder is not None else []
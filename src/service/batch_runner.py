@@ -0,0 +1,217 @@
+"""
+Runs a batch of workflow queries from a JSON lines file.
+
+Each input line is a query, either a JSON string or an object:
+
+    {"id": "eth-daily", "query": "...", "deep_thinking_mode": true}
+
+``id`` defaults to a hash of the line, ``deep_thinking_mode``,
+``search_before_planning`` and ``team_members`` to the API defaults. Items
+run concurrently in one process, so they share the tool caches, browser
+pool and Python sandbox. Every result is appended to the output file as
+soon as it finishes; a rerun skips the items that already completed there
+and retries the failed ones.
+
+    python -m src.service.batch_runner queries.jsonl -o results.jsonl -c 4
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Optional
+
+from langchain_community.adapters.openai import convert_message_to_dict
+
+from src.config import TEAM_MEMBERS, TEAM_MEMBER_CONFIGRATIONS, BATCH_CONCURRENCY
+from src.replay import recording_callbacks
+from src.service.state_backend import release_checkpoints
+from src.service.workflow_service import graph
+from src.tools.python_repl import python_sandbox
+from src.utils.stats import CallStats
+
+logger = logging.getLogger(__name__)
+
+
+def read_items(path: str) -> list[dict]:
+    """Parse the input file into items with an ``id`` and a ``query``."""
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"query": item}
+            if not item.get("query"):
+                raise ValueError(f"{path}:{line_number}: item has no query")
+            if "id" not in item:
+                # Stable across reruns even if lines are added or reordered
+                digest = hashlib.sha1(line.encode("utf-8")).hexdigest()
+                item["id"] = digest[:16]
+            items.append(item)
+    return items
+
+
+def completed_ids(path: str) -> set[str]:
+    """Ids of the items that already completed in an earlier run."""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted run
+                continue
+            if result.get("status") == "completed":
+                done.add(result["id"])
+    return done
+
+
+async def run_item(item: dict, timeout: Optional[float] = None) -> dict:
+    """Run one item through the graph and return its result record."""
+    team_members = item.get("team_members") or TEAM_MEMBERS
+    inputs = {
+        "TEAM_MEMBERS": team_members,
+        "TEAM_MEMBER_CONFIGRATIONS": TEAM_MEMBER_CONFIGRATIONS,
+        "messages": [{"role": "user", "content": item["query"]}],
+        "deep_thinking_mode": item.get("deep_thinking_mode", False),
+        "search_before_planning": item.get("search_before_planning", False),
+    }
+    # A new thread per attempt: a rerun of the item must not resume the
+    # checkpoints of an earlier one
+    workflow_id = f"batch_{item['id']}_{uuid.uuid4().hex[:12]}"
+    config = {
+        "callbacks": recording_callbacks(),
+        "configurable": {
+            "thread_id": workflow_id,
+            "workflow_id": workflow_id,
+            "browser_recording": None,
+        },
+    }
+    result: dict[str, Any] = {
+        "id": item["id"],
+        "workflow_id": workflow_id,
+        "query": item["query"],
+    }
+    # Nodes run one after another, so the time between two updates is the
+    # time the second node took.
+    nodes: list[tuple[str, float]] = []
+    state: dict = {}
+    started_at = time.time()
+    last = time.perf_counter()
+
+    async def stream():
+        nonlocal state, last
+        async for mode, chunk in graph.astream(
+            inputs, config, stream_mode=["updates", "values"]
+        ):
+            if mode == "values":
+                state = chunk
+                continue
+            now = time.perf_counter()
+            for node in chunk:
+                nodes.append((node, round(now - last, 3)))
+            last = now
+
+    try:
+        await asyncio.wait_for(stream(), timeout)
+        result["status"] = "completed"
+    except Exception as e:
+        logger.error(f"Batch item {item['id']} failed: {e!r}")
+        result["status"] = "failed"
+        result["error"] = repr(e) if isinstance(e, asyncio.TimeoutError) else str(e)
+    finally:
+        # Free the item's Python session on the sandbox workers
+        python_sandbox.close_session(workflow_id)
+        release_checkpoints(graph.checkpointer, workflow_id)
+
+    messages = [convert_message_to_dict(m) for m in state.get("messages", [])]
+    reports = [m["content"] for m in messages if m.get("name") == "reporter"]
+    result["report"] = reports[-1] if reports else None
+    result["messages"] = messages
+    result["timings"] = {
+        "started_at": started_at,
+        "duration": round(time.time() - started_at, 3),
+        "nodes": nodes,
+    }
+    return result
+
+
+async def run_batch(
+    input_path: str,
+    output_path: str,
+    concurrency: int = BATCH_CONCURRENCY,
+    timeout: Optional[float] = None,
+) -> dict:
+    """Run every item of ``input_path`` that has not completed yet.
+
+    Returns:
+        dict: Counts of completed, failed and skipped items and durations
+    """
+    items = read_items(input_path)
+    done = completed_ids(output_path)
+    pending = [item for item in items if item["id"] not in done]
+    logger.info(
+        f"Batch of {len(items)} items: {len(items) - len(pending)} already completed, "
+        f"running {len(pending)} with concurrency {concurrency}"
+    )
+    slots = asyncio.Semaphore(concurrency)
+    durations = CallStats(window=max(1, len(pending)))
+    started_at = time.perf_counter()
+
+    with open(output_path, "a+", encoding="utf-8") as output:
+        if output.tell():
+            output.seek(output.tell() - 1)
+            if output.read(1) != "\n":
+                # Close the line an interrupted run left unfinished.
+                output.write("\n")
+
+        async def run(item: dict) -> None:
+            async with slots:
+                result = await run_item(item, timeout)
+            failed = result["status"] != "completed"
+            durations.record(result["timings"]["duration"], error=failed)
+            # One write per line keeps the file parseable after a crash.
+            output.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+            output.flush()
+            logger.info(
+                f"Batch item {item['id']} {result['status']} in "
+                f"{result['timings']['duration']}s ({durations.calls}/{len(pending)})"
+            )
+
+        await asyncio.gather(*(run(item) for item in pending))
+
+    summary = durations.snapshot()
+    return {
+        "completed": summary["calls"] - summary["errors"],
+        "failed": summary["errors"],
+        "skipped": len(items) - len(pending),
+        "wall_seconds": round(time.perf_counter() - started_at, 3),
+        "duration": {k: summary[k] for k in ("avg", "p50", "p95", "max")},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run workflow queries from a JSON lines file"
+    )
+    parser.add_argument("input", help="JSON lines file of queries")
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="JSON lines file results are appended to; defaults to <input>.results.jsonl",
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--timeout", type=float, help="Seconds allowed per item")
+    args = parser.parse_args()
+    output = args.output or f"{os.path.splitext(args.input)[0]}.results.jsonl"
+    summary = asyncio.run(run_batch(args.input, output, args.concurrency, args.timeout))
+    print(json.dumps(summary, indent=2))
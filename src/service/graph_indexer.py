@@ -0,0 +1,309 @@
+"""
+Incremental graphrag indexing of crawled articles and tweets.
+
+Documents are dropped into the graphrag input directory as they are fetched.
+On a schedule the indexer copies the current output to a new generation
+directory, runs an incremental graphrag update on it (only new documents are
+extracted) and atomically repoints the ``output`` symlink, so the retriever
+only ever sees complete indexes.
+"""
+
+import argparse
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src.config import (
+    GRAPHRAG_PROJECT_DIR,
+    GRAPHRAG_INGEST,
+    GRAPHRAG_INDEX_INTERVAL,
+    GRAPHRAG_INDEX_KEEP_GENERATIONS,
+)
+from src.utils.async_runtime import AsyncRuntime
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_LINK = "output"
+GENERATION_PREFIX = "output-"
+# Written into a generation once it has been indexed successfully, dated
+# when the run started
+INDEXED_MARKER = ".indexed_at"
+# graphrag's scratch copies of an update run, next to the generation
+UPDATE_OUTPUT_SUFFIX = ".update"
+# Where graphrag puts them by default, from runs before they were redirected
+DEFAULT_UPDATE_OUTPUT = "update_output"
+# Locked by the one process that indexes the project; every server worker
+# schedules indexing
+INDEXER_LOCK = ".indexer.lock"
+
+
+class GraphIndexer:
+    """Ingests documents and keeps the graphrag index of a project fresh."""
+
+    def __init__(
+        self,
+        project_dir: str = GRAPHRAG_PROJECT_DIR,
+        ingest_enabled: bool = GRAPHRAG_INGEST,
+        keep_generations: int = GRAPHRAG_INDEX_KEEP_GENERATIONS,
+    ):
+        self.project_dir = project_dir
+        self.input_dir = os.path.join(project_dir, "input")
+        self.output_link = os.path.join(project_dir, OUTPUT_LINK)
+        self.ingest_enabled = ingest_enabled
+        self.keep_generations = max(1, keep_generations)
+        self.runtime = AsyncRuntime("graph-indexer")
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_file = None
+        self.ingested = 0
+        self.last_run: Optional[dict] = None
+
+    def ingest(self, source: str, title: str, text: str) -> Optional[str]:
+        """Write a document to the graphrag input directory.
+
+        Documents are named by content hash, so re-fetching the same content
+        never produces a second document.
+
+        Args:
+            source: Where the document came from, e.g. "crawl" or "twitter".
+            title: A human readable title, kept as the first line.
+            text: The document body.
+
+        Returns:
+            The path of the input file, or None if ingestion is disabled.
+        """
+        if not self.ingest_enabled or not text.strip():
+            return None
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+        slug = re.sub(r"[^\w-]+", "-", source).strip("-")
+        path = os.path.join(self.input_dir, f"{slug}-{digest}.txt")
+        if os.path.exists(path):
+            return path
+        os.makedirs(self.input_dir, exist_ok=True)
+        # Hidden while being written; graphrag only picks up *.txt files.
+        tmp_path = os.path.join(self.input_dir, f".{slug}-{digest}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(f"{title}\n\n{text}")
+        os.replace(tmp_path, path)
+        self.ingested += 1
+        return path
+
+    def ingest_tool_result(self, tool_name: str, arguments: dict, result: Any) -> None:
+        """Ingest the output of a read-only tool call."""
+        content = result[0] if isinstance(result, tuple) else result
+        if not isinstance(content, str):
+            content = json.dumps(content, ensure_ascii=False, default=str)
+        title = (
+            f"{tool_name} {json.dumps(arguments, ensure_ascii=False, sort_keys=True)}"
+        )
+        try:
+            self.ingest(f"twitter-{tool_name}", title, content)
+        except OSError as e:
+            logger.warning(f"Failed to ingest {tool_name} result: {e}")
+
+    def _current_generation(self) -> Optional[str]:
+        """The output directory the retriever reads, if there is one."""
+        if os.path.islink(self.output_link):
+            return os.path.realpath(self.output_link)
+        if os.path.isdir(self.output_link):
+            return self.output_link
+        return None
+
+    def _adopt_output(self) -> Optional[str]:
+        """Turn a manually built output directory into a generation."""
+        if os.path.islink(self.output_link) or not os.path.isdir(self.output_link):
+            return self._current_generation()
+        generation = self._new_generation_path()
+        os.rename(self.output_link, generation)
+        self._point_output_to(generation)
+        return generation
+
+    def _new_generation_path(self) -> str:
+        # Sortable by creation time, down to the nanosecond
+        now = time.time_ns()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now / 1e9))
+        name = f"{GENERATION_PREFIX}{stamp}-{now % 10**9:09d}"
+        return os.path.join(self.project_dir, name)
+
+    def _point_output_to(self, generation: str) -> None:
+        tmp_link = f"{self.output_link}.tmp"
+        if os.path.lexists(tmp_link):
+            os.remove(tmp_link)
+        os.symlink(os.path.basename(generation), tmp_link)
+        # rename(2) over the old link is atomic for readers of output/.
+        os.replace(tmp_link, self.output_link)
+
+    def _prune_generations(self, current: str) -> None:
+        generations = []
+        for entry in os.scandir(self.project_dir):
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            if entry.name == DEFAULT_UPDATE_OUTPUT or (
+                entry.name.startswith(GENERATION_PREFIX)
+                and entry.name.endswith(UPDATE_OUTPUT_SUFFIX)
+            ):
+                # Update scratch left behind by an interrupted run
+                shutil.rmtree(entry.path, ignore_errors=True)
+                logger.info(f"Removed graph index update output {entry.path}")
+            elif entry.name.startswith(GENERATION_PREFIX):
+                generations.append(entry.path)
+        stale = sorted(path for path in generations if path != current)
+        for path in stale[: max(0, len(stale) - (self.keep_generations - 1))]:
+            shutil.rmtree(path, ignore_errors=True)
+            logger.info(f"Removed old graph index generation {path}")
+
+    def has_new_input(self) -> bool:
+        generation = self._current_generation()
+        if generation is None:
+            return os.path.isdir(self.input_dir) and any(
+                name.endswith(".txt") for name in os.listdir(self.input_dir)
+            )
+        marker = os.path.join(generation, INDEXED_MARKER)
+        indexed_at = os.path.getmtime(marker) if os.path.exists(marker) else 0.0
+        try:
+            return any(
+                entry.stat().st_mtime > indexed_at
+                for entry in os.scandir(self.input_dir)
+                if entry.name.endswith(".txt")
+            )
+        except FileNotFoundError:
+            return False
+
+    def _claim(self) -> bool:
+        """Whether this process indexes the project.
+
+        The first process to lock the project keeps the lock until it exits,
+        when the next one to try takes over.
+        """
+        if self._lock_file is None:
+            os.makedirs(self.project_dir, exist_ok=True)
+            lock_file = open(os.path.join(self.project_dir, INDEXER_LOCK), "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                return False
+            self._lock_file = lock_file
+            logger.info(f"Indexing {self.project_dir} in process {os.getpid()}")
+        return True
+
+    def _load_config(self, generation: str):
+        from graphrag.config.load_config import load_config
+
+        config = load_config(Path(self.project_dir))
+        # load_config resolves output/ through the symlink; index into the
+        # new generation instead, vector stores included.
+        output_dir = config.output.base_dir
+        config.output.base_dir = generation
+        for store in config.vector_store.values():
+            if store.db_uri and store.db_uri.startswith(output_dir):
+                store.db_uri = generation + store.db_uri[len(output_dir) :]
+        # Full copies of the previous output and the delta, removed after the run
+        config.update_index_output.base_dir = generation + UPDATE_OUTPUT_SUFFIX
+        return config
+
+    async def run_once(self, force: bool = False) -> Optional[str]:
+        """Index new input documents into a fresh generation and swap it in.
+
+        Args:
+            force: Index even if no input changed since the last run.
+
+        Returns:
+            The new generation directory, or None if there was nothing to do
+            or another process indexes the project.
+        """
+        import graphrag.api as api
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Input written from here on may miss this run; the marker gets
+            # this time so the next run picks it up.
+            run_started_at = time.time()
+            if not self._claim():
+                return None
+            if not force and not await asyncio.to_thread(self.has_new_input):
+                return None
+            started_at = time.perf_counter()
+            previous = await asyncio.to_thread(self._adopt_output)
+            generation = self._new_generation_path()
+            if previous:
+                await asyncio.to_thread(
+                    shutil.copytree, previous, generation, symlinks=True
+                )
+            try:
+                config = self._load_config(generation)
+                results = await api.build_index(
+                    config=config, is_update_run=previous is not None
+                )
+                errors = [r.workflow for r in results if r.errors]
+                if errors:
+                    raise RuntimeError(f"graphrag workflows failed: {errors}")
+            except BaseException:
+                shutil.rmtree(generation, ignore_errors=True)
+                raise
+            finally:
+                shutil.rmtree(generation + UPDATE_OUTPUT_SUFFIX, ignore_errors=True)
+            marker = Path(generation, INDEXED_MARKER)
+            marker.touch()
+            os.utime(marker, (run_started_at, run_started_at))
+            self._point_output_to(generation)
+            self._prune_generations(generation)
+            self.last_run = {
+                "generation": os.path.basename(generation),
+                "incremental": previous is not None,
+                "seconds": round(time.perf_counter() - started_at, 1),
+                "finished_at": time.time(),
+            }
+            logger.info(f"Graph index updated: {self.last_run}")
+            return generation
+
+    async def run_forever(self, interval: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Graph indexing failed: {e!r}")
+            await asyncio.sleep(interval)
+
+    def schedule(self, interval: float = GRAPHRAG_INDEX_INTERVAL) -> None:
+        """Start periodic indexing in the background (0 disables it)."""
+        if interval > 0:
+            self.runtime.submit(self.run_forever(interval))
+            logger.info(f"Graph indexing scheduled every {interval}s")
+
+    def stats(self) -> dict:
+        return {
+            "ingest_enabled": self.ingest_enabled,
+            "ingested": self.ingested,
+            "last_run": self.last_run,
+        }
+
+
+graph_indexer = GraphIndexer()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental graphrag indexing")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="Seconds between runs; run once and exit if 0",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Index even without new input"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.interval > 0:
+        asyncio.run(graph_indexer.run_forever(args.interval))
+    else:
+        print(asyncio.run(graph_indexer.run_once(force=args.force)))
@@ -0,0 +1,370 @@
+"""
+Workflows that run as background jobs, detached from any connection.
+
+Each job appends its events to a bounded log with absolute offsets. Clients
+read the log from any offset, wait for new events, disconnect and reconnect
+without affecting the workflow.
+
+With a shared state backend, jobs are also mirrored to it, so any server
+worker can report on, stream and cancel a job running on another one.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterator, Callable, Optional
+
+from src.config import JOB_MAX_EVENTS, JOB_TTL, JOB_MAX_RETAINED, JOB_SYNC_INTERVAL
+from src.service.scheduler import WorkflowScheduler, workflow_scheduler
+from src.service.state_backend import StateBackend, state_backend
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "completed", "failed", "cancelled")
+
+
+class EventLog:
+    """An append-only event log that keeps the last ``max_events`` events."""
+
+    def __init__(self, max_events: int = JOB_MAX_EVENTS):
+        self._events: deque[dict] = deque(maxlen=max_events)
+        self.next_offset = 0
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    @property
+    def first_offset(self) -> int:
+        """Offset of the oldest event still in the log."""
+        return self.next_offset - len(self._events)
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def append(self, event: dict) -> int:
+        offset = self.next_offset
+        self._events.append(event)
+        self.next_offset += 1
+        self._notify()
+        return offset
+
+    def close(self) -> None:
+        self.closed = True
+        self._notify()
+
+    def since(self, offset: int) -> list[tuple[int, dict]]:
+        """The ``(offset, event)`` pairs still in the log from ``offset`` on."""
+        offset = max(offset, self.first_offset)
+        return [
+            (i, self._events[i - self.first_offset])
+            for i in range(offset, self.next_offset)
+        ]
+
+    async def read(self, offset: int = 0) -> AsyncIterator[tuple[int, dict]]:
+        """Yield ``(offset, event)`` from ``offset`` on, until the log closes.
+
+        Events that were already dropped from the log are skipped; readers
+        can tell from the first offset they receive.
+        """
+        offset = max(0, offset)
+        while True:
+            changed = self._changed
+            while offset < self.next_offset:
+                offset = max(offset, self.first_offset)
+                yield offset, self._events[offset - self.first_offset]
+                offset += 1
+            if self.closed:
+                return
+            await changed.wait()
+
+
+def _owner(key: str) -> str:
+    """Identifies the API key a job belongs to without storing the key."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class Job:
+    def __init__(self, key: str, max_events: int):
+        self.id = str(uuid.uuid4())
+        self.key = key
+        self.owner = _owner(key)
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.log = EventLog(max_events)
+        self.task: Optional[asyncio.Task] = None
+        self.mirror: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def info(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "first_offset": self.log.first_offset,
+            "next_offset": self.log.next_offset,
+        }
+
+    async def ainfo(self) -> dict:
+        return self.info()
+
+
+def _info_key(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _events_key(job_id: str) -> str:
+    return f"job:{job_id}:events"
+
+
+def _cancel_key(job_id: str) -> str:
+    return f"job:{job_id}:cancel"
+
+
+class BackendEventLog:
+    """Reads the event log of a job mirrored to the state backend."""
+
+    def __init__(self, backend: StateBackend, job_id: str, poll_interval: float):
+        self.backend = backend
+        self.job_id = job_id
+        self.poll_interval = poll_interval
+
+    def since(self, offset: int) -> list[tuple[int, dict]]:
+        key = _events_key(self.job_id)
+        while True:
+            head = self.backend.lrange(key, 0, 0)
+            if not head:
+                return []
+            first_offset = json.loads(head[0])["offset"]
+            items = [
+                json.loads(item)
+                for item in self.backend.lrange(key, max(0, offset - first_offset), -1)
+            ]
+            # The list was trimmed between the two reads; indices moved.
+            if items and items[0]["offset"] > max(offset, first_offset):
+                continue
+            return [(item["offset"], item["event"]) for item in items]
+
+    async def read(self, offset: int = 0) -> AsyncIterator[tuple[int, dict]]:
+        """Same as ``EventLog.read``, polling the backend for new events."""
+        offset = max(0, offset)
+        while True:
+            info = await asyncio.to_thread(self.backend.get, _info_key(self.job_id))
+            # Events are written before the final status, so this is the end.
+            finished = info is None or json.loads(info)["finished_at"] is not None
+            events = await asyncio.to_thread(self.since, offset)
+            for offset, event in events:
+                yield offset, event
+            if events:
+                offset += 1
+            elif finished:
+                return
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+
+class RemoteJob:
+    """A job running on another server worker, seen through the backend."""
+
+    def __init__(self, backend: StateBackend, job_id: str, poll_interval: float):
+        self.backend = backend
+        self.id = job_id
+        self.log = BackendEventLog(backend, job_id, poll_interval)
+
+    def info(self) -> Optional[dict]:
+        info = self.backend.get(_info_key(self.id))
+        if info is None:
+            return None
+        info = json.loads(info)
+        info.pop("owner", None)
+        head = self.backend.lrange(_events_key(self.id), 0, 0)
+        tail = self.backend.lrange(_events_key(self.id), -1, -1)
+        info["first_offset"] = json.loads(head[0])["offset"] if head else 0
+        info["next_offset"] = json.loads(tail[0])["offset"] + 1 if tail else 0
+        return info
+
+    async def ainfo(self) -> Optional[dict]:
+        return await asyncio.to_thread(self.info)
+
+
+class JobManager:
+    """Starts workflow jobs and keeps finished ones around for replay.
+
+    Args:
+        scheduler: Admission control the jobs go through.
+        max_events: Events kept per job; older ones are dropped.
+        ttl: Seconds a finished job stays readable.
+        max_retained: Finished jobs kept at most, oldest dropped first.
+        backend: Where jobs are mirrored for other workers, if it is shared.
+        sync_interval: Seconds between backend polls for remote jobs.
+    """
+
+    def __init__(
+        self,
+        scheduler: WorkflowScheduler = workflow_scheduler,
+        max_events: int = JOB_MAX_EVENTS,
+        ttl: float = JOB_TTL,
+        max_retained: int = JOB_MAX_RETAINED,
+        backend: StateBackend = state_backend,
+        sync_interval: float = JOB_SYNC_INTERVAL,
+    ):
+        self.scheduler = scheduler
+        self.max_events = max_events
+        self.ttl = ttl
+        self.max_retained = max_retained
+        self.backend = backend
+        self.sync_interval = sync_interval
+        self._jobs: dict[str, Job] = {}
+
+    async def create(self, key: str, events: Callable[[], AsyncIterator[dict]]) -> Job:
+        """Queue a job and start it in the background.
+
+        Args:
+            key: API key the job is scheduled under.
+            events: Starts the workflow and returns its event stream.
+
+        Raises:
+            WorkflowQueueFull: Too many workflows are waiting already.
+        """
+        self._expire()
+        ticket = self.scheduler.enqueue(key)
+        job = Job(key, self.max_events)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, ticket, events))
+        if self.backend.shared:
+            # Visible to all workers before the id is handed out
+            await asyncio.to_thread(self._write, job, [])
+            job.mirror = asyncio.create_task(self._mirror(job))
+        return job
+
+    async def _run(self, job: Job, ticket, events) -> None:
+        try:
+            async for position in self.scheduler.wait(ticket):
+                job.log.append(
+                    {"event": "queue_position", "data": {"position": position}}
+                )
+            job.status = "running"
+            stream = events()
+            try:
+                async for event in stream:
+                    job.log.append(event)
+            finally:
+                await stream.aclose()
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error(f"Workflow job {job.id} failed: {e!r}")
+            job.status, job.error = "failed", str(e)
+        finally:
+            self.scheduler.release(ticket)
+            job.finished_at = time.time()
+            job.log.append(
+                {
+                    "event": "job_status",
+                    "data": {"status": job.status, "error": job.error},
+                }
+            )
+            job.log.close()
+
+    async def _mirror(self, job: Job) -> None:
+        """Copy the job's status and events to the backend, in batches."""
+        offset = 0
+        status = None
+        while True:
+            changed = job.log._changed
+            events = job.log.since(offset)
+            if events or job.status != status:
+                status = job.status
+                try:
+                    await asyncio.to_thread(self._write, job, events)
+                except Exception as e:
+                    logger.error(f"Could not mirror workflow job {job.id}: {e!r}")
+                if events:
+                    offset = events[-1][0] + 1
+            if job.log.closed and offset >= job.log.next_offset:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), self.sync_interval)
+            except asyncio.TimeoutError:
+                if not job.finished and await asyncio.to_thread(
+                    self.backend.get, _cancel_key(job.id)
+                ):
+                    job.task.cancel()
+
+    def _write(self, job: Job, events: list[tuple[int, dict]]) -> None:
+        info = job.info()
+        del info["first_offset"], info["next_offset"]
+        info["owner"] = job.owner
+        if events:
+            key = _events_key(job.id)
+            self.backend.rpush(
+                key,
+                *(
+                    json.dumps({"offset": offset, "event": event}, default=str)
+                    for offset, event in events
+                ),
+            )
+            self.backend.ltrim(key, -self.max_events, -1)
+            self.backend.expire(key, self.ttl)
+        # Written after the events: readers stop once they see it finished.
+        self.backend.set(_info_key(job.id), json.dumps(info), self.ttl)
+
+    async def get(
+        self, job_id: str, key: Optional[str] = None
+    ) -> Optional[Job | RemoteJob]:
+        """The job, or None if it doesn't exist or ``key`` doesn't own it."""
+        self._expire()
+        owner = _owner(key) if key is not None else None
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job if owner is None or job.owner == owner else None
+        if self.backend.shared:
+            # Running on, or finished by, another worker
+            info = await asyncio.to_thread(self.backend.get, _info_key(job_id))
+            if info is not None and owner in (None, json.loads(info).get("owner")):
+                return RemoteJob(self.backend, job_id, self.sync_interval)
+        return None
+
+    async def cancel(
+        self, job_id: str, key: Optional[str] = None
+    ) -> Optional[Job | RemoteJob]:
+        job = await self.get(job_id, key)
+        if isinstance(job, RemoteJob):
+            # The worker running it picks this up on its next sync.
+            await asyncio.to_thread(
+                self.backend.set, _cancel_key(job_id), "1", self.ttl
+            )
+        elif job is not None and not job.finished and job.task is not None:
+            job.task.cancel()
+        return job
+
+    def _expire(self) -> None:
+        now = time.time()
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished),
+            key=lambda job: job.finished_at,
+        )
+        excess = len(finished) - self.max_retained
+        for i, job in enumerate(finished):
+            if i < excess or now - job.finished_at > self.ttl:
+                del self._jobs[job.id]
+
+    def stats(self) -> dict:
+        counts = {status: 0 for status in JOB_STATUSES}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
+
+
+job_manager = JobManager()
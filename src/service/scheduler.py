@@ -0,0 +1,268 @@
+"""
+Admission control for agent workflows.
+
+A bounded number of workflows run at once; the rest wait in a queue that is
+served by priority, then round-robin across API keys, so one client sending
+a burst of requests cannot starve the others. Inside a running workflow,
+nodes hold per-resource slots (LLM type, browser, coder) while they run.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import ExitStack, contextmanager
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+from src.config import (
+    WORKFLOW_MAX_RUNNING,
+    WORKFLOW_MAX_QUEUED,
+    WORKFLOW_KEY_PRIORITIES,
+    WORKFLOW_RESOURCE_LIMITS,
+    WORKFLOW_NODE_RESOURCES,
+)
+from src.config.agents import AGENT_LLM_MAP
+from src.utils.stats import CallStats
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowQueueFull(Exception):
+    """Too many workflows are already waiting to run."""
+
+
+def client_label(key: str) -> str:
+    """Stands for an API key in queues, logs and stats, which never hold it."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+class Ticket:
+    """A workflow's place in the scheduler, from enqueue to release."""
+
+    __slots__ = ("client", "priority", "admitted", "changed", "enqueued_at")
+
+    def __init__(self, client: str, priority: int):
+        self.client = client
+        self.priority = priority
+        self.admitted = False
+        # Set whenever the ticket's position may have changed
+        self.changed = asyncio.Event()
+        self.enqueued_at = time.monotonic()
+
+
+class WorkflowScheduler:
+    """Bounds concurrently running workflows and queues the rest fairly.
+
+    Args:
+        max_running: Workflows allowed to run at once.
+        max_queued: Workflows allowed to wait; more are rejected.
+        priorities: Priority per API key, higher runs first; default 0.
+    """
+
+    def __init__(
+        self,
+        max_running: int = WORKFLOW_MAX_RUNNING,
+        max_queued: int = WORKFLOW_MAX_QUEUED,
+        priorities: Optional[dict[str, int]] = None,
+    ):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.priorities = WORKFLOW_KEY_PRIORITIES if priorities is None else priorities
+        # priority -> client -> waiting tickets. Clients are served in turn:
+        # the first client in the OrderedDict is next and moves to the back.
+        self._queues: dict[int, OrderedDict[str, deque[Ticket]]] = {}
+        self._running: set[Ticket] = set()
+        self._queued = 0
+        self.rejected = 0
+        self.wait_stats = CallStats()
+
+    def enqueue(self, key: str) -> Ticket:
+        """Take a place for a workflow of ``key``, admitting it if possible.
+
+        Raises:
+            WorkflowQueueFull: The queue is at ``max_queued``.
+        """
+        ticket = Ticket(client_label(key), self.priorities.get(key, 0))
+        if not self._queued and len(self._running) < self.max_running:
+            self._admit(ticket)
+            return ticket
+        if self._queued >= self.max_queued:
+            self.rejected += 1
+            raise WorkflowQueueFull(f"{self._queued} workflows are already waiting")
+        queue = self._queues.setdefault(ticket.priority, OrderedDict())
+        queue.setdefault(ticket.client, deque()).append(ticket)
+        self._queued += 1
+        logger.info(
+            f"Workflow of client {ticket.client} queued at position "
+            f"{self.position(ticket)}"
+        )
+        return ticket
+
+    def position(self, ticket: Ticket) -> Optional[int]:
+        """1-based place in the order workflows will start, None if admitted."""
+        if ticket.admitted:
+            return None
+        ahead = 0
+        for priority, queue in self._queues.items():
+            if priority > ticket.priority:
+                ahead += sum(len(tickets) for tickets in queue.values())
+        queue = self._queues.get(ticket.priority, {})
+        tickets = queue.get(ticket.client)
+        if tickets is None or ticket not in tickets:
+            return None
+        index = tickets.index(ticket)
+        # Round-robin: every client earlier in the rotation gets index + 1
+        # turns before this ticket, every later client index turns.
+        earlier = True
+        for client, others in queue.items():
+            if client == ticket.client:
+                earlier = False
+                continue
+            ahead += min(len(others), index + 1 if earlier else index)
+        return ahead + index + 1
+
+    async def wait(self, ticket: Ticket) -> AsyncIterator[int]:
+        """Yield the ticket's queue position whenever it changes, until admitted."""
+        last = None
+        while not ticket.admitted:
+            ticket.changed.clear()
+            position = self.position(ticket)
+            if position is not None and position != last:
+                last = position
+                yield position
+            await ticket.changed.wait()
+
+    def release(self, ticket: Ticket) -> None:
+        """Free the ticket's slot or queue place; safe to call more than once."""
+        if ticket in self._running:
+            self._running.remove(ticket)
+        else:
+            queue = self._queues.get(ticket.priority, {})
+            tickets = queue.get(ticket.client)
+            if tickets is None or ticket not in tickets:
+                return
+            tickets.remove(ticket)
+            if not tickets:
+                del queue[ticket.client]
+            self._queued -= 1
+        self._dispatch()
+
+    def _admit(self, ticket: Ticket) -> None:
+        ticket.admitted = True
+        self._running.add(ticket)
+        self.wait_stats.record(time.monotonic() - ticket.enqueued_at)
+        ticket.changed.set()
+
+    def _dispatch(self) -> None:
+        while len(self._running) < self.max_running and self._queued:
+            queue = self._queues[max(p for p, q in self._queues.items() if q)]
+            client, tickets = next(iter(queue.items()))
+            ticket = tickets.popleft()
+            # The client's turn is over; it goes to the back of the rotation.
+            del queue[client]
+            if tickets:
+                queue[client] = tickets
+            self._queued -= 1
+            self._admit(ticket)
+        # Everyone still waiting may have moved up.
+        for queue in self._queues.values():
+            for tickets in queue.values():
+                for waiting in tickets:
+                    waiting.changed.set()
+
+    def stats(self) -> dict:
+        waiting: dict[str, int] = {}
+        for queue in self._queues.values():
+            for client, tickets in queue.items():
+                waiting[client] = waiting.get(client, 0) + len(tickets)
+        return {
+            "running": len(self._running),
+            "queued": self._queued,
+            "queued_per_key": waiting,
+            "rejected": self.rejected,
+            "queue_wait": self.wait_stats.snapshot(),
+        }
+
+
+def node_resources(node: str) -> tuple[str, ...]:
+    """Resources a graph node holds while it runs."""
+    resources = list(WORKFLOW_NODE_RESOURCES.get(node, ()))
+    if node in AGENT_LLM_MAP:
+        resources.append(f"llm:{AGENT_LLM_MAP[node]}")
+    return tuple(resources)
+
+
+class ResourceLimits:
+    """Caps how many nodes across all workflows use a resource at once.
+
+    Graph nodes run synchronously in worker threads, so slots are plain
+    thread semaphores. Resources without a configured limit are unlimited.
+    """
+
+    def __init__(self, limits: dict[str, int] = WORKFLOW_RESOURCE_LIMITS):
+        self.limits = dict(limits)
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit) for name, limit in limits.items()
+        }
+        self._lock = threading.Lock()
+        self._in_use = {name: 0 for name in limits}
+        self._waiting = {name: 0 for name in limits}
+
+    @contextmanager
+    def hold(self, resources: Iterable[str]):
+        # A fixed acquisition order rules out deadlocks between nodes.
+        names = sorted(set(resources) & self._semaphores.keys())
+        with ExitStack() as stack:
+            for name in names:
+                stack.enter_context(self._slot(name))
+            yield
+
+    @contextmanager
+    def _slot(self, name: str):
+        semaphore = self._semaphores[name]
+        with self._lock:
+            self._waiting[name] += 1
+        try:
+            semaphore.acquire()
+        finally:
+            with self._lock:
+                self._waiting[name] -= 1
+        with self._lock:
+            self._in_use[name] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use[name] -= 1
+            semaphore.release()
+
+    def wrap_node(self, name: str, node: Callable) -> Callable:
+        """Make graph node ``name`` hold its resources while it runs."""
+        resources = node_resources(name)
+        if not resources:
+            return node
+
+        @functools.wraps(node)
+        def limited_node(*args, **kwargs):
+            with self.hold(resources):
+                return node(*args, **kwargs)
+
+        return limited_node
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "limit": limit,
+                    "in_use": self._in_use[name],
+                    "waiting": self._waiting[name],
+                }
+                for name, limit in self.limits.items()
+            }
+
+
+workflow_scheduler = WorkflowScheduler()
+resource_limits = ResourceLimits()
@@ -0,0 +1,479 @@
+"""
+State shared between server worker processes.
+
+Backends implement a small Redis-like subset (strings, counters and lists
+with expiry), so the same code runs against process memory, a SQLite file
+on a single node or a Redis server across nodes:
+
+    memory://                 one process only, the default
+    sqlite:///path/state.db   all workers on one machine
+    redis://host:6379/0       all workers on any machine
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Hashable, Optional
+
+from src.config import STATE_BACKEND_URL, WORKFLOW_CHECKPOINTS
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class StateBackend(ABC):
+    """Key-value and list storage with per-key expiry. Values are strings."""
+
+    # Whether other processes see the same state
+    shared = True
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None: ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None: ...
+
+    @abstractmethod
+    def expire(self, key: str, ttl: float) -> None: ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int: ...
+
+    @abstractmethod
+    def rpush(self, key: str, *values: str) -> int:
+        """Append to a list and return its new length."""
+
+    @abstractmethod
+    def ltrim(self, key: str, start: int, stop: int) -> None:
+        """Keep only items ``start..stop`` (inclusive, negative from the end)."""
+
+    @abstractmethod
+    def lrange(self, key: str, start: int, stop: int) -> list[str]: ...
+
+    @abstractmethod
+    def llen(self, key: str) -> int: ...
+
+
+def _slice(length: int, start: int, stop: int) -> tuple[int, int]:
+    """Redis list indices to a Python slice over a list of ``length``."""
+    if start < 0:
+        start = max(0, length + start)
+    if stop < 0:
+        stop = length + stop
+    return start, min(length, stop + 1)
+
+
+class MemoryBackend(StateBackend):
+    """In-process stand-in, for a single worker and for tests."""
+
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[str, Any] = {}
+        self._expires_at: dict[str, float] = {}
+
+    def _live(self, key: str) -> Any:
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self._values.pop(key, None)
+            self._expires_at.pop(key, None)
+        return self._values.get(key)
+
+    def get(self, key):
+        with self._lock:
+            value = self._live(key)
+            return value if isinstance(value, str) else None
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._values[key] = value
+            if ttl is None:
+                self._expires_at.pop(key, None)
+            else:
+                self._expires_at[key] = time.time() + ttl
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+                self._expires_at.pop(key, None)
+
+    def expire(self, key, ttl):
+        with self._lock:
+            if self._live(key) is not None:
+                self._expires_at[key] = time.time() + ttl
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._live(key) or 0) + 1
+            self._values[key] = str(value)
+            return value
+
+    def rpush(self, key, *values):
+        with self._lock:
+            items = self._live(key)
+            if items is None:
+                items = self._values[key] = []
+            items.extend(values)
+            return len(items)
+
+    def ltrim(self, key, start, stop):
+        with self._lock:
+            items = self._live(key)
+            if items is not None:
+                start, end = _slice(len(items), start, stop)
+                items[:] = items[start:end]
+
+    def lrange(self, key, start, stop):
+        with self._lock:
+            items = self._live(key) or []
+            start, end = _slice(len(items), start, stop)
+            return items[start:end]
+
+    def llen(self, key):
+        with self._lock:
+            return len(self._live(key) or [])
+
+
+class SQLiteBackend(StateBackend):
+    """A SQLite file in WAL mode, shared by the workers of one machine."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS state_keys (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            -- for lists: index of the first item and one past the last
+            head INTEGER,
+            tail INTEGER,
+            expires_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS state_lists (
+            key TEXT,
+            idx INTEGER,
+            value TEXT,
+            PRIMARY KEY (key, idx)
+        );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._conn.executescript(self.SCHEMA)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must stay on the thread that created them.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _row(conn: sqlite3.Connection, key: str) -> Optional[tuple]:
+        row = conn.execute(
+            "SELECT value, head, tail, expires_at FROM state_keys WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is not None and row[3] is not None and row[3] <= time.time():
+            conn.execute("DELETE FROM state_keys WHERE key = ?", (key,))
+            conn.execute("DELETE FROM state_lists WHERE key = ?", (key,))
+            return None
+        return row
+
+    def get(self, key):
+        with self._transaction() as conn:
+            row = self._row(conn, key)
+            return None if row is None else row[0]
+
+    def set(self, key, value, ttl=None):
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO state_keys (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            conn.execute("DELETE FROM state_lists WHERE key = ?", (key,))
+
+    def delete(self, *keys):
+        with self._transaction() as conn:
+            for key in keys:
+                conn.execute("DELETE FROM state_keys WHERE key = ?", (key,))
+                conn.execute("DELETE FROM state_lists WHERE key = ?", (key,))
+
+    def expire(self, key, ttl):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE state_keys SET expires_at = ? WHERE key = ?",
+                (time.time() + ttl, key),
+            )
+
+    def incr(self, key):
+        with self._transaction() as conn:
+            row = self._row(conn, key)
+            value = int(row[0] or 0) + 1 if row else 1
+            conn.execute(
+                "INSERT OR REPLACE INTO state_keys (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, str(value), row[3] if row else None),
+            )
+            return value
+
+    def rpush(self, key, *values):
+        with self._transaction() as conn:
+            row = self._row(conn, key)
+            head, tail = (row[1] or 0, row[2] or 0) if row else (0, 0)
+            conn.executemany(
+                "INSERT INTO state_lists (key, idx, value) VALUES (?, ?, ?)",
+                [(key, tail + i, value) for i, value in enumerate(values)],
+            )
+            tail += len(values)
+            conn.execute(
+                "INSERT OR REPLACE INTO state_keys (key, head, tail, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, head, tail, row[3] if row else None),
+            )
+            return tail - head
+
+    def ltrim(self, key, start, stop):
+        with self._transaction() as conn:
+            row = self._row(conn, key)
+            if row is None:
+                return
+            head, tail = row[1] or 0, row[2] or 0
+            start, end = _slice(tail - head, start, stop)
+            new_head, new_tail = head + start, head + max(start, end)
+            conn.execute(
+                "DELETE FROM state_lists WHERE key = ? AND (idx < ? OR idx >= ?)",
+                (key, new_head, new_tail),
+            )
+            conn.execute(
+                "UPDATE state_keys SET head = ?, tail = ? WHERE key = ?",
+                (new_head, new_tail, key),
+            )
+
+    def lrange(self, key, start, stop):
+        with self._transaction() as conn:
+            row = self._row(conn, key)
+            if row is None:
+                return []
+            head, tail = row[1] or 0, row[2] or 0
+            start, end = _slice(tail - head, start, stop)
+            rows = conn.execute(
+                "SELECT value FROM state_lists WHERE key = ? AND idx >= ? AND idx < ? "
+                "ORDER BY idx",
+                (key, head + start, head + end),
+            ).fetchall()
+            return [value for (value,) in rows]
+
+    def llen(self, key):
+        with self._transaction() as conn:
+            row = self._row(conn, key)
+            return 0 if row is None else (row[2] or 0) - (row[1] or 0)
+
+    def purge_expired(self) -> None:
+        with self._transaction() as conn:
+            now = time.time()
+            conn.execute(
+                "DELETE FROM state_lists WHERE key IN "
+                "(SELECT key FROM state_keys WHERE expires_at <= ?)",
+                (now,),
+            )
+            conn.execute("DELETE FROM state_keys WHERE expires_at <= ?", (now,))
+
+
+class RedisBackend(StateBackend):
+    """A Redis (or Redis-compatible) server; needs the ``redis`` package."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError(
+                "A redis:// STATE_BACKEND_URL needs the redis package: pip install redis"
+            )
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(key, value, px=None if ttl is None else int(ttl * 1000))
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*keys)
+
+    def expire(self, key, ttl):
+        self.client.pexpire(key, int(ttl * 1000))
+
+    def incr(self, key):
+        return self.client.incr(key)
+
+    def rpush(self, key, *values):
+        return self.client.rpush(key, *values)
+
+    def ltrim(self, key, start, stop):
+        self.client.ltrim(key, start, stop)
+
+    def lrange(self, key, start, stop):
+        return self.client.lrange(key, start, stop)
+
+    def llen(self, key):
+        return self.client.llen(key)
+
+
+def create_backend(url: str = STATE_BACKEND_URL) -> StateBackend:
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///") :])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported STATE_BACKEND_URL: {url}")
+
+
+class BackendCache:
+    """``TTLCache`` interface over a shared backend, for picklable values.
+
+    Only use it with a backend that is not writable by untrusted parties:
+    values are unpickled on read.
+    """
+
+    def __init__(self, backend: StateBackend, namespace: str):
+        self.backend = backend
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"cache:{self.namespace}:{key!r}"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.backend.get(self._key(key))
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(base64.b64decode(value))
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        encoded = base64.b64encode(pickle.dumps(value)).decode("ascii")
+        self.backend.set(self._key(key), encoded, ttl)
+
+    def delete(self, key: Hashable) -> None:
+        self.backend.delete(self._key(key))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "shared": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+def shared_cache(namespace: str, max_entries: int = 1024):
+    """A cache shared by all workers if the state backend is, else local."""
+    if state_backend.shared:
+        return BackendCache(state_backend, namespace)
+    return TTLCache(max_entries=max_entries)
+
+
+def _sqlite_checkpointer(path: str):
+    """A SqliteSaver whose async methods run its sync ones on a thread.
+
+    AsyncSqliteSaver binds to the event loop it is created on, but the graph
+    is compiled at import time, before the server's loop exists.
+    """
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    class ThreadedSqliteSaver(SqliteSaver):
+        async def aget_tuple(self, config):
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def alist(self, config, *, filter=None, before=None, limit=None):
+            checkpoints = await asyncio.to_thread(
+                lambda: list(
+                    self.list(config, filter=filter, before=before, limit=limit)
+                )
+            )
+            for checkpoint in checkpoints:
+                yield checkpoint
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            return await asyncio.to_thread(
+                self.put, config, checkpoint, metadata, new_versions
+            )
+
+        async def aput_writes(self, config, writes, task_id, task_path=""):
+            await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    # The saver serializes access with its own lock.
+    return ThreadedSqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+
+def create_checkpointer(url: str = STATE_BACKEND_URL):
+    """The LangGraph checkpointer for WORKFLOW_CHECKPOINTS, or None if off.
+
+    Checkpoints go to a ``-checkpoints`` SQLite file next to the state
+    database (needs langgraph-checkpoint-sqlite), and to memory otherwise.
+    """
+    if not WORKFLOW_CHECKPOINTS:
+        return None
+    if url.startswith("sqlite:///"):
+        root, ext = os.path.splitext(url[len("sqlite:///") :])
+        try:
+            return _sqlite_checkpointer(f"{root}-checkpoints{ext or '.db'}")
+        except ImportError:
+            logger.error(
+                "Workflow checkpoints are kept in process memory: saving them to "
+                "SQLite needs the langgraph-checkpoint-sqlite package"
+            )
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        logger.warning(
+            "Workflow checkpoints are kept in process memory with a Redis state "
+            "backend; use a sqlite:/// backend to persist them"
+        )
+    from langgraph.checkpoint.memory import MemorySaver
+
+    return MemorySaver()
+
+
+def release_checkpoints(checkpointer, thread_id: str) -> None:
+    """Drop the checkpoints of a finished thread if only memory holds them."""
+    from langgraph.checkpoint.memory import MemorySaver
+
+    if isinstance(checkpointer, MemorySaver):
+        checkpointer.delete_thread(thread_id)
+
+
+state_backend = create_backend()
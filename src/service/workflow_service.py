@@ -4,7 +4,11 @@ import asyncio
 
 from src.config import TEAM_MEMBER_CONFIGRATIONS, TEAM_MEMBERS
 from src.graph import build_graph
+from src.service.state_backend import create_checkpointer, release_checkpoints
+from src.replay import install_fake_tools_from_env, recording_callbacks
 from src.tools.browser import browser_tool
+from src.tools.python_repl import python_sandbox
+from src.utils.log_utils import preview
 from langchain_community.adapters.openai import convert_message_to_dict
 import uuid
 
@@ -23,13 +27,21 @@ def enable_debug_logging():
 logger = logging.getLogger(__name__)
 
 # Create the graph
-graph = build_graph()
+graph = build_graph(checkpointer=create_checkpointer())
+
+# Offline runs: tools answer from recorded fixtures
+fake_tools = install_fake_tools_from_env()
 
 # Cache for coordinator messages
 MAX_CACHE_SIZE = 3
 
-# Global variable to track current browser tool instance
-current_browser_tool: Optional[browser_tool] = None
+# astream_events only delivers the events forwarded below: chat model and
+# tool runs, custom tool events, and chain events of the agent nodes and the
+# workflow run itself (its end event carries the final state). The workflow
+# run is renamed so the react agents' inner graphs do not match it.
+WORKFLOW_RUN_NAME = "agent_workflow"
+FORWARDED_RUN_TYPES = ("chat_model", "tool")
+FORWARDED_CUSTOM_EVENTS = ("tool_call_progress",)
 
 
 async def run_agent_workflow(
@@ -38,6 +50,7 @@ async def run_agent_workflow(
     deep_thinking_mode: Optional[bool] = False,
     search_before_planning: Optional[bool] = False,
     team_members: Optional[list] = None,
+    browser_recording: Optional[str] = None,
 ):
     """Run the agent workflow to process and respond to user input messages.
 
@@ -54,6 +67,8 @@ async def run_agent_workflow(
             the execution plan
         team_members: Optional list of specific team members to involve in the workflow.
             If None, uses default TEAM_MEMBERS configuration
+        browser_recording: Optional recording format ("gif", "webp" or "frames") for
+            browser sessions. Recording is disabled if None
 
     Returns:
         Yields various event dictionaries containing workflow state and progress information,
@@ -69,18 +84,22 @@ async def run_agent_workflow(
     if debug:
         enable_debug_logging()
 
-    logger.info(f"Starting workflow with user input: {user_input_messages}")
+    # Messages can carry whole documents; only log a preview of the last one.
+    logger.info(
+        f"Starting workflow with {len(user_input_messages)} input messages, "
+        f"last: {preview(user_input_messages[-1], 200)}"
+    )
 
     workflow_id = str(uuid.uuid4())
 
     team_members = team_members if team_members else TEAM_MEMBERS
 
-    streaming_llm_agents = [*team_members, "planner", "coordinator"]
+    # Sets: membership is tested several times for every streamed token
+    team_member_set = frozenset(team_members)
+    streaming_llm_agents = frozenset([*team_members, "planner", "coordinator"])
 
     # Reset coordinator cache at the start of each workflow
-    global current_browser_tool
     coordinator_cache = []
-    current_browser_tool = browser_tool
     is_handoff_case = False
     is_workflow_triggered = False
 
@@ -95,17 +114,30 @@ async def run_agent_workflow(
                 "deep_thinking_mode": deep_thinking_mode,
                 "search_before_planning": search_before_planning,
             },
+            config={
+                "run_name": WORKFLOW_RUN_NAME,
+                "callbacks": recording_callbacks(),
+                "configurable": {
+                    # Checkpoints, if enabled, are saved per workflow
+                    "thread_id": workflow_id,
+                    "workflow_id": workflow_id,
+                    "browser_recording": browser_recording,
+                },
+            },
             version="v2",
+            include_names=[
+                *streaming_llm_agents,
+                WORKFLOW_RUN_NAME,
+                *FORWARDED_CUSTOM_EVENTS,
+            ],
+            include_types=FORWARDED_RUN_TYPES,
         ):
             kind = event.get("event")
             data = event.get("data")
             name = event.get("name")
             metadata = event.get("metadata")
-            node = (
-                ""
-                if (metadata.get("checkpoint_ns") is None)
-                else metadata.get("checkpoint_ns").split(":")[0]
-            )
+            checkpoint_ns = metadata.get("checkpoint_ns")
+            node = checkpoint_ns.partition(":")[0] if checkpoint_ns else ""
             langgraph_step = (
                 ""
                 if (metadata.get("langgraph_step") is None)
@@ -202,7 +234,7 @@ async def run_agent_workflow(
                                 "delta": {"content": content},
                             },
                         }
-            elif kind == "on_tool_start" and node in team_members:
+            elif kind == "on_tool_start" and node in team_member_set:
                 ydata = {
                     "event": "tool_call",
                     "data": {
@@ -211,7 +243,7 @@ async def run_agent_workflow(
                         "tool_input": data.get("input"),
                     },
                 }
-            elif kind == "on_tool_end" and node in team_members:
+            elif kind == "on_tool_end" and node in team_member_set:
                 ydata = {
                     "event": "tool_call_result",
                     "data": {
@@ -222,14 +254,32 @@ async def run_agent_workflow(
                         ),
                     },
                 }
+            elif (
+                kind == "on_custom_event"
+                and name == "tool_call_progress"
+                and node in team_member_set
+            ):
+                # Live output of a running tool, e.g. bash_tool
+                ydata = {
+                    "event": "tool_call_progress",
+                    "data": {
+                        "tool_call_id": f"{workflow_id}_{node}_{data['tool_name']}_{run_id}",
+                        "tool_name": data["tool_name"],
+                        "stream": data["stream"],
+                        "content": data["content"],
+                    },
+                }
             else:
                 continue
             yield ydata
     except asyncio.CancelledError:
-        logger.info("Workflow cancelled, terminating browser agent if exists")
-        if current_browser_tool:
-            await current_browser_tool.terminate()
+        logger.info("Workflow cancelled, terminating its browser tasks if any")
+        await browser_tool.terminate(workflow_id)
         raise
+    finally:
+        # Free the workflow's Python session on the sandbox workers
+        python_sandbox.close_session(workflow_id)
+        release_checkpoints(graph.checkpointer, workflow_id)
 
     if is_workflow_triggered:
         # TODO: remove messages attributes after Frontend being compatible with final_session_state event.
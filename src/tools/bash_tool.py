@@ -1,16 +1,201 @@
+import asyncio
+import codecs
 import logging
-import subprocess
-from typing import Annotated
-from langchain_core.tools import tool
+import os
+import queue
+import signal
+import time
+from typing import Annotated, Callable, Optional
+from langchain_core.callbacks.manager import (
+    adispatch_custom_event,
+    dispatch_custom_event,
+)
+from langchain_core.tools import StructuredTool
 from .decorators import log_io
+from src.config import (
+    BASH_MAX_CONCURRENCY,
+    BASH_OUTPUT_HEAD,
+    BASH_OUTPUT_TAIL,
+    BASH_PROGRESS_INTERVAL,
+    BASH_PROGRESS_MAX_CHARS,
+)
+from src.utils.async_runtime import AsyncRuntime
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Name of the custom event carrying live command output
+PROGRESS_EVENT = "tool_call_progress"
+
+# Commands from every workflow run on this loop, which enforces the global
+# concurrency limit; output is relayed back to the calling workflow.
+bash_runtime = AsyncRuntime("bash-runtime")
+_slots: Optional[asyncio.Semaphore] = None
+
+
+class OutputBuffer:
+    """Keeps the head and tail of a stream, dropping the middle if too long."""
+
+    def __init__(self, head: int = BASH_OUTPUT_HEAD, tail: int = BASH_OUTPUT_TAIL):
+        self.head_limit = head
+        self.tail_limit = tail
+        self.head = ""
+        self.tail = ""
+        self.total = 0
+
+    def write(self, text: str) -> None:
+        self.total += len(text)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += text[:room]
+            text = text[room:]
+        if text and self.tail_limit > 0:
+            self.tail = (self.tail + text)[-self.tail_limit :]
+
+    def getvalue(self) -> str:
+        omitted = self.total - len(self.head) - len(self.tail)
+        if omitted <= 0:
+            return self.head + self.tail
+        return f"{self.head}\n... [{omitted} characters truncated] ...\n{self.tail}"
+
+
+class ProgressThrottle:
+    """Coalesces live output into one progress event per stream and interval.
+
+    Stops relaying after ``max_chars`` with a truncation marker; the tool
+    result still keeps the head and tail of the output.
+    """
+
+    def __init__(
+        self,
+        on_output: Callable[[str, str], None],
+        interval: float = BASH_PROGRESS_INTERVAL,
+        max_chars: int = BASH_PROGRESS_MAX_CHARS,
+    ):
+        self.on_output = on_output
+        self.interval = interval
+        self.max_chars = max_chars
+        self.sent = 0
+        self.truncated = False
+        self._pending: dict[str, list[str]] = {}
+        self._flushed_at = time.monotonic()
+
+    def write(self, stream: str, text: str) -> None:
+        if self.truncated:
+            return
+        self._pending.setdefault(stream, []).append(text)
+        if time.monotonic() - self._flushed_at >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._flushed_at = time.monotonic()
+        pending, self._pending = self._pending, {}
+        for stream, parts in pending.items():
+            if self.truncated:
+                return
+            text = "".join(parts)
+            room = self.max_chars - self.sent
+            if len(text) > room:
+                text = text[:room] + "\n... [output truncated] ...\n"
+                self.truncated = True
+            self.sent += len(text)
+            self.on_output(stream, text)
+
+    async def run(self) -> None:
+        """Flush output that arrives while the command then stays quiet."""
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._pending:
+                self.flush()
+
+
+def _kill(process: asyncio.subprocess.Process) -> None:
+    try:
+        if hasattr(os, "killpg"):
+            # Shell commands spawn children; stop the whole process group.
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def _pump(
+    stream: asyncio.StreamReader,
+    buffer: OutputBuffer,
+    name: str,
+    progress: ProgressThrottle,
+) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while chunk := await stream.read(4096):
+        text = decoder.decode(chunk)
+        if text:
+            buffer.write(text)
+            progress.write(name, text)
+    text = decoder.decode(b"", final=True)
+    if text:
+        buffer.write(text)
+        progress.write(name, text)
+
+
+async def _execute(
+    cmd: str, timeout: int, on_output: Callable[[str, str], None]
+) -> str:
+    """Run a command on ``bash_runtime`` and return the tool result."""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(BASH_MAX_CONCURRENCY)
+    async with _slots:
+        process = await asyncio.create_subprocess_shell(
+            cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        stdout, stderr = OutputBuffer(), OutputBuffer()
+        progress = ProgressThrottle(on_output)
+        flusher = asyncio.create_task(progress.run())
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    _pump(process.stdout, stdout, "stdout", progress),
+                    _pump(process.stderr, stderr, "stderr", progress),
+                    process.wait(),
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            _kill(process)
+            await process.wait()
+            error_message = f"Command '{cmd}' timed out after {timeout}s."
+            logger.error(error_message)
+            return error_message
+        except asyncio.CancelledError:
+            _kill(process)
+            raise
+        finally:
+            flusher.cancel()
+            progress.flush()
+
+    if process.returncode != 0:
+        # If command fails, return error information
+        error_message = (
+            f"Command failed with exit code {process.returncode}.\n"
+            f"Stdout: {stdout.getvalue()}\n"
+            f"Stderr: {stderr.getvalue()}"
+        )
+        logger.error(error_message)
+        return error_message
+    # Return stdout as the result
+    return stdout.getvalue()
+
+
+def _progress(stream: str, text: str) -> dict:
+    return {"tool_name": "bash_tool", "stream": stream, "content": text}
+
 
-@tool
 @log_io
-def bash_tool(
+def _bash_tool(
     cmd: Annotated[str, "The bash command to be executed."],
     timeout: Annotated[
         int, "Maximum time in seconds for the command to complete."
@@ -18,26 +203,72 @@ def bash_tool(
 ):
     """Use this to execute bash command and do necessary operations."""
     logger.info(f"Executing Bash Command: {cmd} with timeout {timeout}s")
+    output: queue.SimpleQueue = queue.SimpleQueue()
     try:
-        # Execute the command and capture output
-        result = subprocess.run(
-            cmd, shell=True, check=True, text=True, capture_output=True, timeout=timeout
+        future = bash_runtime.submit(
+            _execute(cmd, timeout, lambda stream, text: output.put((stream, text)))
         )
-        # Return stdout as the result
-        return result.stdout
-    except subprocess.CalledProcessError as e:
-        # If command fails, return error information
-        error_message = f"Command failed with exit code {
-            e.returncode}.\nStdout: {
-            e.stdout}\nStderr: {
-            e.stderr}"
-        logger.error(error_message)
-        return error_message
-    except subprocess.TimeoutExpired:
-        # Handle timeout exception
-        error_message = f"Command '{cmd}' timed out after {timeout}s."
+        while not (future.done() and output.empty()):
+            try:
+                stream, text = output.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                dispatch_custom_event(PROGRESS_EVENT, _progress(stream, text))
+            except RuntimeError:
+                # Not running inside a graph or chain: nobody to stream to.
+                pass
+        return future.result()
+    except Exception as e:
+        # Catch any other exceptions
+        error_message = f"Error executing command: {str(e)}"
         logger.error(error_message)
         return error_message
+
+
+@log_io
+async def _abash_tool(
+    cmd: Annotated[str, "The bash command to be executed."],
+    timeout: Annotated[
+        int, "Maximum time in seconds for the command to complete."
+    ] = 120,
+):
+    """Use this to execute bash command and do necessary operations."""
+    logger.info(f"Executing Bash Command: {cmd} with timeout {timeout}s")
+    loop = asyncio.get_running_loop()
+    output: asyncio.Queue = asyncio.Queue()
+
+    def on_output(stream: str, text: str) -> None:
+        loop.call_soon_threadsafe(output.put_nowait, (stream, text))
+
+    try:
+        result = asyncio.ensure_future(
+            bash_runtime.arun(_execute(cmd, timeout, on_output))
+        )
+        getter: Optional[asyncio.Future] = None
+        try:
+            while not (result.done() and output.empty()):
+                getter = asyncio.ensure_future(output.get())
+                await asyncio.wait(
+                    {getter, result}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not getter.done():
+                    getter.cancel()
+                    continue
+                stream, text = getter.result()
+                try:
+                    await adispatch_custom_event(
+                        PROGRESS_EVENT, _progress(stream, text)
+                    )
+                except RuntimeError:
+                    pass
+        except asyncio.CancelledError:
+            # Stops the command on the runtime loop as well.
+            result.cancel()
+            if getter is not None:
+                getter.cancel()
+            raise
+        return result.result()
     except Exception as e:
         # Catch any other exceptions
         error_message = f"Error executing command: {str(e)}"
@@ -45,5 +276,12 @@ def bash_tool(
         return error_message
 
 
+bash_tool = StructuredTool.from_function(
+    func=_bash_tool,
+    coroutine=_abash_tool,
+    name="bash_tool",
+)
+
+
 if __name__ == "__main__":
     print(bash_tool.invoke("ls -all"))
@@ -1,20 +1,23 @@
 import asyncio
 import logging
 import json
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Optional, ClassVar, Type
 from langchain.tools import BaseTool
-from browser_use import AgentHistoryList, Browser, BrowserConfig
+from langchain_core.runnables import ensure_config
+from browser_use import AgentHistoryList, BrowserConfig
 from browser_use import Agent as BrowserAgent
 from src.llms.llm import vl_llm
+from src.tools.browser_pool import BrowserPool
+from src.tools.browser_recorder import browser_recorder
 from src.tools.decorators import create_logged_tool
+from src.utils.async_runtime import AsyncRuntime, shutdown_on_exit
 from src.config import (
     CHROME_INSTANCE_PATH,
     CHROME_HEADLESS,
     CHROME_PROXY_SERVER,
     CHROME_PROXY_USERNAME,
     CHROME_PROXY_PASSWORD,
-    BROWSER_HISTORY_DIR,
 )
 import uuid
 
@@ -35,7 +38,18 @@ if CHROME_PROXY_SERVER:
         proxy_config["password"] = CHROME_PROXY_PASSWORD
     browser_config.proxy = proxy_config
 
-expected_browser = Browser(config=browser_config)
+# Playwright objects are bound to the loop that created them, so every
+# browser task runs on one persistent runtime loop, sync or async caller alike.
+browser_runtime = AsyncRuntime("browser-runtime")
+
+# Warm browsers shared by all browser tasks, one isolated context per task
+browser_pool = BrowserPool(browser_config)
+shutdown_on_exit(browser_runtime, browser_pool.close)
+
+
+def warm_browser_pool():
+    """Launch the warm browsers in the background without blocking."""
+    browser_runtime.submit(browser_pool.warm())
 
 
 class BrowserUseInput(BaseModel):
@@ -51,83 +65,90 @@ class BrowserTool(BaseTool):
         "Use this tool to interact with web browsers. Input should be a natural language description of what you want to do with the browser, such as 'Go to google.com and search for browser-use', or 'Navigate to Reddit and find the top post about AI'."
     )
 
-    _agent: Optional[BrowserAgent] = None
+    # Running browser tasks keyed by workflow id, only touched on browser_runtime
+    _tasks: dict[str, set[asyncio.Task]] = PrivateAttr(default_factory=dict)
 
     def _generate_browser_result(
-        self, result_content: str, generated_gif_path: str
+        self, result_content: str, generated_gif_path: Optional[str]
     ) -> dict:
         return {
             "result_content": result_content,
             "generated_gif_path": generated_gif_path,
         }
 
-    def _run(self, instruction: str) -> str:
-        generated_gif_path = f"{BROWSER_HISTORY_DIR}/{uuid.uuid4()}.gif"
-        """Run the browser task synchronously."""
-        self._agent = BrowserAgent(
-            task=instruction,  # Will be set per request
-            llm=vl_llm,
-            browser=expected_browser,
-            generate_gif=generated_gif_path,
+    def _finish(self, instruction: str, result, recording: Optional[str]) -> str:
+        """Build the tool output, queueing the recording in the background."""
+        if not isinstance(result, AgentHistoryList):
+            return json.dumps(self._generate_browser_result(result, None))
+        recording_path = None
+        if recording:
+            recording_path = browser_recorder.submit(
+                str(uuid.uuid4()), instruction, result, recording
+            )
+        return json.dumps(
+            self._generate_browser_result(result.final_result(), recording_path)
         )
 
+    @staticmethod
+    def _workflow_options() -> tuple[str, Optional[str]]:
+        """Workflow id and requested recording format of the current workflow."""
+        configurable = ensure_config().get("configurable", {})
+        return (
+            configurable.get("workflow_id", "default"),
+            configurable.get("browser_recording"),
+        )
+
+    async def _execute(
+        self, instruction: str, workflow_id: str, recording: Optional[str]
+    ) -> str:
+        """Run a browser task on a pooled browser. Runs on ``browser_runtime``."""
+        task = asyncio.current_task()
+        self._tasks.setdefault(workflow_id, set()).add(task)
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(self._agent.run())
-
-                if isinstance(result, AgentHistoryList):
-                    return json.dumps(
-                        self._generate_browser_result(
-                            result.final_result(), generated_gif_path
-                        )
-                    )
-                else:
-                    return json.dumps(
-                        self._generate_browser_result(result, generated_gif_path)
-                    )
-            finally:
-                loop.close()
+            async with browser_pool.lease() as browser_session:
+                agent = BrowserAgent(
+                    task=instruction,
+                    llm=vl_llm,
+                    browser_session=browser_session,
+                )
+                result = await agent.run()
+            return self._finish(instruction, result, recording)
         except Exception as e:
             return f"Error executing browser task: {str(e)}"
+        finally:
+            tasks = self._tasks.get(workflow_id)
+            if tasks is not None:
+                tasks.discard(task)
+                if not tasks:
+                    del self._tasks[workflow_id]
 
-    async def terminate(self):
-        """Terminate the browser agent if it exists."""
-        if self._agent and self._agent.browser:
-            try:
-                await self._agent.browser.close()
-            except Exception as e:
-                logger.error(f"Error terminating browser agent: {str(e)}")
-        self._agent = None
+    def _run(self, instruction: str) -> str:
+        """Run the browser task synchronously."""
+        # Read the request config here, it does not follow us onto the runtime.
+        workflow_id, recording = self._workflow_options()
+        return browser_runtime.run(self._execute(instruction, workflow_id, recording))
+
+    async def _cancel(self, workflow_id: str) -> None:
+        for task in self._tasks.pop(workflow_id, set()):
+            task.cancel()
+
+    async def terminate(self, workflow_id: str):
+        """Cancel the browser tasks of one workflow, leaving others running."""
+        if not browser_runtime.started:
+            return
+        try:
+            # The pooled browser stays warm; each lease closes its own context.
+            await browser_runtime.arun(self._cancel(workflow_id))
+        except Exception as e:
+            logger.error(f"Error terminating browser agent: {str(e)}")
 
     async def _arun(self, instruction: str) -> str:
         """Run the browser task asynchronously."""
-        generated_gif_path = f"{BROWSER_HISTORY_DIR}/{uuid.uuid4()}.gif"
-        self._agent = BrowserAgent(
-            task=instruction,
-            llm=vl_llm,
-            browser=expected_browser,
-            generate_gif=generated_gif_path,  # Will be set per request
+        workflow_id, recording = self._workflow_options()
+        return await browser_runtime.arun(
+            self._execute(instruction, workflow_id, recording)
         )
-        try:
-            result = await self._agent.run()
-            if isinstance(result, AgentHistoryList):
-                return json.dumps(
-                    self._generate_browser_result(
-                        result.final_result(), generated_gif_path
-                    )
-                )
-            else:
-                return json.dumps(
-                    self._generate_browser_result(result, generated_gif_path)
-                )
-        except Exception as e:
-            return f"Error executing browser task: {str(e)}"
-        finally:
-            await self.terminate()
 
 
 BrowserTool = create_logged_tool(BrowserTool)
 browser_tool = BrowserTool()
-
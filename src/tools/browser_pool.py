@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from browser_use import BrowserProfile, BrowserSession
+
+from src.tools.browser_snapshot import DedupBrowserSession
+from src.config import (
+    BROWSER_POOL_SIZE,
+    BROWSER_POOL_MAX_USES,
+    BROWSER_POOL_IDLE_TIMEOUT,
+    BROWSER_POOL_MIN_WARM,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserSlot:
+    """A warm browser process kept alive between browser tasks."""
+
+    def __init__(self, session: BrowserSession):
+        self.session = session
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def healthy(self) -> bool:
+        browser = self.session.browser
+        return browser is not None and browser.is_connected()
+
+    async def kill(self) -> None:
+        try:
+            await self.session.kill()
+        except Exception as e:
+            logger.warning(f"Error killing pooled browser: {e}")
+
+
+class BrowserPool:
+    """A pool of warm Playwright browsers handing out isolated contexts.
+
+    Each lease gets a fresh incognito context inside a warm browser, so
+    concurrent workflows never share cookies, tabs or storage. Browsers are
+    recycled after ``max_uses`` leases and reaped after ``idle_timeout``
+    seconds without use (keeping ``min_warm`` of them around).
+
+    A pool is bound to the event loop it is first used on, like the
+    Playwright objects it owns; the browser tool keeps it on
+    ``browser_runtime``.
+    """
+
+    def __init__(
+        self,
+        profile: BrowserProfile,
+        size: int = BROWSER_POOL_SIZE,
+        max_uses: int = BROWSER_POOL_MAX_USES,
+        idle_timeout: float = BROWSER_POOL_IDLE_TIMEOUT,
+        min_warm: int = BROWSER_POOL_MIN_WARM,
+    ):
+        # Pooled browsers are shared between workflows: no persistent profile
+        # directory, and never closed by the agents that borrow them.
+        self.profile = profile.model_copy(
+            update={"user_data_dir": None, "keep_alive": True}
+        )
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.min_warm = min(min_warm, self.size)
+        self._idle: list[BrowserSlot] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._reaper: Optional[asyncio.Task] = None
+        self._in_use = 0
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def _launch(self) -> BrowserSlot:
+        session = BrowserSession(browser_profile=self.profile)
+        await session.start()
+        logger.info(f"Launched pooled browser {session}")
+        return BrowserSlot(session)
+
+    async def warm(self, count: Optional[int] = None) -> None:
+        """Pre-launch browsers so the first leases start instantly."""
+        self._ensure_started()
+        count = self.min_warm if count is None else min(count, self.size)
+        missing = count - len(self._idle)
+        if missing <= 0:
+            return
+        slots = await asyncio.gather(
+            *(self._launch() for _ in range(missing)), return_exceptions=True
+        )
+        for slot in slots:
+            if isinstance(slot, BaseException):
+                logger.warning(f"Failed to warm pooled browser: {slot!r}")
+            else:
+                self._idle.append(slot)
+
+    async def _acquire(self) -> BrowserSlot:
+        self._ensure_started()
+        await self._slots.acquire()
+        self._in_use += 1
+        try:
+            while self._idle:
+                slot = self._idle.pop()
+                if slot.healthy:
+                    return slot
+                await slot.kill()
+            return await self._launch()
+        except BaseException:
+            self._in_use -= 1
+            self._slots.release()
+            raise
+
+    async def _release(self, slot: BrowserSlot) -> None:
+        slot.uses += 1
+        slot.last_used = time.monotonic()
+        try:
+            if self._closed or not slot.healthy or slot.uses >= self.max_uses:
+                await slot.kill()
+            else:
+                self._idle.append(slot)
+        finally:
+            self._in_use -= 1
+            self._slots.release()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserSession]:
+        """Borrow a warm browser and yield a session on a fresh context."""
+        slot = await self._acquire()
+        context = None
+        try:
+            context = await slot.session.browser.new_context(
+                **self.profile.kwargs_for_new_context().model_dump(mode="json")
+            )
+            session = DedupBrowserSession(
+                browser_profile=self.profile,
+                playwright=slot.session.playwright,
+                browser=slot.session.browser,
+                browser_context=context,
+            )
+            await session.start()
+            yield session
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled browser context: {e}")
+            await self._release(slot)
+
+    async def _reap_idle(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(max(1.0, self.idle_timeout / 4))
+            now = time.monotonic()
+            # Oldest first; keep min_warm browsers ready.
+            self._idle.sort(key=lambda slot: slot.last_used)
+            while (
+                len(self._idle) > self.min_warm
+                and now - self._idle[0].last_used > self.idle_timeout
+            ):
+                slot = self._idle.pop(0)
+                logger.info(f"Reaping idle pooled browser {slot.session}")
+                await slot.kill()
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self._in_use,
+        }
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(slot.kill() for slot in idle), return_exceptions=True)
@@ -0,0 +1,137 @@
+import base64
+import io
+import logging
+import os
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from browser_use import AgentHistoryList
+from browser_use.agent.gif import create_history_gif
+
+from src.config import (
+    BROWSER_HISTORY_DIR,
+    BROWSER_HISTORY_MAX_AGE,
+    BROWSER_HISTORY_MAX_FILES,
+    BROWSER_RECORDING_FORMATS,
+)
+
+logger = logging.getLogger(__name__)
+
+# File extension and media type of each recording format
+RECORDING_FILE_TYPES = {
+    "gif": (".gif", "image/gif"),
+    "webp": (".webp", "image/webp"),
+    "frames": (".zip", "application/zip"),
+}
+
+
+class BrowserRecorder:
+    """Encodes browser session recordings on a background worker.
+
+    ``submit`` returns the final file path immediately; the file appears
+    atomically once encoding finishes, so browser tasks never wait on it.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = BROWSER_HISTORY_DIR,
+        max_age: float = BROWSER_HISTORY_MAX_AGE,
+        max_files: int = BROWSER_HISTORY_MAX_FILES,
+    ):
+        self.output_dir = output_dir
+        self.max_age = max_age
+        self.max_files = max_files
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="browser-recorder"
+        )
+
+    def submit(
+        self, recording_id: str, task: str, history: AgentHistoryList, fmt: str
+    ) -> Optional[str]:
+        """Queue a recording of ``history`` and return the path it will have."""
+        if fmt not in BROWSER_RECORDING_FORMATS:
+            raise ValueError(f"Unsupported browser recording format: {fmt}")
+        if not any(history.screenshots()):
+            return None
+        extension, _ = RECORDING_FILE_TYPES[fmt]
+        output_path = os.path.join(self.output_dir, f"{recording_id}{extension}")
+        future: Future = self._executor.submit(
+            self._record, task, history, fmt, output_path
+        )
+        future.add_done_callback(self._log_failure)
+        return output_path
+
+    @staticmethod
+    def _log_failure(future: Future) -> None:
+        if future.exception() is not None:
+            logger.error(f"Browser recording failed: {future.exception()!r}")
+
+    def _record(
+        self, task: str, history: AgentHistoryList, fmt: str, output_path: str
+    ) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Hidden until complete; keeps the extension so PIL picks the format.
+        directory, filename = os.path.split(output_path)
+        tmp_path = os.path.join(directory, f".{filename}")
+        if fmt == "gif":
+            create_history_gif(task=task, history=history, output_path=tmp_path)
+        elif fmt == "webp":
+            self._write_webp(history, tmp_path)
+        else:
+            self._write_frames(history, tmp_path)
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, output_path)
+        self.apply_retention()
+
+    @staticmethod
+    def _write_webp(history: AgentHistoryList, output_path: str) -> None:
+        from PIL import Image
+
+        frames = [
+            Image.open(io.BytesIO(base64.b64decode(screenshot))).convert("RGB")
+            for screenshot in history.screenshots()
+            if screenshot
+        ]
+        frames[0].save(
+            output_path,
+            format="WEBP",
+            save_all=True,
+            append_images=frames[1:],
+            duration=2000,
+            loop=0,
+            quality=60,
+        )
+
+    @staticmethod
+    def _write_frames(history: AgentHistoryList, output_path: str) -> None:
+        # Screenshots are already PNG encoded, store them without recompressing.
+        with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_STORED) as zf:
+            for i, screenshot in enumerate(history.screenshots()):
+                if screenshot:
+                    zf.writestr(f"frame_{i:03d}.png", base64.b64decode(screenshot))
+
+    def apply_retention(self) -> None:
+        """Delete recordings older than ``max_age`` or beyond ``max_files``."""
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.output_dir)
+                if entry.is_file() and not entry.name.startswith(".")
+            ]
+        except FileNotFoundError:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        now = time.time()
+        for i, entry in enumerate(entries):
+            if i >= self.max_files or now - entry.stat().st_mtime > self.max_age:
+                try:
+                    os.remove(entry.path)
+                except OSError as e:
+                    logger.warning(
+                        f"Failed to remove browser recording {entry.path}: {e}"
+                    )
+
+
+browser_recorder = BrowserRecorder()
@@ -0,0 +1,175 @@
+import asyncio
+import base64
+import hashlib
+import io
+import logging
+import threading
+from typing import Optional
+
+from browser_use import BrowserSession
+from browser_use.browser.views import BrowserStateSummary
+from pydantic import PrivateAttr
+
+from src.config import (
+    BROWSER_SCREENSHOT_MAX_SIZE,
+    BROWSER_SCREENSHOT_HASH_DISTANCE,
+    BROWSER_SCREENSHOT_MAX_SKIPS,
+)
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Hashes and downscaled copies are reused for byte-identical screenshots
+# within this window
+FRAME_CACHE_TTL = 3600
+
+
+def dhash(image, hash_size: int = 8) -> int:
+    """Difference hash of a PIL image: near-identical frames get close hashes."""
+    from PIL import Image
+
+    pixels = list(
+        image.convert("L")
+        .resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+        .getdata()
+    )
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def dom_fingerprint(state: BrowserStateSummary, element_hashes: set[str]) -> str:
+    """Identify a page state by its url, scroll position and clickable elements."""
+    digest = hashlib.sha1()
+    digest.update(f"{state.url}\n{state.title}\n{state.pixels_above}\n".encode())
+    for element_hash in sorted(element_hashes):
+        digest.update(element_hash.encode())
+    return digest.hexdigest()
+
+
+class ScreenshotDeduper:
+    """Shrinks the screenshots the browser agent sends to the vision model.
+
+    A frame whose DOM fingerprint matches the previous step and whose
+    perceptual hash is within ``hash_distance`` bits is dropped (at most
+    ``max_skips`` times in a row); any other frame is downscaled to
+    ``max_size``. Hashing and downscaling are cached by the screenshot's
+    bytes, so a frame is only ever replaced by a copy of itself.
+    """
+
+    def __init__(
+        self,
+        max_size: tuple[int, int] = BROWSER_SCREENSHOT_MAX_SIZE,
+        hash_distance: int = BROWSER_SCREENSHOT_HASH_DISTANCE,
+        max_skips: int = BROWSER_SCREENSHOT_MAX_SKIPS,
+    ):
+        self.max_size = max_size
+        self.hash_distance = hash_distance
+        self.max_skips = max_skips
+        self.cache = TTLCache(max_entries=256)
+        self._lock = threading.Lock()
+        self._counters = {
+            "frames": 0,
+            "skipped": 0,
+            "downscaled": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+        }
+
+    def _count(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self._counters[name] += value
+
+    def process(
+        self,
+        screenshot: str,
+        fingerprint: str,
+        previous: Optional[tuple[str, int]],
+        skipped: int,
+    ) -> tuple[Optional[str], tuple[str, int]]:
+        """Return the screenshot to send (None to skip) and the frame key.
+
+        CPU bound; run it off the event loop.
+        """
+        digest = hashlib.sha1(screenshot.encode()).hexdigest()
+        cached = self.cache.get(digest)
+        if cached is None:
+            cached = self._analyze(screenshot)
+            self.cache.set(digest, cached, FRAME_CACHE_TTL)
+        frame_hash, downscaled = cached
+        frame = (fingerprint, frame_hash)
+        self._count(frames=1, bytes_in=len(screenshot))
+
+        if (
+            previous is not None
+            and previous[0] == fingerprint
+            and bin(previous[1] ^ frame[1]).count("1") <= self.hash_distance
+            and skipped < self.max_skips
+        ):
+            # Keep comparing against the frame the model actually saw.
+            self._count(skipped=1)
+            return None, previous
+
+        result = downscaled or screenshot
+        self._count(bytes_out=len(result))
+        return result, frame
+
+    def _analyze(self, screenshot: str) -> tuple[int, Optional[str]]:
+        """The frame's perceptual hash and, if it is too large, a downscaled copy."""
+        from PIL import Image
+
+        image = Image.open(io.BytesIO(base64.b64decode(screenshot)))
+        frame_hash = dhash(image)
+        if image.width <= self.max_size[0] and image.height <= self.max_size[1]:
+            return frame_hash, None
+        image.thumbnail(self.max_size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        self._count(downscaled=1)
+        return frame_hash, base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["cache"] = self.cache.stats()
+        return counters
+
+
+screenshot_deduper = ScreenshotDeduper()
+
+
+class DedupBrowserSession(BrowserSession):
+    """A browser session that dedups and downscales agent step screenshots."""
+
+    _last_frame: Optional[tuple[str, int]] = PrivateAttr(default=None)
+    _skipped_frames: int = PrivateAttr(default=0)
+
+    async def get_state_summary(
+        self, cache_clickable_elements_hashes: bool
+    ) -> BrowserStateSummary:
+        state = await super().get_state_summary(cache_clickable_elements_hashes)
+        # Only agent steps (which cache the element hashes) go to the model.
+        if not cache_clickable_elements_hashes or not state.screenshot:
+            return state
+        try:
+            fingerprint = dom_fingerprint(
+                state, self._cached_clickable_element_hashes.hashes
+            )
+            screenshot, self._last_frame = await asyncio.to_thread(
+                screenshot_deduper.process,
+                state.screenshot,
+                fingerprint,
+                self._last_frame,
+                self._skipped_frames,
+            )
+        except Exception as e:
+            logger.warning(f"Screenshot dedup failed, sending the full frame: {e}")
+            return state
+        self._skipped_frames = self._skipped_frames + 1 if screenshot is None else 0
+        state.screenshot = screenshot
+        return state
@@ -6,6 +6,7 @@ from langchain_core.tools import tool
 from .decorators import log_io
 
 from src.crawler import Crawler
+from src.service.graph_indexer import graph_indexer
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,10 @@ def crawl_tool(
     try:
         crawler = Crawler()
         article = crawler.crawl(url)
+        try:
+            graph_indexer.ingest("crawl", article.title or url, article.to_markdown())
+        except OSError as e:
+            logger.warning(f"Failed to ingest crawled article {url}: {e}")
         return {"role": "user", "content": article.to_message()}
     except BaseException as e:
         error_msg = f"Failed to crawl. Error: {repr(e)}"
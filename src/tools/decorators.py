@@ -1,7 +1,17 @@
 import logging
 import functools
+import inspect
+import time
 from typing import Any, Callable, Type, TypeVar
 
+from src.utils.log_utils import (
+    log_payload,
+    payload_enabled,
+    preview,
+    preview_call,
+    sampled,
+)
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
@@ -11,6 +21,10 @@ def log_io(func: Callable) -> Callable:
     """
     A decorator that logs the input parameters and output of a tool function.
 
+    Parameters and results are only formatted when DEBUG is enabled and the
+    call is sampled, and then only a bounded preview of each. The full call
+    goes to the payload log when one is configured.
+
     Args:
         func: The tool function to be decorated
 
@@ -18,20 +32,55 @@ def log_io(func: Callable) -> Callable:
         The wrapped function with input/output logging
     """
 
+    func_name = func.__name__
+
+    def log_input(args: tuple, kwargs: dict) -> bool:
+        # Decide once per call, so a sampled call logs both input and output.
+        verbose = logger.isEnabledFor(logging.DEBUG) and sampled()
+        if verbose:
+            logger.debug(
+                f"Tool {func_name} called with parameters: {preview_call(args, kwargs)}"
+            )
+        return verbose
+
+    def log_output(
+        verbose: bool, args: tuple, kwargs: dict, result: Any, started_at: float
+    ) -> None:
+        if verbose:
+            logger.debug(f"Tool {func_name} returned: {preview(result)}")
+        if payload_enabled():
+            log_payload(
+                "tool_call",
+                tool=func_name,
+                args=args,
+                kwargs=kwargs,
+                result=result,
+                seconds=round(time.perf_counter() - started_at, 3),
+            )
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            started_at = time.perf_counter()
+            verbose = log_input(args, kwargs)
+            result = await func(*args, **kwargs)
+            log_output(verbose, args, kwargs, result, started_at)
+            return result
+
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started_at = time.perf_counter()
         # Log input parameters
-        func_name = func.__name__
-        params = ", ".join(
-            [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
-        )
-        logger.debug(f"Tool {func_name} called with parameters: {params}")
+        verbose = log_input(args, kwargs)
 
         # Execute the function
         result = func(*args, **kwargs)
 
         # Log the output
-        logger.debug(f"Tool {func_name} returned: {result}")
+        log_output(verbose, args, kwargs, result, started_at)
 
         return result
 
@@ -41,21 +90,38 @@ def log_io(func: Callable) -> Callable:
 class LoggedToolMixin:
     """A mixin class that adds logging functionality to any tool."""
 
-    def _log_operation(self, method_name: str, *args: Any, **kwargs: Any) -> None:
-        """Helper method to log tool operations."""
-        tool_name = self.__class__.__name__.replace("Logged", "")
-        params = ", ".join(
-            [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
-        )
-        logger.debug(f"Tool {tool_name}.{method_name} called with parameters: {params}")
+    def _log_operation(self, method_name: str, *args: Any, **kwargs: Any) -> bool:
+        """Helper method to log tool operations.
+
+        Returns:
+            Whether the output of this call should be logged too.
+        """
+        verbose = logger.isEnabledFor(logging.DEBUG) and sampled()
+        if verbose:
+            tool_name = self.__class__.__name__.replace("Logged", "")
+            logger.debug(
+                f"Tool {tool_name}.{method_name} called with parameters: "
+                f"{preview_call(args, kwargs)}"
+            )
+        return verbose
 
     def _run(self, *args: Any, **kwargs: Any) -> Any:
         """Override _run method to add logging."""
-        self._log_operation("_run", *args, **kwargs)
+        started_at = time.perf_counter()
+        verbose = self._log_operation("_run", *args, **kwargs)
         result = super()._run(*args, **kwargs)
-        logger.debug(
-            f"Tool {self.__class__.__name__.replace('Logged', '')} returned: {result}"
-        )
+        tool_name = self.__class__.__name__.replace("Logged", "")
+        if verbose:
+            logger.debug(f"Tool {tool_name} returned: {preview(result)}")
+        if payload_enabled():
+            log_payload(
+                "tool_call",
+                tool=tool_name,
+                args=args,
+                kwargs=kwargs,
+                result=result,
+                seconds=round(time.perf_counter() - started_at, 3),
+            )
         return result
 
 
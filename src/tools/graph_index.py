@@ -0,0 +1,98 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.config import GRAPHRAG_MEMORY_MAP
+
+logger = logging.getLogger(__name__)
+
+
+class GraphIndex:
+    """The parquet tables of a graphrag index, loaded once and kept resident.
+
+    Tables are loaded on first use and reloaded only when the file on disk
+    changes (mtime, size or inode), so a re-indexed output directory is picked
+    up without a restart. Instances are safe to share across threads.
+    """
+
+    def __init__(self, output_dir: str, memory_map: bool = GRAPHRAG_MEMORY_MAP):
+        self.output_dir = output_dir
+        self.memory_map = memory_map
+        self._tables: dict[str, tuple[tuple, pd.DataFrame]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.loads = 0
+        self.load_seconds = 0.0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.output_dir, f"{name}.parquet")
+
+    @staticmethod
+    def _signature(path: str) -> tuple:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _lock(self, name: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _read(self, path: str) -> pd.DataFrame:
+        return pq.read_table(path, memory_map=self.memory_map).to_pandas()
+
+    def table(self, name: str) -> pd.DataFrame:
+        """Return a table of the index, e.g. ``entities``.
+
+        The result is a shallow copy: graphrag's query adapters assign columns
+        on the frames they get, which must not leak into the shared table.
+        """
+        path = self._path(name)
+        signature = self._signature(path)
+        entry = self._tables.get(name)
+        if entry is None or entry[0] != signature:
+            with self._lock(name):
+                entry = self._tables.get(name)
+                signature = self._signature(path)
+                if entry is None or entry[0] != signature:
+                    started_at = time.perf_counter()
+                    entry = (signature, self._read(path))
+                    elapsed = time.perf_counter() - started_at
+                    self._tables[name] = entry
+                    self.loads += 1
+                    self.load_seconds += elapsed
+                    logger.info(f"Loaded graph index table {name} in {elapsed:.3f}s")
+        return entry[1].copy(deep=False)
+
+    def has(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+
+    def tables(self, *names: str) -> dict[str, pd.DataFrame]:
+        return {name: self.table(name) for name in names}
+
+    @property
+    def version(self) -> Optional[str]:
+        """Identifies the index content currently on disk (None if not built)."""
+        try:
+            signatures = [
+                (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in os.scandir(self.output_dir)
+                if entry.name.endswith(".parquet")
+            ]
+        except FileNotFoundError:
+            return None
+        return hashlib.sha1(repr(sorted(signatures)).encode()).hexdigest()[:16]
+
+    def invalidate(self) -> None:
+        self._tables.clear()
+
+    def stats(self) -> dict:
+        return {
+            "tables": sorted(self._tables),
+            "loads": self.loads,
+            "load_seconds": round(self.load_seconds, 3),
+        }
@@ -1,75 +1,264 @@
 from pathlib import Path
+from collections import Counter
 from pprint import pprint
-from typing import Annotated
+from typing import Annotated, Any, Literal, Optional
 from langchain_core.messages import HumanMessage
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 from .decorators import log_io
-import pandas as pd
+from .graph_index import GraphIndex
+from .graph_router import (
+    SEARCH_MODES,
+    classify_query,
+    entity_title_set,
+    mentioned_entities,
+)
+from .semantic_cache import SemanticCache
+from src.config import (
+    GRAPHRAG_COMMUNITY_LEVEL,
+    GRAPHRAG_PROJECT_DIR,
+    GRAPH_SEMANTIC_CACHE,
+)
+from src.llms.llm import get_embeddings
+from src.utils.async_runtime import AsyncRuntime
+from src.utils.stats import CallStats
 import logging
 import asyncio
+import threading
+import time
 import graphrag.api as api
+from graphrag.callbacks.noop_query_callbacks import NoopQueryCallbacks
 from graphrag.config.load_config import load_config
-from graphrag.index.typing.pipeline_run_result import PipelineRunResult
+from graphrag.query.structured_search.base import SearchResult
 
 
 logger = logging.getLogger(__name__)
 
-PROJECT_DIRECTORY = "/Users/yanhuibin/myData/graphRAG"
-graphrag_config = load_config(Path(PROJECT_DIRECTORY))
+PROJECT_DIRECTORY = GRAPHRAG_PROJECT_DIR
+graph_index = GraphIndex(f"{PROJECT_DIRECTORY}/output")
+# load_config resolves output/ (a symlink once the indexer has run) to the
+# current generation, so the config is reloaded whenever the index changes.
+# Loaded on first search, so importing the tools needs no graphrag project.
+_graphrag_config: Optional[tuple[Optional[str], Any]] = None
 
+# Sync callers share one loop instead of a new thread and loop per query
+graph_runtime = AsyncRuntime("graph-runtime")
 
-# index
-# index_result: list[PipelineRunResult] =  await api.build_index(config=graphrag_config)
+SearchMode = Literal["auto", "local", "drift", "global"]
+SEARCH_MODE_DESCRIPTION = (
+    "local for questions about specific entities, global for broad questions "
+    "about the whole dataset, drift for how entities relate; auto picks one"
+)
 
-# for workflow_result in index_result:
-#     status = f"error\n{workflow_result.errors}" if workflow_result.errors else "success"
-#     print(f"Workflow Name: {workflow_result.workflow}\tStatus: {status}")
 
+class _UsageCallbacks(NoopQueryCallbacks):
+    """Counts the tokens a search reports through graphrag's query callbacks."""
 
+    def __init__(self):
+        self.usage = {
+            "streamed_tokens": 0,
+            "map_llm_calls": 0,
+            "map_prompt_tokens": 0,
+            "map_output_tokens": 0,
+        }
 
-async def _async_graph_search(query: str) -> str:
-    """异步执行graph search的内部函数"""
-    entities = pd.read_parquet(f"{PROJECT_DIRECTORY}/output/entities.parquet")
-    communities = pd.read_parquet(f"{PROJECT_DIRECTORY}/output/communities.parquet")
-    community_reports = pd.read_parquet(
-        f"{PROJECT_DIRECTORY}/output/community_reports.parquet"
-    )
-    response, context = await api.global_search(
-        config=graphrag_config,
-        entities=entities,
-        communities=communities,
-        community_reports=community_reports,
-        community_level=2,
-        dynamic_community_selection=False,
+    def on_llm_new_token(self, token) -> None:
+        self.usage["streamed_tokens"] += 1
+
+    def on_map_response_end(self, map_response_outputs: list[SearchResult]) -> None:
+        for result in map_response_outputs:
+            self.usage["map_llm_calls"] += result.llm_calls
+            self.usage["map_prompt_tokens"] += result.prompt_tokens
+            self.usage["map_output_tokens"] += result.output_tokens
+
+
+class GraphSearchStats:
+    """Latency and token usage of graph searches, per search mode."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {mode: CallStats() for mode in SEARCH_MODES}
+        self.tokens = {mode: Counter() for mode in SEARCH_MODES}
+
+    def record(self, mode: str, latency: float, usage: dict, error: bool) -> None:
+        with self._lock:
+            self.latency[mode].record(latency, error)
+            self.tokens[mode].update(usage)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                mode: {
+                    **self.latency[mode].snapshot(),
+                    "tokens": dict(self.tokens[mode]),
+                }
+                for mode in SEARCH_MODES
+            }
+
+
+graph_search_stats = GraphSearchStats()
+semantic_cache = SemanticCache()
+# Turned off for the process if the embeddings endpoint fails
+_semantic_cache_enabled = GRAPH_SEMANTIC_CACHE
+_entity_titles: Optional[tuple[Optional[str], frozenset[str]]] = None
+
+
+def _load_entity_titles() -> frozenset[str]:
+    """Entity titles of the current index, rebuilt when the index changes."""
+    global _entity_titles
+    version = graph_index.version
+    if _entity_titles is None or _entity_titles[0] != version:
+        _entity_titles = (
+            version,
+            entity_title_set(graph_index.table("entities")["title"]),
+        )
+    return _entity_titles[1]
+
+
+def _load_config():
+    global _graphrag_config
+    version = graph_index.version
+    if _graphrag_config is None or _graphrag_config[0] != version:
+        _graphrag_config = (version, load_config(Path(PROJECT_DIRECTORY)))
+    return _graphrag_config[1]
+
+
+def _load_tables(mode: str) -> dict:
+    names = ["entities", "communities", "community_reports"]
+    if mode != "global":
+        names += ["text_units", "relationships"]
+    if mode == "local" and graph_index.has("covariates"):
+        names.append("covariates")
+    return graph_index.tables(*names)
+
+
+async def _run_search(
+    mode: str, query: str, config, tables: dict, callbacks: list
+) -> str:
+    common = dict(
+        config=config,
+        entities=tables["entities"],
+        communities=tables["communities"],
+        community_reports=tables["community_reports"],
+        community_level=GRAPHRAG_COMMUNITY_LEVEL,
         response_type="Multiple Paragraphs",
         query=query,
+        callbacks=callbacks,
     )
+    if mode == "global":
+        response, context = await api.global_search(
+            **common, dynamic_community_selection=False
+        )
+    elif mode == "local":
+        response, context = await api.local_search(
+            **common,
+            text_units=tables["text_units"],
+            relationships=tables["relationships"],
+            covariates=tables.get("covariates"),
+        )
+    else:
+        response, context = await api.drift_search(
+            **common,
+            text_units=tables["text_units"],
+            relationships=tables["relationships"],
+        )
     return response
 
 
-@tool
+async def _embed_query(query: str) -> Optional[list[float]]:
+    global _semantic_cache_enabled
+    try:
+        return await get_embeddings().aembed_query(query)
+    except Exception as e:
+        # Most likely a provider without embeddings; don't pay for it again.
+        _semantic_cache_enabled = False
+        logger.warning(
+            f"Failed to embed graph query, disabling the semantic cache: {e!r}"
+        )
+        return None
+
+
+async def _async_graph_search(query: str, mode: str = "auto") -> str:
+    """异步执行graph search的内部函数"""
+    if not _semantic_cache_enabled:
+        return await _search(query, mode)
+    # 语义缓存：措辞不同但意思相同的问题直接复用之前的答案
+    embedding, version, entity_titles = await asyncio.gather(
+        _embed_query(query),
+        asyncio.to_thread(lambda: graph_index.version),
+        asyncio.to_thread(_load_entity_titles),
+    )
+    if embedding is None:
+        return await _search(query, mode)
+    entities = mentioned_entities(query, entity_titles)
+    hit = semantic_cache.lookup(embedding, mode, version, entities)
+    if hit is not None:
+        answer, similarity = hit
+        logger.info(
+            f"Graph query served from semantic cache ({similarity:.3f}): {query}"
+        )
+        return answer
+    response = await _search(query, mode)
+    if isinstance(response, str) and response:
+        semantic_cache.store(embedding, query, mode, version, response, entities)
+    return response
+
+
+async def _search(query: str, mode: str) -> str:
+    if mode == "auto":
+        entity_titles = await asyncio.to_thread(_load_entity_titles)
+        mode = classify_query(query, entity_titles)
+        logger.info(f"Graph query routed to {mode} search: {query}")
+    # The first load (or a reload after re-indexing) reads parquet files.
+    config = await asyncio.to_thread(_load_config)
+    tables = await asyncio.to_thread(_load_tables, mode)
+    usage = _UsageCallbacks()
+    started_at = time.perf_counter()
+    error = True
+    try:
+        response = await _run_search(mode, query, config, tables, [usage])
+        error = False
+        return response
+    finally:
+        graph_search_stats.record(
+            mode, time.perf_counter() - started_at, usage.usage, error
+        )
+
+
+def _failed(e: Exception) -> str:
+    error_msg = f"Failed to query graph rag. Error: {repr(e)}"
+    logger.error(error_msg)
+    return error_msg
+
+
 @log_io
-def graph_retriever(
+def _graph_retriever(
     query: Annotated[str, "The query to search from graph rag."],
+    mode: Annotated[SearchMode, SEARCH_MODE_DESCRIPTION] = "auto",
 ) -> HumanMessage:
     """Use this to search from graph rag."""
     try:
-        # 使用asyncio.run在同步上下文中运行异步函数
-        try:
-            # 尝试获取当前事件循环
-            loop = asyncio.get_running_loop()
-            # 如果已经有事件循环在运行，需要使用不同的方法
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, _async_graph_search(query))
-                response = future.result()
-        except RuntimeError:
-            # 没有运行的事件循环，可以直接使用asyncio.run
-            response = asyncio.run(_async_graph_search(query))
-        
+        # 同步调用在共享的事件循环上执行，不再每次新建线程和事件循环
+        response = graph_runtime.run(_async_graph_search(query, mode))
         return HumanMessage(content=response)
-    except BaseException as e:
-        error_msg = f"Failed to query graph rag. Error: {repr(e)}"
-        logger.error(error_msg)
-        return error_msg
-    
\ No newline at end of file
+    except Exception as e:
+        return _failed(e)
+
+
+@log_io
+async def _agraph_retriever(
+    query: Annotated[str, "The query to search from graph rag."],
+    mode: Annotated[SearchMode, SEARCH_MODE_DESCRIPTION] = "auto",
+) -> HumanMessage:
+    """Use this to search from graph rag."""
+    try:
+        response = await _async_graph_search(query, mode)
+        return HumanMessage(content=response)
+    except Exception as e:
+        return _failed(e)
+
+
+graph_retriever = StructuredTool.from_function(
+    func=_graph_retriever,
+    coroutine=_agraph_retriever,
+    name="graph_retriever",
+)
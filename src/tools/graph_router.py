@@ -0,0 +1,75 @@
+import re
+from typing import Iterable, Iterator
+
+# Cheapest first: local search answers from the entities around the query,
+# drift search expands from them, global search map-reduces all reports.
+SEARCH_MODES = ("local", "drift", "global")
+
+GLOBAL_PATTERNS = re.compile(
+    r"\b(overall|overview|summari[sz]e|summary|main (themes?|topics?|trends?)|"
+    r"trends?|landscape|in general|across|key (themes?|topics?|takeaways?)|"
+    r"what are people|sentiment|big picture)\b|总结|概述|整体|趋势",
+    re.IGNORECASE,
+)
+DRIFT_PATTERNS = re.compile(
+    r"\b(how (does|do|did|is|are) .+ (relate|related|connected|affect|impact|influence)|"
+    r"relationship between|connection between|compare|comparison|versus|vs\.?|"
+    r"why (did|does|is|are)|impact of|effect of)\b|关系|影响|比较",
+    re.IGNORECASE,
+)
+LOCAL_PATTERNS = re.compile(
+    r"\b(what is|what's|who is|who's|when (was|did)|where is|which|"
+    r"contract address|address of|ticker|symbol|price of|founder of|"
+    r"official (site|website|account))\b|0x[0-9a-fA-F]{6,}|\$[A-Za-z]{2,10}\b|"
+    r"\"[^\"]+\"|是什么|是谁|地址",
+    re.IGNORECASE,
+)
+
+MAX_ENTITY_NGRAM = 3
+# Names that identify an entity even when the index doesn't know it
+ENTITY_TOKENS = re.compile(r"0x[0-9a-fA-F]{6,}|\$[A-Za-z]{2,10}\b|\"[^\"]+\"")
+
+
+def _spans(query: str) -> Iterator[str]:
+    words = re.findall(r"[\w$.-]+", query.lower())
+    for size in range(1, MAX_ENTITY_NGRAM + 1):
+        for i in range(len(words) - size + 1):
+            yield " ".join(words[i : i + size])
+
+
+def mentions_entity(query: str, entity_titles: frozenset[str]) -> bool:
+    """Whether any 1-3 word span of the query is a known entity title."""
+    return any(span in entity_titles for span in _spans(query))
+
+
+def mentioned_entities(query: str, entity_titles: frozenset[str]) -> frozenset[str]:
+    """Known entity titles, addresses, tickers and quoted names in ``query``."""
+    found = {span for span in _spans(query) if span in entity_titles}
+    found.update(match.lower() for match in ENTITY_TOKENS.findall(query))
+    return frozenset(found)
+
+
+def entity_title_set(titles: Iterable[str]) -> frozenset[str]:
+    return frozenset(
+        str(title).strip().lower() for title in titles if title and len(str(title)) >= 3
+    )
+
+
+def classify_query(query: str, entity_titles: frozenset[str] = frozenset()) -> str:
+    """Pick the cheapest graphrag search mode likely to answer ``query``.
+
+    Args:
+        query: The user question.
+        entity_titles: Lower-cased entity titles of the index, if loaded.
+
+    Returns:
+        One of ``SEARCH_MODES``.
+    """
+    if GLOBAL_PATTERNS.search(query):
+        return "global"
+    if DRIFT_PATTERNS.search(query):
+        return "drift"
+    if LOCAL_PATTERNS.search(query) or mentions_entity(query, entity_titles):
+        return "local"
+    # Nothing entity-specific to anchor a local search on.
+    return "global"
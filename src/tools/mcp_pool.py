@@ -0,0 +1,288 @@
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+from langchain_mcp_adapters.sessions import Connection, create_session
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult, TextContent
+from mcp.types import Tool as MCPTool
+
+from src.config import (
+    MCP_POOL_SIZE,
+    MCP_CALL_TIMEOUT,
+    MCP_START_TIMEOUT,
+    MCP_HEALTH_CHECK_INTERVAL,
+)
+from src.utils.async_runtime import AsyncRuntime
+from src.utils.stats import CallStats
+
+logger = logging.getLogger(__name__)
+
+# All MCP sessions live on this loop so their server processes outlive any
+# single request loop.
+mcp_runtime = AsyncRuntime("mcp-runtime")
+
+
+class MCPConnection:
+    """A single MCP client session kept open by an owner task.
+
+    The transport context managers (stdio process, anyio task groups) must be
+    entered and exited by the same task, so the session is opened inside
+    ``_serve`` which then parks until ``close`` is called.
+    """
+
+    def __init__(self, server_name: str, connection: Connection, index: int):
+        self.server_name = server_name
+        self.connection = connection
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self, timeout: float = MCP_START_TIMEOUT) -> None:
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._serve(ready))
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _serve(self, ready: asyncio.Future) -> None:
+        try:
+            async with create_session(self.connection) as session:
+                await session.initialize()
+                self.session = session
+                ready.set_result(None)
+                await self._stop.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not isinstance(e, asyncio.CancelledError):
+                logger.warning(
+                    f"MCP connection {self.server_name}#{self.index} exited: {e!r}"
+                )
+        finally:
+            self.session = None
+
+    async def ping(self, timeout: float) -> None:
+        if not self.alive:
+            raise ConnectionError("MCP session is not connected")
+        await asyncio.wait_for(self.session.send_ping(), timeout)
+
+    async def close(self, timeout: float = 5) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        if self._task is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+            except Exception:
+                pass
+        self.session = None
+
+
+class MCPSessionPool:
+    """A pool of warm MCP sessions to one server, with health checks.
+
+    Every method must be awaited on ``mcp_runtime``; use the LangChain tools
+    from ``to_langchain_tool`` (see ``mcp_registry``) to call into the pool
+    from any thread or loop.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        connection: Connection,
+        size: int = MCP_POOL_SIZE,
+        call_timeout: float = MCP_CALL_TIMEOUT,
+        health_check_interval: float = MCP_HEALTH_CHECK_INTERVAL,
+    ):
+        self.server_name = server_name
+        self.connection = connection
+        self.size = max(1, size)
+        self.call_timeout = call_timeout
+        self.health_check_interval = health_check_interval
+        self._idle: Optional[asyncio.Queue] = None
+        self._connections: list[MCPConnection] = []
+        self._health_task: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.started = False
+        self.stats = CallStats()
+
+    async def start(self) -> None:
+        """Spawn all sessions concurrently and begin periodic health checks."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.started:
+                return
+            self._idle = asyncio.Queue()
+            self._connections = [
+                MCPConnection(self.server_name, self.connection, i)
+                for i in range(self.size)
+            ]
+            results = await asyncio.gather(
+                *(conn.start() for conn in self._connections), return_exceptions=True
+            )
+            failures = [r for r in results if isinstance(r, BaseException)]
+            if len(failures) == len(results):
+                raise failures[0]
+            for conn, result in zip(self._connections, results):
+                if isinstance(result, BaseException):
+                    logger.warning(
+                        f"MCP connection {self.server_name}#{conn.index} failed to start: {result!r}"
+                    )
+                # Dead connections are restarted lazily on acquire.
+                self._idle.put_nowait(conn)
+            self._health_task = asyncio.create_task(self._health_check_loop())
+            self.started = True
+            logger.info(
+                f"MCP pool {self.server_name} started with {self.size - len(failures)}/{self.size} sessions"
+            )
+
+    async def _restart(self, conn: MCPConnection) -> MCPConnection:
+        logger.info(f"Restarting MCP connection {self.server_name}#{conn.index}")
+        await conn.close()
+        fresh = MCPConnection(self.server_name, self.connection, conn.index)
+        self._connections[conn.index] = fresh
+        await fresh.start()
+        return fresh
+
+    async def _acquire(self) -> MCPConnection:
+        if not self.started:
+            await self.start()
+        conn = await self._idle.get()
+        if conn.alive:
+            return conn
+        try:
+            return await self._restart(conn)
+        except BaseException:
+            self._idle.put_nowait(self._connections[conn.index])
+            raise
+
+    def _release(self, conn: MCPConnection) -> None:
+        self._idle.put_nowait(self._connections[conn.index])
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> CallToolResult:
+        conn = await self._acquire()
+        started_at = time.perf_counter()
+        error = True
+        try:
+            result = await asyncio.wait_for(
+                conn.session.call_tool(name, arguments), self.call_timeout
+            )
+            error = result.isError
+            return result
+        except McpError as e:
+            # Protocol level errors leave the session usable unless the server
+            # process went away underneath it.
+            if e.error.code == CONNECTION_CLOSED:
+                await self._restart_quietly(conn)
+            raise
+        except Exception:
+            # Timeouts and transport errors leave the session in an unknown
+            # state, so replace it before handing it out again.
+            await self._restart_quietly(conn)
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - started_at, error)
+            self._release(conn)
+
+    async def list_tools(self) -> list[MCPTool]:
+        conn = await self._acquire()
+        try:
+            tools: list[MCPTool] = []
+            cursor = None
+            while True:
+                page = await asyncio.wait_for(
+                    conn.session.list_tools(cursor=cursor), self.call_timeout
+                )
+                tools.extend(page.tools)
+                cursor = page.nextCursor
+                if cursor is None:
+                    return tools
+        finally:
+            self._release(conn)
+
+    async def _restart_quietly(self, conn: MCPConnection) -> None:
+        try:
+            await self._restart(conn)
+        except Exception as e:
+            logger.warning(
+                f"Failed to restart MCP connection {self.server_name}#{conn.index}: {e!r}"
+            )
+
+    async def _health_check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            # Only probe idle sessions; busy ones prove their health by working.
+            idle = []
+            while not self._idle.empty():
+                idle.append(self._idle.get_nowait())
+            for conn in idle:
+                try:
+                    await conn.ping(timeout=min(self.call_timeout, 10))
+                except Exception as e:
+                    logger.warning(
+                        f"MCP connection {self.server_name}#{conn.index} failed health check: {e!r}"
+                    )
+                    await self._restart_quietly(conn)
+                self._release(conn)
+
+    async def close(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        await asyncio.gather(
+            *(conn.close() for conn in self._connections), return_exceptions=True
+        )
+        self._connections = []
+        self.started = False
+
+
+def _convert_call_tool_result(result: CallToolResult) -> tuple[Any, Optional[list]]:
+    texts = [c.text for c in result.content if isinstance(c, TextContent)]
+    non_texts = [c for c in result.content if not isinstance(c, TextContent)]
+    content: Any = texts[0] if len(texts) == 1 else (texts or "")
+    if result.isError:
+        raise ToolException(content)
+    return content, non_texts or None
+
+
+def to_langchain_tool(pool: MCPSessionPool, tool: MCPTool) -> BaseTool:
+    """Wrap an MCP tool so every call is routed through the session pool."""
+
+    async def _call(**arguments: Any):
+        result = await pool.call_tool(tool.name, arguments)
+        return _convert_call_tool_result(result)
+
+    async def call_tool(**arguments: Any):
+        return await mcp_runtime.arun(_call(**arguments))
+
+    def call_tool_sync(**arguments: Any):
+        return mcp_runtime.run(_call(**arguments))
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description or "",
+        args_schema=tool.inputSchema,
+        func=call_tool_sync,
+        coroutine=call_tool,
+        response_format="content_and_artifact",
+        metadata=tool.annotations.model_dump() if tool.annotations else None,
+    )
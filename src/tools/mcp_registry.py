@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from langchain_core.tools import BaseTool
+from mcp.types import Tool as MCPTool
+
+from src.config import (
+    MCP_LOAD_RETRY_INTERVAL,
+    MCP_SERVERS_CONFIG,
+    MCP_SCHEMA_CACHE_DIR,
+    MCP_START_TIMEOUT,
+)
+from src.config.loader import load_yaml_config
+from src.utils.async_runtime import shutdown_on_exit
+from .mcp_pool import MCPSessionPool, mcp_runtime, to_langchain_tool
+
+logger = logging.getLogger(__name__)
+
+# Registry-level options that are not part of the MCP connection itself
+POOL_OPTIONS = ("pool_size", "call_timeout")
+
+
+class MCPToolRegistry:
+    """Config-driven registry of MCP servers and their LangChain tools.
+
+    Servers are connected concurrently, each within its own timeout, and
+    servers that failed are retried lazily by later ``get_tools`` calls.
+    Tool schemas are cached on disk keyed
+    by the server config, so a restart can hand out tools immediately and
+    warm the sessions in the background; dead sessions reconnect lazily on
+    the next call.
+    """
+
+    def __init__(self, servers: dict[str, dict], cache_dir: str = MCP_SCHEMA_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._pools: dict[str, MCPSessionPool] = {}
+        self._tools: dict[str, list[BaseTool]] = {}
+        self._retry_at: dict[str, float] = {}
+        self._load_lock = threading.Lock()
+        self._background: set[asyncio.Task] = set()
+        for name, config in servers.items():
+            connection = {k: v for k, v in config.items() if k not in POOL_OPTIONS}
+            pool_kwargs = {
+                "size" if k == "pool_size" else k: config[k]
+                for k in POOL_OPTIONS
+                if k in config
+            }
+            self._pools[name] = MCPSessionPool(name, connection, **pool_kwargs)
+
+    @classmethod
+    def from_config(cls, file_path: str = MCP_SERVERS_CONFIG) -> "MCPToolRegistry":
+        config = load_yaml_config(file_path)
+        return cls(config.get("servers") or {})
+
+    @property
+    def server_names(self) -> list[str]:
+        return list(self._pools)
+
+    def _cache_path(self, server_name: str) -> str:
+        return os.path.join(self.cache_dir, f"{server_name}.json")
+
+    def _config_hash(self, server_name: str) -> str:
+        connection = self._pools[server_name].connection
+        payload = json.dumps(connection, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _read_schema_cache(self, server_name: str) -> Optional[list[MCPTool]]:
+        try:
+            with open(self._cache_path(server_name), "r") as f:
+                cached = json.load(f)
+            if cached.get("config_hash") != self._config_hash(server_name):
+                return None
+            return [MCPTool.model_validate(tool) for tool in cached["tools"]]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(
+                f"Ignoring unreadable MCP schema cache for {server_name}: {e}"
+            )
+            return None
+
+    def _write_schema_cache(self, server_name: str, tools: list[MCPTool]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(server_name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "config_hash": self._config_hash(server_name),
+                    "tools": [tool.model_dump(mode="json") for tool in tools],
+                },
+                f,
+            )
+        os.replace(tmp_path, path)
+
+    async def _refresh_schema(self, server_name: str, cached: list[MCPTool]) -> None:
+        """Warm a server whose tools came from cache and refresh the cache."""
+        pool = self._pools[server_name]
+        try:
+            await pool.start()
+            tools = await pool.list_tools()
+        except Exception as e:
+            logger.warning(
+                f"Background warm-up of MCP server {server_name} failed: {e!r}"
+            )
+            return
+        if [t.model_dump() for t in tools] != [t.model_dump() for t in cached]:
+            logger.info(
+                f"MCP server {server_name} tool schema changed, cache refreshed"
+            )
+        self._write_schema_cache(server_name, tools)
+
+    async def _load_server(self, server_name: str) -> list[BaseTool]:
+        pool = self._pools[server_name]
+        mcp_tools = self._read_schema_cache(server_name)
+        if mcp_tools is None:
+            await pool.start()
+            mcp_tools = await pool.list_tools()
+            self._write_schema_cache(server_name, mcp_tools)
+        else:
+            task = asyncio.create_task(self._refresh_schema(server_name, mcp_tools))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return [to_langchain_tool(pool, tool) for tool in mcp_tools]
+
+    async def _load_pending(self, names: list[str], timeout: Optional[float]) -> None:
+        async def load_one(name: str) -> None:
+            try:
+                tools = await asyncio.wait_for(self._load_server(name), timeout)
+            except Exception as e:
+                logger.warning(f"Failed to load MCP server {name}: {e!r}")
+                self._retry_at[name] = time.monotonic() + MCP_LOAD_RETRY_INTERVAL
+                if not self._pools[name].started:
+                    await self._pools[name].close()
+                return
+            logger.info(f"Loaded {len(tools)} tools from MCP server {name}")
+            self._tools[name] = tools
+            self._retry_at.pop(name, None)
+
+        await asyncio.gather(*(load_one(name) for name in names))
+
+    def _pending(self) -> list[str]:
+        now = time.monotonic()
+        return [
+            name
+            for name in self.server_names
+            if name not in self._tools and self._retry_at.get(name, 0) <= now
+        ]
+
+    def load(self, timeout: Optional[float] = MCP_START_TIMEOUT * 2) -> None:
+        """Connect to every server not loaded yet, concurrently.
+
+        Each server gets ``timeout`` seconds on its own. A server that fails
+        is retried on a later call, at most every MCP_LOAD_RETRY_INTERVAL.
+        """
+        if not self._pending():
+            return
+        with self._load_lock:
+            pending = self._pending()
+            if pending:
+                mcp_runtime.run(self._load_pending(pending, timeout))
+
+    def load_in_background(
+        self, timeout: Optional[float] = MCP_START_TIMEOUT * 2
+    ) -> None:
+        """Start ``load`` on the MCP runtime and return without waiting.
+
+        Does nothing while another load is running.
+        """
+        if not self._pending() or not self._load_lock.acquire(blocking=False):
+            return
+        pending = self._pending()
+        if not pending:
+            self._load_lock.release()
+            return
+        future = mcp_runtime.submit(self._load_pending(pending, timeout))
+        future.add_done_callback(lambda _: self._load_lock.release())
+
+    def get_tools(
+        self, server_name: Optional[str] = None, wait: bool = True
+    ) -> list[BaseTool]:
+        """Return the tools of one server, or of all servers if none is given.
+
+        Servers that failed to load are retried first (see ``load``). With
+        ``wait`` off, the retry runs in the background and the tools loaded
+        so far are returned at once.
+        """
+        if wait:
+            self.load()
+        else:
+            self.load_in_background()
+        if server_name is not None:
+            return list(self._tools.get(server_name, []))
+        return [tool for tools in self._tools.values() for tool in tools]
+
+    def stats(self) -> dict[str, Any]:
+        """Per-server call latency statistics."""
+        return {
+            name: {
+                "sessions": pool.size,
+                "started": pool.started,
+                **pool.stats.snapshot(),
+            }
+            for name, pool in self._pools.items()
+        }
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *(pool.close() for pool in self._pools.values()), return_exceptions=True
+        )
+
+
+mcp_registry = MCPToolRegistry.from_config()
+shutdown_on_exit(mcp_runtime, mcp_registry.close)
+
+
+def get_mcp_tools(
+    server_name: Optional[str] = None, wait: bool = True
+) -> list[BaseTool]:
+    """Get LangChain tools for a configured MCP server (or all servers)."""
+    return mcp_registry.get_tools(server_name, wait)
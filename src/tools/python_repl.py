@@ -1,13 +1,35 @@
+import atexit
 import logging
 from typing import Annotated
+from langchain_core.runnables import ensure_config
 from langchain_core.tools import tool
-from langchain_experimental.utilities import PythonREPL
 from .decorators import log_io
+from src.config import (
+    PYTHON_SANDBOX_WORKERS,
+    PYTHON_SANDBOX_MAX_RUNS,
+    PYTHON_SANDBOX_TIMEOUT,
+    PYTHON_SANDBOX_CPU_SECONDS,
+    PYTHON_SANDBOX_MEMORY_MB,
+    PYTHON_SANDBOX_SESSION_TTL,
+    PYTHON_SANDBOX_PRELOAD,
+)
+from src.utils.python_sandbox import PythonSandbox, SandboxError
 
-# Initialize REPL and logger
-repl = PythonREPL()
+# Initialize sandbox and logger
 logger = logging.getLogger(__name__)
 
+# Each workflow runs its code in its own session on a pool of worker processes
+python_sandbox = PythonSandbox(
+    workers=PYTHON_SANDBOX_WORKERS,
+    max_runs=PYTHON_SANDBOX_MAX_RUNS,
+    timeout=PYTHON_SANDBOX_TIMEOUT,
+    cpu_seconds=PYTHON_SANDBOX_CPU_SECONDS,
+    memory_mb=PYTHON_SANDBOX_MEMORY_MB,
+    session_ttl=PYTHON_SANDBOX_SESSION_TTL,
+    preload=PYTHON_SANDBOX_PRELOAD,
+)
+atexit.register(python_sandbox.shutdown)
+
 
 @tool
 @log_io
@@ -23,14 +45,19 @@ def python_repl_tool(
         logger.error(error_msg)
         return f"Error executing code:\n```python\n{code}\n```\nError: {error_msg}"
 
-    logger.info("Executing Python code")
+    session_id = ensure_config().get("configurable", {}).get("workflow_id", "default")
+    logger.info(f"Executing Python code in session {session_id}")
     try:
-        result = repl.run(code)
+        result = python_sandbox.run(session_id, code)
         # Check if the result is an error message by looking for typical error patterns
         if isinstance(result, str) and ("Error" in result or "Exception" in result):
             logger.error(result)
             return f"Error executing code:\n```python\n{code}\n```\nError: {result}"
         logger.info("Code execution successful")
+    except SandboxError as e:
+        error_msg = f"{e}. Variables defined by earlier code are no longer available."
+        logger.error(error_msg)
+        return f"Error executing code:\n```python\n{code}\n```\nError: {error_msg}"
     except BaseException as e:
         error_msg = repr(e)
         logger.error(error_msg)
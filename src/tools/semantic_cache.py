@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.config import (
+    GRAPH_SEMANTIC_CACHE_THRESHOLD,
+    GRAPH_SEMANTIC_CACHE_TTL,
+    GRAPH_SEMANTIC_CACHE_MAX_ENTRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Answers to past queries, looked up by embedding similarity.
+
+    Embeddings live in a fixed-size ring of normalized vectors searched by
+    brute-force cosine similarity, which is a single matrix-vector product
+    for a few thousand entries. Entries expire after ``ttl`` seconds and are
+    only valid for the index version they were answered from. A similar
+    query only gets a stored answer if it names the same entities, since
+    embeddings of short questions about different entities are close.
+    """
+
+    def __init__(
+        self,
+        threshold: float = GRAPH_SEMANTIC_CACHE_THRESHOLD,
+        ttl: float = GRAPH_SEMANTIC_CACHE_TTL,
+        max_entries: int = GRAPH_SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._expires_at = np.zeros(max_entries)
+        self._entries: list[Optional[tuple[str, str, frozenset[str], str]]] = [
+            None
+        ] * max_entries
+        self._version: Optional[str] = None
+        self._next = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_version(self, version: Optional[str]) -> None:
+        # A re-indexed graph invalidates every stored answer at once.
+        if version != self._version:
+            self._expires_at[:] = 0
+            self._entries = [None] * self.max_entries
+            self._version = version
+
+    def lookup(
+        self,
+        embedding: Sequence[float],
+        scope: str,
+        version: Optional[str],
+        entities: frozenset[str] = frozenset(),
+    ) -> Optional[tuple[str, float]]:
+        """Return the best stored answer above the threshold and its similarity.
+
+        Args:
+            embedding: Embedding of the new query.
+            scope: Only entries stored under the same scope match, e.g. the
+                search mode.
+            version: Version of the index the answer must come from.
+            entities: Entities the query names; only entries stored with
+                exactly these match.
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            self._check_version(version)
+            if self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+            similarities = self._vectors @ query
+            similarities[self._expires_at < time.monotonic()] = -1.0
+            for i in np.argsort(similarities)[::-1]:
+                if similarities[i] < self.threshold:
+                    break
+                entry = self._entries[i]
+                if entry is not None and entry[1] == scope and entry[2] == entities:
+                    self.hits += 1
+                    return entry[3], float(similarities[i])
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        embedding: Sequence[float],
+        query: str,
+        scope: str,
+        version: Optional[str],
+        answer: str,
+        entities: frozenset[str] = frozenset(),
+    ) -> None:
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._check_version(version)
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                # First entry, or the embedding model changed.
+                self._vectors = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32
+                )
+                self._expires_at[:] = 0
+                self._entries = [None] * self.max_entries
+            # Ring buffer: the oldest entry is overwritten once full.
+            slot = self._next % self.max_entries
+            self._next += 1
+            self._vectors[slot] = vector
+            self._expires_at[slot] = time.monotonic() + self.ttl
+            self._entries[slot] = (query, scope, entities, answer)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires_at[:] = 0
+            self._entries = [None] * self.max_entries
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = int((self._expires_at >= time.monotonic()).sum())
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+
+from src.config import (
+    TWITTER_RATE_LIMITS,
+    TWITTER_CACHE_TTLS,
+    TWITTER_MAX_QUEUE_WAIT,
+    TWITTER_RATE_LIMIT_BACKOFF,
+)
+from src.service.state_backend import shared_cache
+from .mcp_pool import mcp_runtime
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_MARKERS = ("429", "too many requests", "rate limit")
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class TokenBucket:
+    """An asyncio token bucket that queues callers instead of rejecting them."""
+
+    def __init__(self, requests: int, window: float):
+        self.capacity = max(1, requests)
+        self.rate = self.capacity / window
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self, max_wait: float) -> float:
+        """Take one token, waiting up to ``max_wait`` seconds. Returns the wait.
+
+        Time spent queued behind other callers counts towards ``max_wait``.
+        """
+        started_at = time.monotonic()
+        # The lock keeps waiters in FIFO order.
+        try:
+            await asyncio.wait_for(self._lock.acquire(), max(0.0, max_wait))
+        except TimeoutError:
+            raise self._queue_timeout(max_wait) from None
+        try:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started_at
+                delay = max(
+                    self._blocked_until - now, (1 - self._tokens) / self.rate, 0.01
+                )
+                if now + delay - started_at > max_wait:
+                    raise self._queue_timeout(max_wait)
+                await asyncio.sleep(delay)
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _queue_timeout(max_wait: float) -> ToolException:
+        return ToolException(
+            f"Twitter rate limit queue wait exceeded {max_wait:.1f}s, try again later"
+        )
+
+    def block_for(self, seconds: float) -> None:
+        """Pause the bucket after the upstream API reported a rate limit."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+class TwitterScheduler:
+    """Caches, coalesces and rate limits calls to the Twitter MCP tools.
+
+    All state lives on ``mcp_runtime`` so coalescing works across workflows
+    running on different threads and loops.
+    """
+
+    def __init__(
+        self,
+        rate_limits: dict[str, tuple[int, float]] = TWITTER_RATE_LIMITS,
+        cache_ttls: dict[str, float] = TWITTER_CACHE_TTLS,
+        max_queue_wait: float = TWITTER_MAX_QUEUE_WAIT,
+    ):
+        self.rate_limits = rate_limits
+        self.cache_ttls = cache_ttls
+        self.max_queue_wait = max_queue_wait
+        # Shared by all server workers if the state backend is
+        self.cache = shared_cache("twitter", max_entries=2048)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._listeners: list[Callable[[str, dict, Any], None]] = []
+        self.coalesced = 0
+        self.queued_seconds = 0.0
+
+    def add_listener(self, listener: Callable[[str, dict, Any], None]) -> None:
+        """Call ``listener(tool_name, arguments, result)`` on fresh read results."""
+        self._listeners.append(listener)
+
+    def _bucket(self, tool_name: str) -> TokenBucket:
+        if tool_name not in self._buckets:
+            limit = self.rate_limits.get(tool_name, self.rate_limits["default"])
+            self._buckets[tool_name] = TokenBucket(*limit)
+        return self._buckets[tool_name]
+
+    async def call(self, tool: BaseTool, arguments: dict[str, Any]) -> Any:
+        ttl = self.cache_ttls.get(tool.name)
+        if ttl is None:
+            # Writes are never cached or coalesced.
+            return await self._execute(tool, arguments)
+
+        key = (tool.name, json.dumps(arguments, sort_keys=True, default=str))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if key in self._inflight:
+            self.coalesced += 1
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" when nobody coalesced onto it.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await self._execute(tool, arguments)
+            self.cache.set(key, result, ttl)
+            future.set_result(result)
+            self._notify(tool.name, arguments, result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def _notify(self, tool_name: str, arguments: dict, result: Any) -> None:
+        for listener in self._listeners:
+            try:
+                listener(tool_name, arguments, result)
+            except Exception as e:
+                logger.warning(f"Twitter result listener failed: {e!r}")
+
+    async def _execute(self, tool: BaseTool, arguments: dict[str, Any]) -> Any:
+        bucket = self._bucket(tool.name)
+        # One queueing budget for the call, rate limit retries included
+        deadline = time.monotonic() + self.max_queue_wait
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.queued_seconds += await bucket.acquire(deadline - time.monotonic())
+            try:
+                return await tool.coroutine(**arguments)
+            except ToolException as e:
+                message = str(e).lower()
+                if attempt == MAX_RATE_LIMIT_RETRIES or not any(
+                    marker in message for marker in RATE_LIMIT_MARKERS
+                ):
+                    raise
+                logger.warning(
+                    f"Twitter tool {tool.name} hit the API rate limit, backing off {TWITTER_RATE_LIMIT_BACKOFF}s"
+                )
+                bucket.block_for(TWITTER_RATE_LIMIT_BACKOFF)
+
+    def stats(self) -> dict:
+        return {
+            "cache": self.cache.stats(),
+            "coalesced": self.coalesced,
+            "queued_seconds": round(self.queued_seconds, 3),
+            "inflight": len(self._inflight),
+        }
+
+
+twitter_scheduler = TwitterScheduler()
+
+
+def schedule_tool(
+    tool: BaseTool, scheduler: Optional[TwitterScheduler] = None
+) -> BaseTool:
+    """Wrap an MCP tool so its calls go through the scheduler."""
+    scheduler = scheduler or twitter_scheduler
+
+    async def call_tool(**arguments: Any):
+        return await mcp_runtime.arun(scheduler.call(tool, arguments))
+
+    def call_tool_sync(**arguments: Any):
+        return mcp_runtime.run(scheduler.call(tool, arguments))
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=call_tool_sync,
+        coroutine=call_tool,
+        response_format=tool.response_format,
+        metadata=tool.metadata,
+    )
@@ -1,63 +1,41 @@
-import asyncio
 import logging
-from langchain_mcp_adapters.client import MultiServerMCPClient
+
+from src.config import GRAPHRAG_INGEST_TWITTER_TOOLS
+from src.service.graph_indexer import graph_indexer
+from .mcp_registry import get_mcp_tools
+from .twitter_scheduler import schedule_tool, twitter_scheduler
 
 logger = logging.getLogger(__name__)
 
-# TWITTER_TOOLS = []
-
-async def init_twitter_tools():
-    """Initialize MCP tools asynchronously."""
-    try:
-        client = MultiServerMCPClient(
-            {
-                "x-twitter-mcp": {
-                    "command": "uv",
-                    "args": [
-                        "--directory",
-                        "/Users/yanhuibin/Documents/aicode/yoahabi",
-                        "run",
-                        "x-twitter-mcp-server"
-                    ],
-                    "env": {
-                        "PYTHONUNBUFFERED": "1"
-                    },
-                    "transport": "stdio"
-                }
-            }
-        )
-        tools = await client.get_tools()
-        return tools;
-    except Exception as e:
-        logger.warning(f"Failed to initialize MCP tools: {e}")
-        return []
-
-
-def get_twitter_tools():
-    """Get MCP tools, initializing them if needed."""
-    try:
-        # 使用asyncio.run在同步上下文中运行异步函数
-        try:
-            # 尝试获取当前事件循环
-            loop = asyncio.get_running_loop()
-            # 如果已经有事件循环在运行，需要使用不同的方法
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, init_twitter_tools())
-                response = future.result()
-        except RuntimeError:
-            # 没有运行的事件循环，可以直接使用asyncio.run
-            response = asyncio.run(init_twitter_tools())
-        logger.info(f"Initialized {len(response)} MCP tools")
-        return response
-    except BaseException as e:
-        logger.warning(f"Failed to initialize MCP tools: {e}")
-        return []
-    
+# Server name of the x-twitter-mcp entry in mcp_servers.yaml
+TWITTER_MCP_SERVER = "x-twitter-mcp"
+
+
+def _ingest_tweets(tool_name: str, arguments: dict, result) -> None:
+    if tool_name in GRAPHRAG_INGEST_TWITTER_TOOLS:
+        graph_indexer.ingest_tool_result(tool_name, arguments, result)
+
+
+# Fresh tweets feed the incremental graph index (when GRAPHRAG_INGEST is on)
+twitter_scheduler.add_listener(_ingest_tweets)
+
+
+def get_twitter_tools(wait: bool = True):
+    """Get the Twitter MCP tools, cached and rate limited by the scheduler.
+
+    Args:
+        wait: Wait for a retry of the server if it failed to load; otherwise
+            retry in the background and return what is loaded now.
+    """
+    tools = get_mcp_tools(TWITTER_MCP_SERVER, wait)
+    if not tools and wait:
+        logger.warning(f"No tools available from MCP server {TWITTER_MCP_SERVER}")
+    return [schedule_tool(tool) for tool in tools]
+
 
 if __name__ == "__main__":
     # 测试 MCP 工具初始化
     tools = get_twitter_tools()
     print(f"MCP Tools: {len(tools)}")
     for tool in tools:
-        print(f"  - {tool.name}")
\ No newline at end of file
+        print(f"  - {tool.name}")
@@ -0,0 +1,114 @@
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncRuntime:
+    """
+    A long-lived event loop running in a dedicated daemon thread.
+
+    Resources that are bound to an event loop (stdio MCP server processes,
+    Playwright browsers, ...) must be created, used and closed on the same
+    loop. Owning them from a runtime thread lets both sync and async callers
+    share them without spinning up a throwaway loop per call.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the runtime loop, starting the thread on first use."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._start()
+        return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _serve():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=_serve, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+        logger.debug(f"Async runtime {self.name} started")
+
+    def in_runtime(self) -> bool:
+        """Whether the caller is already running on the runtime loop."""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the runtime loop and block until it completes."""
+        if self.in_runtime():
+            coro.close()
+            raise RuntimeError(
+                f"Blocking call into async runtime {self.name} from its own loop"
+            )
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def arun(self, coro: Coroutine[Any, Any, T]) -> Awaitable[T]:
+        """Await a coroutine on the runtime loop from another event loop."""
+        if self.in_runtime():
+            return coro
+        return asyncio.wrap_future(self.submit(coro))
+
+    def stop(self) -> None:
+        """Stop the runtime loop and join its thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        logger.debug(f"Async runtime {self.name} stopped")
+
+
+def shutdown_on_exit(runtime: AsyncRuntime, coro_factory) -> None:
+    """Run an async cleanup on the runtime at interpreter exit, then stop it."""
+
+    def _shutdown():
+        if not runtime.started:
+            return
+        try:
+            runtime.run(coro_factory(), timeout=10)
+        except Exception as e:
+            logger.warning(f"Error shutting down async runtime {runtime.name}: {e}")
+        finally:
+            runtime.stop()
+
+    atexit.register(_shutdown)
@@ -0,0 +1,192 @@
+"""
+Cheap logging helpers for the tool and node hot paths.
+
+Tool results can be whole crawled pages or REPL dumps, so nothing here
+formats a value unless the record will actually be emitted, and nothing
+formats more than a bounded prefix of it.
+"""
+
+import dataclasses
+import json
+import logging
+import random
+import reprlib
+from logging.handlers import RotatingFileHandler
+from typing import Any, Iterator, Optional
+
+from src.config import (
+    LOG_SAMPLE_RATE,
+    LOG_PAYLOAD_FILE,
+    LOG_PREVIEW_CHARS,
+    LOG_PAYLOAD_MAX_CHARS,
+    LOG_PAYLOAD_FILE_MAX_BYTES,
+    LOG_PAYLOAD_FILE_BACKUPS,
+)
+
+# Structured tool call records, one JSON object per line. Silent unless a
+# handler is attached, see configure_payload_log.
+payload_logger = logging.getLogger("src.payload")
+payload_logger.propagate = False
+payload_logger.setLevel(logging.INFO)
+
+
+class _BoundedRepr(reprlib.Repr):
+    """A ``reprlib.Repr`` that also bounds objects.
+
+    ``reprlib`` renders instances with the builtin ``repr()`` and only then
+    truncates, which costs the whole repr of a message or model. Pydantic
+    models (messages included) and dataclasses are rendered from their
+    non-empty fields instead, each through the same limits.
+    """
+
+    def repr_instance(self, x: Any, level: int) -> str:
+        fields = _fields(x)
+        if fields is None:
+            return super().repr_instance(x, level)
+        name = type(x).__name__
+        if level <= 0:
+            return f"{name}(...)"
+        parts = []
+        for key, value in fields:
+            if value is None or (isinstance(value, (str, dict, list)) and not value):
+                continue
+            if len(parts) >= self.maxdict:
+                parts.append("...")
+                break
+            parts.append(f"{key}={self.repr1(value, level - 1)}")
+        return f"{name}({', '.join(parts)})"
+
+
+def _fields(x: Any) -> Optional[Iterator[tuple[str, Any]]]:
+    model_fields = getattr(type(x), "model_fields", None)
+    if isinstance(model_fields, dict):
+        return ((name, getattr(x, name, None)) for name in model_fields)
+    if dataclasses.is_dataclass(x):
+        return ((f.name, getattr(x, f.name)) for f in dataclasses.fields(x))
+    return None
+
+
+def _bounded_repr(limit: int) -> reprlib.Repr:
+    bounded = _BoundedRepr()
+    bounded.maxstring = limit
+    bounded.maxother = limit
+    bounded.maxlist = bounded.maxtuple = bounded.maxset = bounded.maxdict = 20
+    bounded.maxlevel = 3
+    return bounded
+
+
+_preview_repr = _bounded_repr(LOG_PREVIEW_CHARS)
+
+
+def preview(value: Any, limit: int = LOG_PREVIEW_CHARS) -> str:
+    """Render ``value`` for a log line, costing at most ~``limit`` characters.
+
+    Strings are sliced before anything is copied; other objects go through a
+    bounded ``reprlib`` repr so large containers, messages and models are
+    never fully formatted.
+    """
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        return f"{value[:limit]}... [{len(value) - limit} more characters]"
+    bounded = _preview_repr if limit == LOG_PREVIEW_CHARS else _bounded_repr(limit)
+    text = bounded.repr(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}..."
+
+
+def preview_call(args: tuple, kwargs: dict, limit: int = LOG_PREVIEW_CHARS) -> str:
+    return ", ".join(
+        [
+            *(preview(arg, limit) for arg in args),
+            *(f"{k}={preview(v, limit)}" for k, v in kwargs.items()),
+        ]
+    )
+
+
+def sampled(rate: float = LOG_SAMPLE_RATE) -> bool:
+    """Whether this call's debug records should be emitted."""
+    return rate >= 1.0 or random.random() < rate
+
+
+def log_preview(logger: logging.Logger, label: str, value: Any) -> None:
+    """Log ``label: value`` at DEBUG, formatting nothing if DEBUG is off."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"{label}: {preview(value)}")
+
+
+def payload_enabled() -> bool:
+    return bool(payload_logger.handlers)
+
+
+# Nesting below this is rendered as a preview string
+_CAP_MAX_DEPTH = 6
+
+
+def _bounded_copy(value: Any, budget: list[int], depth: int = 0) -> Any:
+    """A JSON-ready copy of ``value`` of about ``budget[0]`` characters at most.
+
+    Walks the value instead of serializing it whole: strings are sliced,
+    containers stop once the budget is spent and other objects become
+    bounded previews.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        budget[0] -= 8
+        return value
+    if isinstance(value, str):
+        if len(value) > budget[0]:
+            truncated = value[: max(0, budget[0])]
+            budget[0] = 0
+            return {"truncated": truncated, "length": len(value)}
+        budget[0] -= len(value) + 2
+        return value
+    if depth < _CAP_MAX_DEPTH and isinstance(value, dict):
+        copy = {}
+        for key, item in value.items():
+            if budget[0] <= 0:
+                copy["..."] = f"{len(value) - len(copy)} more items"
+                break
+            key = str(key)
+            budget[0] -= len(key) + 4
+            copy[key] = _bounded_copy(item, budget, depth + 1)
+        return copy
+    if depth < _CAP_MAX_DEPTH and isinstance(value, (list, tuple, set, frozenset)):
+        copy = []
+        for item in value:
+            if budget[0] <= 0:
+                copy.append(f"... {len(value) - len(copy)} more items")
+                break
+            copy.append(_bounded_copy(item, budget, depth + 1))
+            budget[0] -= 2
+        return copy
+    return _bounded_copy(preview(value, max(0, budget[0])), budget, depth)
+
+
+def _cap(value: Any) -> Any:
+    return _bounded_copy(value, [LOG_PAYLOAD_MAX_CHARS])
+
+
+def log_payload(event: str, **fields: Any) -> None:
+    """Write one size-capped JSON record to the payload log, if enabled."""
+    if not payload_enabled():
+        return
+    record = {"event": event, **{k: _cap(v) for k, v in fields.items()}}
+    payload_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def configure_payload_log(path: Optional[str] = LOG_PAYLOAD_FILE) -> None:
+    """Send payload records to a rotating file; no-op if ``path`` is empty."""
+    if not path or payload_enabled():
+        return
+    handler = RotatingFileHandler(
+        path,
+        maxBytes=LOG_PAYLOAD_FILE_MAX_BYTES,
+        backupCount=LOG_PAYLOAD_FILE_BACKUPS,
+        encoding="utf-8",
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    payload_logger.addHandler(handler)
+
+
+configure_payload_log()
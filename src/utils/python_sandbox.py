@@ -0,0 +1,363 @@
+"""
+A pool of isolated worker processes that execute Python code.
+
+Every workflow gets its own session: a globals namespace that persists across
+its runs, pinned to one worker process. Workers run one snippet at a time
+under CPU, memory and wall-clock limits, and are recycled after a number of
+runs once their sessions are closed.
+
+Workers are started as ``python -m src.utils.python_sandbox``, which only
+imports the standard library, so they never import the application (its
+LLM clients, MCP servers and browser runtime) the way multiprocessing's
+spawn re-imports the parent's ``__main__``.
+"""
+
+import contextlib
+import io
+import logging
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, wall-clock timeout only
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+WORKER_MODULE = "src.utils.python_sandbox"
+# The directory containing src/, for workers started from any cwd
+_PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def _set_cpu_limit(cpu_seconds: Optional[float]) -> None:
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(used + cpu_seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _execute(code: str, namespace: dict) -> str:
+    """Run ``code`` like ``PythonREPL.run``: stdout, or the exception repr."""
+    stdout = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout):
+            exec(code, namespace)
+        return stdout.getvalue()
+    except SystemExit as e:
+        # exit() ends the snippet, not the worker
+        return f"{stdout.getvalue()}SystemExit: {e.code}"
+    except BaseException as e:
+        return repr(e)
+
+
+def _worker_main(conn, memory_mb: Optional[int], preload: Sequence[str]) -> None:
+    if resource is not None and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    for module in preload:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    sessions: dict[str, dict] = {}
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message[0] == "run":
+            _, session_id, code, cpu_seconds = message
+            namespace = sessions.setdefault(session_id, {"__name__": "__main__"})
+            _set_cpu_limit(cpu_seconds)
+            conn.send(_execute(code, namespace))
+        elif message[0] == "close":
+            sessions.pop(message[1], None)
+
+
+class SandboxError(RuntimeError):
+    """The worker running the code was killed; its session state is lost."""
+
+
+class _WorkerProcess:
+    """A worker running this module, talking over an inherited pipe."""
+
+    def __init__(
+        self, child_conn: Connection, memory_mb: Optional[int], preload: Sequence[str]
+    ):
+        fd = child_conn.fileno()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, (_PROJECT_ROOT, env.get("PYTHONPATH")))
+        )
+        self.popen = subprocess.Popen(
+            [sys.executable, "-m", WORKER_MODULE, str(fd), str(memory_mb or 0)]
+            + list(preload),
+            pass_fds=(fd,),
+            stdin=subprocess.DEVNULL,
+            env=env,
+        )
+
+    def is_alive(self) -> bool:
+        return self.popen.poll() is None
+
+    @property
+    def exitcode(self) -> Optional[int]:
+        return self.popen.poll()
+
+    def kill(self) -> None:
+        self.popen.kill()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        try:
+            self.popen.wait(timeout)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+def _start_worker(
+    child_conn: Connection, memory_mb: Optional[int], preload: Sequence[str]
+):
+    if os.name == "posix":
+        return _WorkerProcess(child_conn, memory_mb, preload)
+    # No fd inheritance on Windows; spawn re-imports __main__ there.
+    process = multiprocessing.get_context("spawn").Process(
+        target=_worker_main,
+        args=(child_conn, memory_mb, tuple(preload)),
+        name="python-sandbox",
+        daemon=True,
+    )
+    process.start()
+    return process
+
+
+def _death_reason(exitcode: Optional[int]) -> str:
+    if exitcode is not None and exitcode < 0:
+        try:
+            name = signal.Signals(-exitcode).name
+        except ValueError:
+            name = f"signal {-exitcode}"
+        if name == "SIGXCPU":
+            return "was killed by its CPU limit"
+        return f"was killed by {name}, most likely by its memory limit"
+    if exitcode is not None:
+        return f"exited with code {exitcode}"
+    return "was lost, most likely to its CPU or memory limit"
+
+
+class SandboxWorker:
+    def __init__(self, memory_mb: Optional[int], preload: Sequence[str]):
+        # Workers must not inherit the server's threads and event loops.
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = _start_worker(child_conn, memory_mb, tuple(preload))
+        child_conn.close()
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.sessions: set[str] = set()
+        self.pending_close: list[str] = []
+        self.retiring = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def execute(
+        self, session_id: str, code: str, timeout: float, cpu_seconds: Optional[float]
+    ) -> str:
+        """Run code in the worker. Caller must hold ``lock``."""
+        try:
+            for closed in self.pending_close:
+                self.conn.send(("close", closed))
+            self.pending_close.clear()
+            self.runs += 1
+            self.conn.send(("run", session_id, code, cpu_seconds))
+        except OSError:
+            raise SandboxError("The Python worker has stopped")
+        if not self.conn.poll(timeout):
+            self.kill()
+            raise SandboxError(f"Execution timed out after {timeout}s")
+        try:
+            return self.conn.recv()
+        except EOFError:
+            # Killed by a limit, or the code ended the process (os._exit).
+            self.process.join(timeout=1)
+            reason = _death_reason(self.process.exitcode)
+            self.kill()
+            raise SandboxError(f"The Python worker {reason}")
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class PythonSandbox:
+    """Runs code for many workflows in parallel across worker processes.
+
+    Args:
+        workers: Maximum number of worker processes.
+        max_runs: Runs after which a worker is replaced, once its sessions close.
+        timeout: Wall-clock limit per run, in seconds.
+        cpu_seconds: CPU time limit per run, in seconds.
+        memory_mb: Address space limit per worker process.
+        session_ttl: Sessions idle for longer than this are closed.
+        preload: Modules imported by every worker ahead of time.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_runs: int,
+        timeout: float,
+        cpu_seconds: Optional[float],
+        memory_mb: Optional[int],
+        session_ttl: float,
+        preload: Sequence[str] = (),
+    ):
+        self.size = max(1, workers)
+        self.max_runs = max_runs
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.session_ttl = session_ttl
+        self.preload = tuple(preload)
+        self._lock = threading.Lock()
+        self._workers: list[SandboxWorker] = []
+        self._sessions: dict[str, SandboxWorker] = {}
+        self._last_used: dict[str, float] = {}
+        self.killed = 0
+        self.recycled = 0
+
+    def _spawn(self) -> SandboxWorker:
+        worker = SandboxWorker(self.memory_mb, self.preload)
+        self._workers.append(worker)
+        return worker
+
+    def warm(self) -> None:
+        """Start all worker processes ahead of the first run."""
+        with self._lock:
+            while len(self._workers) < self.size:
+                self._spawn()
+
+    def _close_idle_sessions(self, now: float) -> None:
+        for session_id, last_used in list(self._last_used.items()):
+            if now - last_used > self.session_ttl:
+                self._release(session_id)
+
+    def _release(self, session_id: str) -> None:
+        self._last_used.pop(session_id, None)
+        worker = self._sessions.pop(session_id, None)
+        if worker is None:
+            return
+        worker.sessions.discard(session_id)
+        worker.pending_close.append(session_id)
+        if worker.retiring and not worker.sessions:
+            self._retire(worker)
+
+    def _retire(self, worker: SandboxWorker) -> None:
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self.recycled += 1
+        # Let a run in progress finish before stopping the process.
+        threading.Thread(
+            target=self._stop_when_idle, args=(worker,), daemon=True
+        ).start()
+
+    @staticmethod
+    def _stop_when_idle(worker: SandboxWorker) -> None:
+        with worker.lock:
+            worker.kill()
+
+    def _assign(self, session_id: str) -> SandboxWorker:
+        worker = self._sessions.get(session_id)
+        if worker is not None and worker.alive:
+            return worker
+        if worker is not None:
+            self._release(session_id)
+        self._workers = [w for w in self._workers if w.alive or w.retiring]
+        candidates = [w for w in self._workers if not w.retiring]
+        if len(self._workers) < self.size or not candidates:
+            worker = self._spawn()
+        else:
+            worker = min(candidates, key=lambda w: len(w.sessions))
+        worker.sessions.add(session_id)
+        self._sessions[session_id] = worker
+        return worker
+
+    def run(self, session_id: str, code: str, timeout: Optional[float] = None) -> str:
+        """Execute ``code`` in the session's namespace and return its stdout.
+
+        Raises:
+            SandboxError: The run hit a limit and the session state was lost.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._close_idle_sessions(now)
+            worker = self._assign(session_id)
+            self._last_used[session_id] = now
+        with worker.lock:
+            try:
+                return worker.execute(
+                    session_id, code, timeout or self.timeout, self.cpu_seconds
+                )
+            except SandboxError:
+                with self._lock:
+                    self.killed += 1
+                    for lost in list(worker.sessions):
+                        self._release(lost)
+                    if worker in self._workers:
+                        self._workers.remove(worker)
+                raise
+            finally:
+                with self._lock:
+                    if (
+                        worker in self._workers
+                        and worker.runs >= self.max_runs
+                        and not worker.retiring
+                    ):
+                        worker.retiring = True
+                        if not worker.sessions:
+                            self._retire(worker)
+
+    def close_session(self, session_id: str) -> None:
+        """Drop a session's namespace; never blocks on a running snippet."""
+        with self._lock:
+            self._release(session_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": len(self._workers),
+                "sessions": len(self._sessions),
+                "killed": self.killed,
+                "recycled": self.recycled,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._sessions.clear()
+            self._last_used.clear()
+        for worker in workers:
+            worker.kill()
+
+
+if __name__ == "__main__":
+    # Worker entry point: python -m src.utils.python_sandbox FD MEMORY_MB [MODULE...]
+    fd, memory_mb, *preload = sys.argv[1:]
+    _worker_main(Connection(int(fd)), int(memory_mb) or None, preload)
@@ -0,0 +1,33 @@
+from collections import deque
+from typing import Optional
+
+
+class CallStats:
+    """Rolling latency statistics for a stream of calls."""
+
+    def __init__(self, window: int = 500):
+        self.calls = 0
+        self.errors = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float, error: bool = False) -> None:
+        self.calls += 1
+        self.errors += int(error)
+        self._latencies.append(latency)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 4)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg": round(sum(latencies) / len(latencies), 4) if latencies else None,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": round(latencies[-1], 4) if latencies else None,
+        }
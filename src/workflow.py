@@ -1,6 +1,7 @@
 import logging
 from .config import TEAM_MEMBER_CONFIGRATIONS, TEAM_MEMBERS
 from .graph import build_graph
+from .utils.log_utils import log_preview
 
 # Configure logging
 logging.basicConfig(
@@ -50,7 +51,7 @@ def run_agent_workflow(user_input: str, debug: bool = False):
         },
         config={"configurable": {"thread_id": "default_thread"}}
     )
-    logger.debug(f"Final workflow state: {result}")
+    log_preview(logger, "Final workflow state", result)
     logger.info("Workflow completed successfully")
     return result
 
@@ -0,0 +1,6 @@
+import os
+
+# Before src.config loads .env, which does not override set variables:
+# test runs stay out of LangSmith.
+os.environ["LANGSMITH_TRACING"] = "false"
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
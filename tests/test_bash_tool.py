@@ -0,0 +1,67 @@
+import importlib
+
+# src.tools re-exports the tool under the module's name
+bash = importlib.import_module("src.tools.bash_tool")
+
+
+def run(cmd, timeout=10):
+    """The command's tool result and the progress output relayed for it."""
+    output = []
+    result = bash.bash_runtime.run(
+        bash._execute(cmd, timeout, lambda stream, text: output.append(text))
+    )
+    return result, output
+
+
+def test_output_buffer_keeps_head_and_tail():
+    buffer = bash.OutputBuffer(head=5, tail=5)
+    for _ in range(10):
+        buffer.write("0123456789")
+
+    assert buffer.total == 100
+    assert buffer.getvalue() == "01234\n... [90 characters truncated] ...\n56789"
+
+
+def test_output_buffer_keeps_short_output():
+    buffer = bash.OutputBuffer(head=5, tail=5)
+    buffer.write("0123")
+    buffer.write("456")
+
+    assert buffer.getvalue() == "0123456"
+
+
+def test_long_output_is_truncated():
+    result, _ = run("seq 1 100000")
+
+    assert result.startswith("1\n2\n3\n")
+    assert result.endswith("99999\n100000\n")
+    assert "characters truncated" in result
+    assert len(result) <= bash.BASH_OUTPUT_HEAD + bash.BASH_OUTPUT_TAIL + 100
+
+
+def test_progress_is_capped():
+    sent = []
+    progress = bash.ProgressThrottle(
+        lambda stream, text: sent.append(text), interval=60, max_chars=10
+    )
+    for _ in range(5):
+        progress.write("stdout", "0123456")
+    progress.flush()
+    progress.write("stdout", "dropped")
+    progress.flush()
+
+    assert sent == ["0123456012\n... [output truncated] ...\n"]
+
+
+def test_timeout_kills_the_command():
+    result, _ = run("echo started; sleep 30", timeout=0.5)
+
+    assert result == "Command 'echo started; sleep 30' timed out after 0.5s."
+
+
+def test_failure_reports_exit_code_and_output():
+    result, output = run("echo out; echo err >&2; exit 3")
+
+    assert result.startswith("Command failed with exit code 3.")
+    assert "Stdout: out" in result and "Stderr: err" in result
+    assert sorted("".join(output).split()) == ["err", "out"]
@@ -0,0 +1,44 @@
+import pytest
+
+from src.tools.graph_router import (
+    classify_query,
+    entity_title_set,
+    mentioned_entities,
+)
+
+
+@pytest.mark.parametrize(
+    "query, mode",
+    [
+        ("Summarize the main themes this week", "global"),
+        ("What is the overall sentiment on Solana?", "global"),
+        ("How does the Fed rate decision affect bitcoin price?", "drift"),
+        ("Compare Arbitrum versus Optimism", "drift"),
+        ("What is the contract address of PEPE?", "local"),
+        ("Tell me about $WIF", "local"),
+        ("news on 0x6982508145454ce325ddbe47a25d4ec3d2311933", "local"),
+        ("anything new lately", "global"),
+    ],
+)
+def test_classify_query(query, mode):
+    assert classify_query(query) == mode
+
+
+def test_known_entities_anchor_a_local_search():
+    titles = entity_title_set(["Vitalik Buterin", "ETH", "x"])
+
+    assert "x" not in titles
+    assert classify_query("latest from vitalik buterin", titles) == "local"
+    assert classify_query("latest from someone else", titles) == "global"
+
+
+def test_mentioned_entities():
+    titles = entity_title_set(["Vitalik Buterin"])
+
+    assert mentioned_entities(
+        'Did Vitalik Buterin post about "Pectra" or $ETH?', titles
+    ) == {
+        "vitalik buterin",
+        '"pectra"',
+        "$eth",
+    }
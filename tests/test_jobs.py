@@ -0,0 +1,73 @@
+import asyncio
+
+from src.service.jobs import EventLog, JobManager
+from src.service.scheduler import WorkflowScheduler
+from src.service.state_backend import MemoryBackend
+
+
+def event(i):
+    return {"event": "message", "data": {"i": i}}
+
+
+def test_since_skips_dropped_events():
+    log = EventLog(max_events=3)
+    for i in range(5):
+        assert log.append(event(i)) == i
+
+    assert log.first_offset == 2
+    assert log.next_offset == 5
+    assert [offset for offset, _ in log.since(0)] == [2, 3, 4]
+    assert log.since(3) == [(3, event(3)), (4, event(4))]
+    assert log.since(5) == []
+
+
+def test_read_replays_from_offset_and_follows_until_closed():
+    async def main():
+        log = EventLog(max_events=10)
+        for i in range(3):
+            log.append(event(i))
+
+        async def write():
+            await asyncio.sleep(0.01)
+            log.append(event(3))
+            log.close()
+
+        writer = asyncio.create_task(write())
+        read = [offset async for offset, _ in log.read(1)]
+        await writer
+        return read
+
+    assert asyncio.run(main()) == [1, 2, 3]
+
+
+def test_read_resumes_at_first_retained_offset():
+    async def main():
+        log = EventLog(max_events=2)
+        for i in range(4):
+            log.append(event(i))
+        log.close()
+        return [(offset, e["data"]["i"]) async for offset, e in log.read(0)]
+
+    assert asyncio.run(main()) == [(2, 2), (3, 3)]
+
+
+def test_jobs_are_only_visible_to_their_key():
+    async def main():
+        manager = JobManager(
+            scheduler=WorkflowScheduler(max_running=1, max_queued=1, priorities={}),
+            backend=MemoryBackend(),
+        )
+
+        async def events():
+            yield event(0)
+
+        job = await manager.create("alice", events)
+        await job.task
+        return (
+            await manager.get(job.id, "alice") is job,
+            await manager.get(job.id, "bob"),
+            await manager.cancel(job.id, "bob"),
+            (await job.ainfo())["status"],
+        )
+
+    assert asyncio.run(main()) == (True, None, None, "completed")
@@ -0,0 +1,50 @@
+import pytest
+
+from src.utils.python_sandbox import PythonSandbox, SandboxError
+
+
+@pytest.fixture
+def sandbox():
+    sandbox = PythonSandbox(
+        workers=2,
+        max_runs=100,
+        timeout=10,
+        cpu_seconds=None,
+        memory_mb=None,
+        session_ttl=60,
+    )
+    yield sandbox
+    sandbox.shutdown()
+
+
+def test_sessions_keep_their_own_namespace(sandbox):
+    assert sandbox.run("a", "x = 1") == ""
+    assert sandbox.run("b", "x = 2") == ""
+
+    assert sandbox.run("a", "print(x)") == "1\n"
+    assert sandbox.run("b", "print(x)") == "2\n"
+    assert "NameError" in sandbox.run("c", "print(x)")
+
+
+def test_closed_session_starts_over(sandbox):
+    sandbox.run("a", "x = 1")
+    sandbox.close_session("a")
+
+    assert "NameError" in sandbox.run("a", "print(x)")
+
+
+def test_timeout_kills_only_the_worker_running_it(sandbox):
+    sandbox.run("a", "x = 1")
+    sandbox.run("b", "y = 2")
+
+    with pytest.raises(SandboxError, match="timed out"):
+        sandbox.run("a", "while True: pass", timeout=0.5)
+    assert sandbox.stats()["killed"] == 1
+    # b lived on the other worker
+    assert sandbox.run("b", "print(y)") == "2\n"
+    assert "NameError" in sandbox.run("a", "print(x)")
+
+
+def test_exit_ends_the_snippet_not_the_worker(sandbox):
+    assert sandbox.run("a", "print('bye'); exit(3)") == "bye\nSystemExit: 3"
+    assert sandbox.run("a", "print('still here')") == "still here\n"
@@ -0,0 +1,59 @@
+import pytest
+from langchain_core.tools import ToolException, tool
+
+from src.replay import FakeToolBackend, FixtureStore
+from src.replay.fixtures import tool_key
+
+
+@tool
+def lookup(query: str) -> str:
+    """Look something up."""
+    raise AssertionError("the real tool must not run during replay")
+
+
+def record(query, output, error=False):
+    return {
+        "kind": "tool",
+        "key": tool_key("lookup", {"query": query}),
+        "group": "lookup",
+        "input": {"query": query},
+        "output": output,
+        "error": error,
+    }
+
+
+def test_fixtures_match_by_key_then_group_then_kind():
+    store = FixtureStore([record("eth", "ETH is up"), record("btc", "BTC is flat")])
+
+    assert store.tool_result("lookup", {"query": "btc"})["output"] == "BTC is flat"
+    assert store.tool_result("lookup", {"query": "sol"})["output"] == "ETH is up"
+    assert store.tool_result("other", "x")["output"] == "ETH is up"
+    assert store.llm_response([{"role": "user", "content": "hi"}]) is None
+    assert store.stats() == {
+        "fixtures": {"tool": 2},
+        "hits": 1,
+        "fallbacks": 2,
+        "misses": 1,
+    }
+
+
+def test_same_request_replays_recordings_in_turn():
+    store = FixtureStore([record("eth", "first"), record("eth", "second")])
+
+    outputs = [
+        store.tool_result("lookup", {"query": "eth"})["output"] for _ in range(3)
+    ]
+    assert outputs == ["first", "second", "first"]
+
+
+def test_fake_backend_answers_tool_calls():
+    store = FixtureStore(
+        [record("eth", "ETH is up"), record("fail", "rate limited", True)]
+    )
+
+    with FakeToolBackend(store):
+        assert lookup.invoke({"query": "eth"}) == "ETH is up"
+        with pytest.raises(ToolException, match="rate limited"):
+            lookup.invoke({"query": "fail"})
+    with pytest.raises(AssertionError):
+        lookup.invoke({"query": "eth"})
@@ -0,0 +1,108 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_openai import ChatOpenAI
+from starlette.testclient import TestClient
+
+from src.graph.router import ROUTE_TOOL_NAME, _bind_route_tool, parse_route
+from src.replay.fake_llm_server import create_app
+from src.replay.fixtures import FixtureStore, llm_group, llm_key
+
+SYSTEM = "You are a supervisor. Route to the next worker."
+
+
+def route_call(args):
+    return {"name": ROUTE_TOOL_NAME, "args": args, "id": "call_1"}
+
+
+def test_reads_the_route_call():
+    message = AIMessage(content="", tool_calls=[route_call({"next": "coder"})])
+
+    assert parse_route(message) == "coder"
+
+
+def test_matches_options_case_insensitively():
+    message = AIMessage(content="", tool_calls=[route_call({"next": " Researcher"})])
+
+    assert parse_route(message) == "researcher"
+
+
+@pytest.mark.parametrize(
+    "content, option",
+    [
+        ('{"next": "reporter"}', "reporter"),
+        ('```json\n{"next": "browser"}\n```', "browser"),
+        ('{"next": "FINISH"', "FINISH"),
+    ],
+)
+def test_repairs_json_content(content, option):
+    assert parse_route(AIMessage(content=content)) == option
+
+
+def test_repairs_invalid_route_call():
+    message = AIMessage(
+        content="",
+        invalid_tool_calls=[
+            {"name": ROUTE_TOOL_NAME, "args": '{"next": "coder"', "id": "call_1"}
+        ],
+    )
+
+    assert parse_route(message) == "coder"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        "The researcher should go next",
+        '{"next": "nobody"}',
+        '{"worker": "coder"}',
+    ],
+)
+def test_raises_without_a_valid_next(content):
+    with pytest.raises(ValueError):
+        parse_route(AIMessage(content=content))
+
+
+def fixture(question, response):
+    messages = [
+        {"role": "system", "content": SYSTEM},
+        {"role": "user", "content": question},
+    ]
+    return {
+        "kind": "llm",
+        "key": llm_key(messages),
+        "group": llm_group(messages),
+        "messages": messages,
+        "response": response,
+    }
+
+
+def test_routes_replayed_completions():
+    store = FixtureStore(
+        [
+            fixture(
+                "write code",
+                {"content": "", "tool_calls": [route_call({"next": "coder"})]},
+            ),
+            fixture("all done", {"content": '{"next": "FINISH"'}),
+        ]
+    )
+    llm = ChatOpenAI(
+        model="replay",
+        base_url="http://testserver/v1",
+        api_key="replay",
+        http_client=TestClient(create_app(store)),
+        max_retries=0,
+    )
+    router = _bind_route_tool(llm)
+
+    def route(question):
+        return parse_route(
+            router.invoke(
+                [SystemMessage(content=SYSTEM), HumanMessage(content=question)]
+            )
+        )
+
+    assert route("write code") == "coder"
+    assert route("all done") == "FINISH"
+    assert store.stats()["hits"] == 2
@@ -0,0 +1,74 @@
+import pytest
+
+from src.service.scheduler import (
+    WorkflowQueueFull,
+    WorkflowScheduler,
+    client_label,
+)
+
+
+def test_keys_take_turns():
+    scheduler = WorkflowScheduler(max_running=1, max_queued=10, priorities={})
+    burst = [scheduler.enqueue("a") for _ in range(3)]
+    others = [scheduler.enqueue("b"), scheduler.enqueue("c")]
+
+    assert burst[0].admitted
+    waiting = burst[1:] + others
+    assert [scheduler.position(t) for t in waiting] == [1, 4, 2, 3]
+
+    order, running = [], burst[0]
+    while len(order) < len(waiting):
+        scheduler.release(running)
+        running = next(t for t in waiting if t.admitted and t not in order)
+        order.append(running)
+    # a's burst does not hold b and c back
+    assert order == [burst[1], others[0], others[1], burst[2]]
+
+
+def test_higher_priority_runs_first():
+    scheduler = WorkflowScheduler(max_running=1, max_queued=10, priorities={"vip": 1})
+    first = scheduler.enqueue("a")
+    normal = scheduler.enqueue("a")
+    vip = scheduler.enqueue("vip")
+
+    assert scheduler.position(vip) == 1
+    assert scheduler.position(normal) == 2
+    scheduler.release(first)
+    assert vip.admitted and not normal.admitted
+
+
+def test_full_queue_rejects():
+    scheduler = WorkflowScheduler(max_running=1, max_queued=1, priorities={})
+    scheduler.enqueue("a")
+    scheduler.enqueue("a")
+
+    with pytest.raises(WorkflowQueueFull):
+        scheduler.enqueue("b")
+    assert scheduler.stats()["rejected"] == 1
+
+
+def test_release_of_queued_ticket_frees_its_place():
+    scheduler = WorkflowScheduler(max_running=1, max_queued=10, priorities={})
+    running = scheduler.enqueue("a")
+    waiting = scheduler.enqueue("b")
+    later = scheduler.enqueue("c")
+
+    scheduler.release(waiting)
+    scheduler.release(waiting)
+    assert scheduler.position(later) == 1
+    scheduler.release(running)
+    assert later.admitted
+    assert scheduler.stats()["queued"] == 0
+
+
+def test_api_keys_are_never_exposed(caplog):
+    scheduler = WorkflowScheduler(max_running=1, max_queued=10, priorities={})
+    scheduler.enqueue("secret-token")
+    with caplog.at_level("INFO"):
+        waiting = scheduler.enqueue("secret-token")
+
+    assert scheduler.stats()["queued_per_key"] == {client_label("secret-token"): 1}
+    assert waiting.client == client_label("secret-token")
+    assert "queued at position 1" in caplog.text
+    assert "secret-token" not in caplog.text
+    assert "secret-token" not in repr(scheduler.stats())
@@ -0,0 +1,69 @@
+import asyncio
+
+from src.api.sse import coalesce_deltas
+
+
+def delta(message_id, text, field="content"):
+    return {
+        "event": "message",
+        "data": {"message_id": message_id, "delta": {field: text}},
+    }
+
+
+async def source(events, delay=0.0):
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+def collect(events, **kwargs):
+    async def main():
+        return [event async for event in coalesce_deltas(events, **kwargs)]
+
+    return asyncio.run(main())
+
+
+def test_merges_consecutive_deltas_of_a_message():
+    events = [delta("m1", "Hel"), delta("m1", "lo"), delta("m2", "!")]
+    merged = collect(source(events), max_delay=1, max_chars=100)
+
+    assert merged == [delta("m1", "Hello"), delta("m2", "!")]
+
+
+def test_keeps_order_around_other_events():
+    status = {"event": "start_of_agent", "data": {"agent_name": "coder"}}
+    events = [
+        delta("m1", "a"),
+        delta("m1", "b", field="reasoning_content"),
+        status,
+        delta("m1", "c"),
+    ]
+    merged = collect(source(events), max_delay=1, max_chars=100)
+
+    assert merged == [
+        delta("m1", "a"),
+        delta("m1", "b", field="reasoning_content"),
+        status,
+        delta("m1", "c"),
+    ]
+
+
+def test_flushes_at_max_chars():
+    events = [delta("m1", "ab"), delta("m1", "cd"), delta("m1", "e")]
+    merged = collect(source(events), max_delay=1, max_chars=4)
+
+    assert merged == [delta("m1", "abcd"), delta("m1", "e")]
+
+
+def test_flushes_after_max_delay():
+    events = [delta("m1", "a"), delta("m1", "b")]
+    merged = collect(source(events, delay=0.05), max_delay=0.01, max_chars=100)
+
+    assert merged == [delta("m1", "a"), delta("m1", "b")]
+
+
+def test_zero_delay_passes_events_through():
+    events = [delta("m1", "a"), delta("m1", "b")]
+
+    assert collect(source(events), max_delay=0) == events
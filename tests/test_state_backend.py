@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from src.service.state_backend import MemoryBackend, SQLiteBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    return SQLiteBackend(str(tmp_path / "state.db"))
+
+
+def test_strings(backend):
+    assert backend.get("missing") is None
+    backend.set("key", "value")
+    assert backend.get("key") == "value"
+    backend.set("key", "other")
+    assert backend.get("key") == "other"
+    backend.delete("key", "missing")
+    assert backend.get("key") is None
+
+
+def test_counters(backend):
+    assert backend.incr("count") == 1
+    assert backend.incr("count") == 2
+    assert backend.get("count") == "2"
+
+
+def test_expiry(backend):
+    backend.set("short", "value", ttl=0.05)
+    backend.set("long", "value", ttl=60)
+    backend.rpush("list", "a")
+    backend.expire("list", 0.05)
+    time.sleep(0.1)
+
+    assert backend.get("short") is None
+    assert backend.get("long") == "value"
+    assert backend.llen("list") == 0
+
+
+def test_lists(backend):
+    assert backend.rpush("list", "a", "b") == 2
+    assert backend.rpush("list", "c", "d", "e") == 5
+    assert backend.lrange("list", 0, -1) == ["a", "b", "c", "d", "e"]
+    assert backend.lrange("list", -2, -1) == ["d", "e"]
+    assert backend.lrange("list", 1, 2) == ["b", "c"]
+
+    backend.ltrim("list", -3, -1)
+    assert backend.lrange("list", 0, -1) == ["c", "d", "e"]
+    assert backend.lrange("list", 0, 0) == ["c"]
+    assert backend.llen("list") == 3
+    assert backend.lrange("missing", 0, -1) == []
+
+
+def test_sqlite_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "state.db")
+    writer, reader = SQLiteBackend(path), SQLiteBackend(path)
+    writer.set("key", "value")
+    writer.rpush("list", "a", "b")
+
+    assert reader.shared and not MemoryBackend.shared
+    assert reader.get("key") == "value"
+    assert reader.lrange("list", 0, -1) == ["a", "b"]